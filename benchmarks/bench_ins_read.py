@@ -0,0 +1,87 @@
+"""
+Benchmark of the in-process reading of PEST instruction files.
+
+Writes the instruction files of every treatment of the PlantGro.OUT file of the
+tests (ts_batch) and of the OVERVIEW.OUT file (overview), then reads the simulated
+values of all of them with:
+
+* pyemu's InstructionFile, which parses the instruction file on every read;
+* dpest.ins, with the instruction files compiled once and reapplied.
+
+The values of both readers are compared before timing.
+
+Usage:
+    python benchmarks/bench_ins_read.py
+"""
+from contextlib import redirect_stdout
+from pathlib import Path
+import io
+import tempfile
+import timeit
+
+from pyemu.pst.pst_utils import InstructionFile
+
+import dpest
+from dpest import ins
+
+WHEAT_DIR = Path(__file__).parent.parent / "tests/DSSAT48/Wheat"
+REPEAT = 5
+
+
+def write_instruction_files(output_path):
+    """Returns the (ins_path, out_path) pairs of the instruction files written to ``output_path``."""
+    with redirect_stdout(io.StringIO()):
+        _, pairs = dpest.ts_batch(
+            ts_file_paths=str(WHEAT_DIR / "PlantGro.OUT"),
+            variables=['LAID', 'CWAD', 'T#AD'],
+            output_path=output_path,
+            drop_missing_simulated=True,
+        )
+
+        overview_file = str(WHEAT_DIR / "OVERVIEW.OUT")
+        out_index = dpest.functions.OutFileIndex(overview_file)
+        for trno, treatment in enumerate(out_index.treatment_dict(), start=1):
+            _, ins_path = dpest.overview(
+                treatment=treatment,
+                overview_file_path=out_index,
+                output_path=output_path,
+                suffix=f"T{trno}",
+            )
+            pairs.append((ins_path, overview_file))
+
+    return pairs
+
+
+def pyemu_path(pairs):
+    return [InstructionFile(ins_path).read_output_file(out_path) for ins_path, out_path in pairs]
+
+
+def dpest_path(programs):
+    return [program.read_array(out_path) for program, out_path in programs]
+
+
+def main():
+    with tempfile.TemporaryDirectory() as output_path:
+        pairs = write_instruction_files(output_path)
+        programs = [(ins.compile_instructions(ins_path), out_path) for ins_path, out_path in pairs]
+
+        # Both readers must return the same values (pyemu lower-cases the names)
+        for ins_path, out_path in pairs:
+            expected = InstructionFile(ins_path).read_output_file(out_path)['obsval'].to_dict()
+            values = {name.lower(): value for name, value in ins.read(ins_path, out_path).items()}
+            assert values == expected, ins_path
+
+        observations = sum(len(program.obs_names) for program, _ in programs)
+        pyemu_time = min(timeit.repeat(lambda: pyemu_path(pairs), number=1, repeat=REPEAT))
+        compile_time = min(timeit.repeat(
+            lambda: [ins.InstructionProgram(ins_path) for ins_path, _ in pairs], number=1, repeat=REPEAT))
+        dpest_time = min(timeit.repeat(lambda: dpest_path(programs), number=1, repeat=REPEAT))
+
+    print(f"{len(pairs)} instruction files, {observations} observations")
+    print(f"pyemu InstructionFile        : {pyemu_time * 1000:8.2f} ms")
+    print(f"dpest.ins compile            : {compile_time * 1000:8.2f} ms")
+    print(f"dpest.ins read (compiled)    : {dpest_time * 1000:8.2f} ms ({pyemu_time / dpest_time:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
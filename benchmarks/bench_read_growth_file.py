@@ -0,0 +1,63 @@
+"""
+Benchmark of the parsing of DSSAT time-series blocks.
+
+Compares the whitespace-split path (one ``str.split`` per line followed by
+``pd.to_numeric`` per column) with the fixed-width parser used by
+``read_growth_file`` on every block of the PlantGro.OUT file of the tests.
+
+Usage:
+    python benchmarks/bench_read_growth_file.py
+"""
+from pathlib import Path
+import timeit
+
+import pandas as pd
+
+from dpest.functions import OutFileIndex, parse_fixed_width_block, read_growth_file
+
+PLANTGRO_FILE = Path(__file__).parent.parent / "tests/DSSAT48/Wheat/PlantGro.OUT"
+REPEAT = 20
+
+
+def block_tables(out_index):
+    """Returns the header line and the data rows of every block of the file."""
+    tables = []
+    for block in out_index.blocks:
+        lines = out_index.read_block_lines(block)
+        header_position = next(i for i, line in enumerate(lines) if line.startswith('@'))
+        data_lines = [line for line in lines[header_position + 1:] if line.strip()]
+        tables.append((lines[header_position], data_lines))
+    return tables
+
+
+def split_path(tables):
+    for header_line, data_lines in tables:
+        data = [line.strip().split() for line in data_lines]
+        pd.DataFrame(data, columns=header_line.strip().split()).apply(pd.to_numeric)
+
+
+def fixed_width_path(tables):
+    for header_line, data_lines in tables:
+        parse_fixed_width_block(header_line, data_lines)
+
+
+def main():
+    out_index = OutFileIndex(PLANTGRO_FILE)
+    tables = block_tables(out_index)
+    rows = sum(len(data_lines) for _, data_lines in tables)
+
+    split_time = min(timeit.repeat(lambda: split_path(tables), number=1, repeat=REPEAT))
+    fixed_time = min(timeit.repeat(lambda: fixed_width_path(tables), number=1, repeat=REPEAT))
+    read_time = min(timeit.repeat(
+        lambda: [read_growth_file(out_index, (block['start_line'], block['end_line']), use_mmap=True)
+                 for block in out_index.blocks],
+        number=1, repeat=REPEAT))
+
+    print(f"{PLANTGRO_FILE.name}: {out_index.line_count} lines, {len(tables)} blocks, {rows} data rows")
+    print(f"split + pd.to_numeric    : {split_time * 1000:8.2f} ms")
+    print(f"fixed-width float64 array: {fixed_time * 1000:8.2f} ms ({split_time / fixed_time:.1f}x)")
+    print(f"read_growth_file (all)   : {read_time * 1000:8.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,8 +1,9 @@
 from . import wheat
 from . import functions
+from . import ins
 from .pst import pst
 from .overview import overview
-from .ts import ts
+from .ts import ts, ts_batch
 from .cul import cul
 from .eco import eco
 from .uts import uts
@@ -197,22 +197,24 @@ def cul(
             group_parameters = [param.strip() for param in value.split(',')]  # Strip spaces from each parameter
             parameters.extend(group_parameters)  # Add the group parameters to the main list
 
-        # Read the CUL file
-        file_content = read_dssat_file(validated_cul_file_path)
-        lines = file_content.split('\n')
+        # Index the CUL file (read once and reused while the file does not change);
+        # the lines are copied as the template line is modified below
+        genotype_index = read_genotype_file_index(validated_cul_file_path, header_start)
+        lines = list(genotype_index.lines)
 
         # Locate header and target lines
-        header_line_number = next(idx for idx, line in enumerate(lines) if line.startswith(header_start))
-        header_line = lines[header_line_number]
+        if genotype_index.header_line is None:
+            raise ValueError(f"Header '{header_start}' not found in file {validated_cul_file_path}")
+        header_line = genotype_index.header_line
 
         # Get the number of the line that contains the parameters of the specified cultivar
-        cultivar_line_number = find_cultivar(file_content, header_start, cultivar, validated_cul_file_path)
+        cultivar_line_number = find_cultivar(genotype_index, header_start, cultivar, validated_cul_file_path)
         if isinstance(cultivar_line_number, str):  # Error message returned
             raise ValueError(cultivar_line_number)
-        minima_line_number = find_cultivar(file_content, header_start, minima, validated_cul_file_path)
+        minima_line_number = find_cultivar(genotype_index, header_start, minima, validated_cul_file_path)
         if isinstance(minima_line_number, str):  # Error message returned
             raise ValueError(minima_line_number)
-        maxima_line_number = find_cultivar(file_content, header_start, maxima, validated_cul_file_path)
+        maxima_line_number = find_cultivar(genotype_index, header_start, maxima, validated_cul_file_path)
         if isinstance(maxima_line_number, str):  # Error message returned
             raise ValueError(maxima_line_number)
 
@@ -221,7 +223,7 @@ def cul(
             parameter_values = {}
             for parameter in parameters:
                 try:
-                    par_position = find_parameter_position(header_line, parameter)
+                    par_position = genotype_index.parameter_position(parameter)
                     parameter_value = lines[line_number][par_position[0]:par_position[1] + 1].strip()
                     parameter_values[parameter] = parameter_value
                 except Exception:
@@ -238,10 +240,12 @@ def cul(
         # Iterate each parameter in the list to generate the template
         parameter_par_truncated = {}
 
-        count = 0
+        # Template of each parameter by its (start, end) position on the line
+        template_segments = {}
+
         for parameter in parameters:
             # Get the parameter position on the line
-            par_position = find_parameter_position(header_line, parameter)
+            par_position = genotype_index.parameter_position(parameter)
 
             # Extract the current value of the parameter from the line
             parameter_value = lines[cultivar_line_number][par_position[0]:par_position[1] + 1].strip()
@@ -349,27 +353,11 @@ def cul(
             # / Avoid overflowing 3‑char fields
             # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
-            # Extract the cultivar line to modify parameters
-            cultivar_line = lines[cultivar_line_number]
-
-            if count == 0:
-                # Replace the content at the specified position with adjusted_template
-                modified_line = (
-                        cultivar_line[:par_position[0]]  # Part of the line before the parameter
-                        + variable_template  # Insert the adjusted template
-                        + cultivar_line[par_position[1] + 1:]  # Part of the line after the parameter
-                )
-            else:
-                # Replace the content at the specified position with adjusted_template
-                modified_line = (
-                        modified_line[:par_position[0]]  # Part of the line before the parameter
-                        + variable_template  # Insert the adjusted template
-                        + modified_line[par_position[1] + 1:]  # Part of the line after the parameter
-                )
-            count += 1
+            # Store the template to replace the parameter on the line
+            template_segments[(par_position[0], par_position[1])] = variable_template
 
         # Insert the modified line back into the text
-        lines[cultivar_line_number] = modified_line
+        lines[cultivar_line_number] = replace_line_segments(lines[cultivar_line_number], template_segments)
 
         # Insert 'ptf' and marker at the beginning of the file content
         lines.insert(0, f"{tpl_first_line} {mrk}")
@@ -1,3 +1,3 @@
 from .read_overview import read_overview
+from .load_run_directory import load_run_directory
 #from .read_ts import read_ts
-
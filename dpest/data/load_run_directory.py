@@ -0,0 +1,108 @@
+from concurrent.futures import ProcessPoolExecutor
+from dpest.functions import *
+
+
+def load_run_directory(path, files=None, workers=None):
+    """
+    Parses the output and measured data files of a DSSAT run directory, one
+    file per worker process, and returns the parsed files so that ``ts()``,
+    ``overview()``, ``uts()`` and ``read_overview()`` do not parse them again.
+
+    In the workers, each ``.OUT`` file (e.g. ``OVERVIEW.OUT``,
+    ``PlantGro.OUT``, ``PlantN.OUT``, ``SoilWat.OUT``) is indexed with
+    ``dpest.functions.OutFileIndex`` and the data of all its blocks is parsed:
+    the variable rows of the ``OVERVIEW.OUT`` blocks and the DataFrames of the
+    time-series blocks. The parsed data is kept on the index, which can be
+    passed to ``ts()``, ``overview()``, ``uts()`` and ``read_overview()`` in
+    place of the file path, and is reused while the file does not change. Each
+    T file (e.g. ``SWSW7501.WHT``) is read into a DataFrame and converted to
+    the typed observations used by ``ts()`` and ``uts()``, which are added to
+    the bounded in-memory tables of
+    ``dpest.functions.read_observation_table()``.
+
+    **Required Arguments**
+    ======================
+
+    * **path** (*str*):
+      Path to the DSSAT run directory, e.g. ``"C:/DSSAT48/Wheat"``.
+
+    **Optional Arguments**
+    ======================
+
+    * **files** (*list* of *str*, *optional*):
+      Names (or paths relative to ``path``) of the files to parse, e.g.
+      ``["OVERVIEW.OUT", "PlantGro.OUT", "SWSW7501.WHT"]``. If ``None``
+      (default), all the ``.OUT`` files and the T files (files with a
+      ``@TRNO`` table) of the directory are parsed.
+
+    * **workers** (*int*, *optional*):
+      Number of worker processes. Defaults to the number of CPUs, limited to
+      the number of files, or to ``1`` when the files are smaller than 16 MB
+      in total (starting the processes would take longer than parsing them).
+      With ``1``, the files are parsed in the current process.
+
+    **Returns**
+    ===========
+
+    * *dict*:
+      File names mapped to an ``OutFileIndex`` (``.OUT`` files) or to a
+      ``pandas.DataFrame`` (T files), in the order of ``files``.
+
+    **Example**
+    ===========
+
+    .. code-block:: python
+
+        from dpest.data import load_run_directory
+        import dpest
+
+        if __name__ == "__main__":
+            run = load_run_directory("C:/DSSAT48/Wheat", workers=4)
+
+            dpest.ts(
+                ts_file_path=run["PlantGro.OUT"],
+                treatment="164.0 KG N/HA IRRIG",
+                variables=["LAID", "CWAD"],
+            )
+
+    On Windows, the call must be placed under ``if __name__ == "__main__":``
+    because the worker processes import the calling script.
+    """
+    path = os.fspath(path)
+    if not os.path.isdir(path):
+        raise FileNotFoundError(f"The directory {path} does not exist.")
+
+    # Select the files to parse
+    if files is None:
+        files = sorted(
+            name for name in os.listdir(path)
+            if os.path.isfile(os.path.join(path, name))
+            and (name.upper().endswith('.OUT') or is_t_file(os.path.join(path, name)))
+        )
+    elif isinstance(files, str):
+        files = [files]
+
+    file_paths = [os.path.join(path, name) for name in files]
+    for file_path in file_paths:
+        validate_file_path(file_path)
+
+    if workers is None:
+        total_size = sum(os.path.getsize(file_path) for file_path in file_paths)
+        workers = (os.cpu_count() or 1) if total_size >= RUN_DIRECTORY_PARALLEL_MIN_BYTES else 1
+    workers = max(1, min(workers, len(file_paths)))
+
+    # Parse the files, concurrently when more than one worker is used
+    if workers == 1:
+        results = [load_run_file(file_path) for file_path in file_paths]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(load_run_file, file_paths))
+
+    run_files = {}
+    for name, (file_path, result, file_stat, observations) in zip(files, results):
+        # Keep the observations of the T files in memory for ts() and uts()
+        if observations is not None:
+            remember_observation_table(file_path, observations, file_stat)
+        run_files[name] = result
+
+    return run_files
@@ -17,12 +17,16 @@ def read_overview(
     and key phenological observations for each treatment within one or more
     experiments. This function parses those blocks and optionally filters the
     results by variable, experiment, treatment number, or treatment name.
+    The filters are applied while the file is scanned: blocks of other
+    experiments or treatments are skipped without reading their rows, and
+    rows of other variables are never converted into the DataFrame.
 
     **Required Arguments**
     ======================
 
-    * **overview_file** (*str*):
-      Path to the DSSAT ``OVERVIEW.OUT`` file to read.
+    * **overview_file** (*str* or *OutFileIndex*):
+      Path to the DSSAT ``OVERVIEW.OUT`` file to read, or an ``OutFileIndex``
+      of that file (``dpest.functions.OutFileIndex``) built beforehand.
 
       Examples:
 
@@ -152,24 +156,11 @@ def read_overview(
        rows where no measured value is available.
     """
 
-    # Validate overview file using the validate_file() function
-    validated_path = validate_file(overview_file, ".OUT")
+    # Validate overview file and index its blocks in a single scan
+    validated_path, out_index = validate_out_file(overview_file)
 
     # Get the dictionary with the line ranges for each cultivar
-    treatment_dict = simulations_lines(validated_path)  # FIX: use validated_path
-
-    # Initialize an empty DataFrame to store all the data
-    overview_df = pd.DataFrame(
-        columns=[
-            'EXPERIMENT',
-            'TREATMENT',
-            'TREATMENT_NAME',
-            'cultivar',
-            'VARIABLE',
-            'VALUE_SIMULATED',
-            'VALUE_MEASURED'
-        ]
-    )
+    treatment_dict = out_index.treatment_dict()
 
     # Handle the optional list of variables
     if variables is not None:
@@ -225,116 +216,12 @@ def read_overview(
                 "['164.0 KG N/HA DRY', '82.0 KG N/HA DRY']"
             )
 
-    with open(validated_path, 'r') as file:
-        lines = file.readlines()
-
-        # Iterate through each cultivar and extract data
-        for treatment_name, blocks in treatment_dict.items():
-
-            # Normalize to a list of (start_line, end_line) ranges
-            # (this allows the same treatment_name to appear in more than one experiment)
-            if not isinstance(blocks, list):
-                blocks = [blocks]
-
-            # Iterate over each block associated with the treatment_name
-            for (start_line, end_line) in blocks:
-
-                cultivar_data = []
-                experiment_info = None
-                model_crop = None
-                cultivar = None
-
-                # Extract experiment code from the compleate experiment name
-                for i in range(start_line, end_line):
-                    line = lines[i].strip()
-                    if line.startswith("EXPERIMENT"):
-                        experiment = line.split(":")[1].split()[0]
-
-                        # Iterate through the lines in the specified range to find the EXPERIMENT line
-                for i in range(start_line, end_line):
-                    line = lines[i].strip()
-
-                    # Look for the line containing 'MODEL'
-                    if line.startswith("MODEL"):
-                        # Extract model and crop names
-                        model_crop = line.split(':')[1].strip()
-
-                    if line.startswith('CROP') and 'CULTIVAR :' in line:
-                        # Extract CULTIVAR information using split
-                        parts = line.split('CULTIVAR :')
-                        if len(parts) > 1:
-                            cultivar = parts[1].split('ECOTYPE')[0].strip()
-                            # Extract everything between 'CULTIVAR :' and 'ECOTYPE'
-
-                    # Extract treatment number
-                    if line.strip().startswith('TREATMENT'):
-                        treatment = line.split()[1]
-
-                    # Look for the line with simulation results (lines after @)
-                    if line.startswith('@'):
-
-                        # Store the header line to return it
-                        header_line = line
-
-                        # Extract variable name and simulated and measured values
-                        for data_line in lines[i + 1:]:
-
-                            if not data_line.strip() or data_line.startswith('*'):
-                                break
-
-                            data_line = data_line.strip().split()
-                            variable_name = ' '.join(data_line[:-2])  # Get the variable name
-                            simulated_value = data_line[-2]
-                            measured_value = data_line[-1]
-
-                            # Replace any value starting with '-99' with an empty string
-                            simulated_value = '' if simulated_value.startswith('-99') else simulated_value
-                            measured_value = '' if measured_value.startswith('-99') else measured_value
-
-                            # Append the row data
-                            cultivar_data.append({
-                                'EXPERIMENT': experiment,
-                                'TREATMENT': treatment,
-                                'TREATMENT_NAME': treatment_name,
-                                'cultivar': cultivar,
-                                'VARIABLE': variable_name,
-                                'VALUE_SIMULATED': simulated_value,
-                                'VALUE_MEASURED': measured_value
-                            })
-
-                        # Convert to DataFrame and append to overview_df
-                        cultivar_df = pd.DataFrame(cultivar_data)
-                        overview_df = pd.concat([overview_df, cultivar_df], ignore_index=True)
-
-    # Remove rows where any of the columns 'VARIABLE', 'VALUE_SIMULATED',
-    # or 'VALUE_MEASURED' contain '--------'
-    overview_df = overview_df[
-        ~overview_df[['VARIABLE', 'VALUE_SIMULATED', 'VALUE_MEASURED']]
-        .apply(lambda x: x.astype(str).str.contains('--------'))
-        .any(axis=1)
-    ]
-
-    # Convert the 'VALUE_SIMULATED' and 'VALUE_MEASURED' columns to numeric values
-    overview_df['VALUE_SIMULATED'] = pd.to_numeric(overview_df['VALUE_SIMULATED'], errors='coerce')
-    overview_df['VALUE_MEASURED'] = pd.to_numeric(overview_df['VALUE_MEASURED'], errors='coerce')
-
-    # Convert all column names to lowercase
-    overview_df.columns = overview_df.columns.str.lower()
-
-    # Validate that requested filter values actually exist in the data
-    # Check variables
-    if variables is not None:  # FIX: guard to avoid iterating over None
-        vars_in_data = set(overview_df["variable"].unique())
-        missing_vars = [v for v in variables if v not in vars_in_data]
-        if missing_vars:
-            raise ValueError(
-                f"The following variables were not found: {missing_vars}.\n"
-                f"Please check spelling and that they exist in the file: {validated_path}."
-            )
+    # Validate that requested experiments and treatments exist, using the block headers
+    # recorded by the index (no variable rows are read for this)
 
     # Check experiments (experiment descriptions)
     if experiments is not None:
-        exps_in_data = set(overview_df["experiment"].unique())
+        exps_in_data = {block['experiment'] for block in out_index.blocks}
         missing_exps = [e for e in experiments if e not in exps_in_data]
         if missing_exps:
             raise ValueError(
@@ -342,9 +229,9 @@ def read_overview(
                 f"Please check spelling and that they exist in the file: {validated_path}."
             )
 
-    # Check treatment_names
+    # Check treatment numbers
     if treatments is not None:
-        tnumbs_in_data = set(overview_df["treatment"].unique())
+        tnumbs_in_data = {block['trno'] for block in out_index.blocks}
         missing_tnumbs = [t for t in treatments if t not in tnumbs_in_data]
         if missing_tnumbs:
             raise ValueError(
@@ -352,31 +239,87 @@ def read_overview(
                 f"Please check spelling and that they exist in the file: {validated_path}."
             )
 
-    # Check treatment_name
+    # Check treatment names
     if treatments_name is not None:
-        tnames_in_data = set(overview_df["treatments_name"].astype(str).unique())
-        missing_tnames = [tn for tn in treatments_name if tn not in tnames_in_data]
-        if missing_tnums:
+        tnames_in_data = {str(treatment_name) for treatment_name in treatment_dict}
+        missing_tnames = [tn for tn in treatments_name if str(tn) not in tnames_in_data]
+        if missing_tnames:
             raise ValueError(
                 f"The following treatments_name were not found: {missing_tnames}.\n"
                 f"Please check spelling and that they exist in the file: {validated_path}."
             )
+        treatments_name = [str(tn) for tn in treatments_name]
+
+    # Collect the values of each column across the selected blocks; the frame is built once at the end
+    columns = {
+        'EXPERIMENT': [],
+        'TREATMENT': [],
+        'TREATMENT_NAME': [],
+        'cultivar': [],
+        'VARIABLE': [],
+        'VALUE_SIMULATED': [],
+        'VALUE_MEASURED': [],
+    }
+    selected_variables = set(variables) if variables is not None else None
+
+    # Iterate through each cultivar and extract data
+    for treatment_name, blocks in treatment_dict.items():
+
+        # Skip the treatment names that were not requested
+        if treatments_name is not None and str(treatment_name) not in treatments_name:
+            continue
+
+        # Normalize to a list of (start_line, end_line) ranges
+        # (this allows the same treatment_name to appear in more than one experiment)
+        if not isinstance(blocks, list):
+            blocks = [blocks]
+
+        # Iterate over each block associated with the treatment_name
+        for (start_line, end_line) in blocks:
+
+            # Experiment code, treatment number and cultivar were recorded by the index
+            block = out_index.block_at(start_line)
+
+            # Skip the blocks of the experiments and treatments that were not requested
+            # before reading their variable rows
+            if experiments is not None and block['experiment'] not in experiments:
+                continue
+            if treatments is not None and block['trno'] not in treatments:
+                continue
+
+            # Extract variable name and simulated and measured values of the requested variables
+            rows = out_index.parsed_block(start_line)
+            if rows is None:
+                rows = parse_overview_block(out_index.read_block_lines(block), selected_variables)
+            elif selected_variables is not None:
+                rows = [row for row in rows if row[0] in selected_variables]
+            if not rows:
+                continue
+
+            variable_names, simulated_values, measured_values, _ = zip(*rows)
+            columns['EXPERIMENT'].extend([block['experiment']] * len(rows))
+            columns['TREATMENT'].extend([block['trno']] * len(rows))
+            columns['TREATMENT_NAME'].extend([treatment_name] * len(rows))
+            columns['cultivar'].extend([block['cultivar']] * len(rows))
+            columns['VARIABLE'].extend(variable_names)
+            columns['VALUE_SIMULATED'].extend(simulated_values)
+            columns['VALUE_MEASURED'].extend(measured_values)
+
+    # Build the frame, remove the '--------' rows and convert the values to numbers
+    overview_df = build_overview_frame(columns)
 
-    # Apply filters only when the corresponding argument is provided.
-    # Each filter is independent and can be combined in any order.
-    if variables is not None:
-        overview_df = overview_df[overview_df["variable"].isin(variables)]
-
-    if experiments is not None:
-        overview_df = overview_df[overview_df["experiment"].isin(experiments)]
-
-    if treatments is not None:
-        overview_df = overview_df[overview_df["treatment"].isin(treatments)]  # FIX: filter by name
+    # Convert all column names to lowercase
+    overview_df.columns = overview_df.columns.str.lower()
 
-    if treatments_name is not None:
-        overview_df = overview_df[
-            overview_df["treatment_name"].astype(str).isin(treatments_name)
-        ]  # FIX: filter by number
+    # Check that the requested variables were found in the selected blocks
+    if variables is not None:  # FIX: guard to avoid iterating over None
+        vars_in_data = set(overview_df["variable"].unique())
+        missing_vars = [v for v in variables if v not in vars_in_data]
+        if missing_vars:
+            raise ValueError(
+                f"The following variables were not found: {missing_vars}.\n"
+                f"Please check spelling and that they exist in the file: {validated_path}."
+            )
 
     # Optionally drop rows without measured values. This is useful when the caller
     # is interested only in cases where observations exist for evaluation.
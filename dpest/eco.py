@@ -191,22 +191,24 @@ def eco(
             group_parameters = [param.strip() for param in value.split(',')]  # Strip spaces from each parameter
             parameters.extend(group_parameters)  # Add the group parameters to the main list
 
-        # Read the ECO file
-        file_content = read_dssat_file(validated_eco_file_path)
-        lines = file_content.split('\n')
+        # Index the ECO file (read once and reused while the file does not change);
+        # the lines are copied as the template line is modified below
+        genotype_index = read_genotype_file_index(validated_eco_file_path, header_start)
+        lines = list(genotype_index.lines)
 
         # Locate header and target lines
-        header_line_number = next(idx for idx, line in enumerate(lines) if line.startswith(header_start))
-        header_line = lines[header_line_number]
+        if genotype_index.header_line is None:
+            raise ValueError(f"Header '{header_start}' not found in file {validated_eco_file_path}")
+        header_line = genotype_index.header_line
 
         # Get the number of the line that contains the parameters of the specified ecotype
-        ecotype_line_number = find_ecotype(file_content, header_start, ecotype, validated_eco_file_path)
+        ecotype_line_number = find_ecotype(genotype_index, header_start, ecotype, validated_eco_file_path)
         if isinstance(ecotype_line_number, str):  # Error message returned
             raise ValueError(ecotype_line_number)
-        minima_line_number = find_ecotype(file_content, header_start, minima, validated_eco_file_path)
+        minima_line_number = find_ecotype(genotype_index, header_start, minima, validated_eco_file_path)
         if isinstance(minima_line_number, str):  # Error message returned
             raise ValueError(minima_line_number)
-        maxima_line_number = find_ecotype(file_content, header_start, maxima, validated_eco_file_path)
+        maxima_line_number = find_ecotype(genotype_index, header_start, maxima, validated_eco_file_path)
         if isinstance(maxima_line_number, str):  # Error message returned
             raise ValueError(maxima_line_number)
 
@@ -215,7 +217,7 @@ def eco(
             parameter_values = {}
             for parameter in parameters:
                 try:
-                    par_position = find_parameter_position(header_line, parameter)
+                    par_position = genotype_index.parameter_position(parameter)
                     parameter_value = lines[line_number][par_position[0]:par_position[1] + 1].strip()
                     parameter_values[parameter] = parameter_value
                 except Exception:
@@ -242,11 +244,13 @@ def eco(
         # Iterate each parameter in the list to generate the template
         parameter_par_truncated = {}
 
-        count = 0
+        # Template of each parameter by its (start, end) position on the line
+        template_segments = {}
+
         for parameter in parameters:
 
             # Get the parameter position on the line
-            par_position = find_parameter_position(header_line, parameter)
+            par_position = genotype_index.parameter_position(parameter)
 
             # Validate and adjust the starting position if necessary
             if par_position[0] < len(ecotype):
@@ -376,30 +380,14 @@ def eco(
             # / Avoid overflowing 3‑char fields
             # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
-            # Extract the ecotype line to modify parameters
-            ecotype_line = lines[ecotype_line_number]
-
-            if count == 0:
-                # Replace the content at the specified position with adjusted_template
-                modified_line = (
-                        ecotype_line[:par_position[0]]  # Part of the line before the parameter
-                        + variable_template  # Insert the adjusted template
-                        + ecotype_line[par_position[1] + 1:]  # Part of the line after the parameter
-                )
-            else:
-                # Replace the content at the specified position with adjusted_template
-                modified_line = (
-                        modified_line[:par_position[0]]  # Part of the line before the parameter
-                        + variable_template  # Insert the adjusted template
-                        + modified_line[par_position[1] + 1:]  # Part of the line after the parameter
-                )
-            count += 1
+            # Store the template to replace the parameter on the line
+            template_segments[(par_position[0], par_position[1])] = variable_template
 
         #     # Save the parameter compleate name and truncated name into a dictionary
         #     parameter_par_truncated[parameter] = truncated_parameter.strip()
 
         # Insert the modified line back into the text
-        lines[ecotype_line_number] = modified_line
+        lines[ecotype_line_number] = replace_line_segments(lines[ecotype_line_number], template_segments)
 
         # Insert 'ptf' and marker at the beginning of the file content
         lines.insert(0, f"{tpl_first_line} {mrk}")
@@ -1,4 +1,12 @@
 import os
+import locale
+import mmap
+import json
+import hashlib
+import shutil
+import time
+from collections import OrderedDict
+import numpy as np
 import pandas as pd
 import re
 from datetime import datetime, timedelta
@@ -65,7 +73,16 @@ def find_cultivar(file_content, head_line, cultivar, cultivar_cul_file):
 
     Returns:
     int: The line number containing the cultivar if found, or a message if not found.
+
+    A GenotypeFileIndex of the file can be passed as ``file_content``; the cultivar is
+    then looked up in the index instead of scanning the file.
     """
+    if isinstance(file_content, GenotypeFileIndex):
+        line_number = file_content.cultivar_line(cultivar)
+        if line_number is None:
+            return f"The cultivar {cultivar} wasn't founded on file {cultivar_cul_file}"
+        return line_number
+
     lines = file_content.split('\n')
 
     # Find the index where the head parameters table starts to count the number of characters
@@ -111,7 +128,18 @@ def find_ecotype(file_content, head_line, ecotype, ecotype_file):
 
     Returns:
     int: The line number containing the ecotype if found, or a message if not found.
+
+    A GenotypeFileIndex of the file can be passed as ``file_content``; the ecotype is
+    then looked up in the index instead of scanning the file.
     """
+    if isinstance(file_content, GenotypeFileIndex):
+        if not file_content.header_line_numbers:
+            return f"Header '{head_line}' not found in file {ecotype_file}"
+        line_number = file_content.ecotype_line(ecotype)
+        if line_number is None:
+            return f"The ecotype {ecotype} wasn't found in file {ecotype_file}"
+        return line_number
+
     lines = file_content.split('\n')
 
     # Find the header row
@@ -198,73 +226,827 @@ def find_parameter_position(line, parameter=None):
     return adjusted_positions
 
 
-def simulations_lines(file_path):
+
+class GenotypeFileIndex:
     """
-    Identifies and extracts the line ranges associated with specific treatments in the OVERVIEW and TS (PlantGro.OUT, PlantN.OUT, etc.) output files.
+    Index of a DSSAT genotype file (.CUL or .ECO), built from a single read of the file.
+
+    The lines of the cultivars (VAR# and VAR-NAME) and of the ecotypes (ECO#) are mapped to
+    their line numbers, and the parameters of the header to their character spans, so that
+    find_cultivar(), find_ecotype() and the parameter lookups of cul() and eco() do not
+    scan the file again. The rules of the file scans are kept: cultivar rows are aligned
+    with the last header of the file, ecotype rows follow the first header and the
+    parameter spans come from the first header. Use read_genotype_file_index() to reuse
+    the index while the file does not change.
+
+    Args:
+        file_path (str): Path to the .CUL or .ECO file.
+        header_start (str): Start of the header line of the parameter table (e.g. '@VAR#'
+            or '@ECO#').
+
+    Attributes:
+        lines (list of str): The lines of the file (without line endings).
+        header_line_numbers (list of int): Numbers of the lines that start with ``header_start``.
+        header_line_number (int): Number of the first header line, or None.
+        header_line (str): The first header line, or None.
+        parameter_spans (dict): Parameter names of the first header mapped to their
+            (start, end) character positions (end included, see find_parameter_position()).
+    """
+
+    def __init__(self, file_path, header_start):
+        self.file_path = file_path
+        self.header_start = header_start
+
+        with open(file_path, 'r') as file:
+            self.lines = file.read().split('\n')
+
+        self.header_line_numbers = [
+            idx for idx, line in enumerate(self.lines) if line.startswith(header_start)
+        ]
+        if self.header_line_numbers:
+            self.header_line_number = self.header_line_numbers[0]
+            self.header_line = self.lines[self.header_line_number]
+        else:
+            self.header_line_number = None
+            self.header_line = None
+
+        # Parameter spans of the header (the first element with a name wins, as in
+        # find_parameter_position())
+        self.parameter_spans = {}
+        if self.header_line is not None:
+            for start, end in find_parameter_position(self.header_line):
+                self.parameter_spans.setdefault(self.header_line[start:end + 1].strip(), (start, end))
+
+        self._cultivars = None
+        self._ecotypes = None
+
+    def __repr__(self):
+        return f"GenotypeFileIndex({self.file_path!r}, {self.header_start!r})"
+
+    def _aligned_rows(self, header_line_number, start=0):
+        """Yields (line number, data part) of the rows aligned with a header line."""
+        header_length = len(self.lines[header_line_number])
+        for idx in range(start, len(self.lines)):
+            # Remove trailing DSSAT comments starting with '!' (if any)
+            data_part = self.lines[idx].split('!')[0].rstrip()
+            # Skip pure comment or empty lines; require same length as header
+            if data_part.strip() and len(data_part) == header_length:
+                yield idx, data_part
+
+    def cultivar_line(self, cultivar):
+        """
+        Returns the number of the first line whose VAR# or VAR-NAME is ``cultivar``, or None.
+        """
+        if self._cultivars is None:
+            self._cultivars = {}
+            if self.header_line_numbers:
+                head = self.header_line_numbers[-1]
+                positions = extract_element_positions(self.lines[head])
+                for idx, data_part in self._aligned_rows(head):
+                    var_num = data_part[positions[0][0]:positions[0][1]].strip()
+                    var_name = data_part[positions[1][0]:positions[1][1]].strip()
+                    self._cultivars.setdefault(var_num, idx)
+                    self._cultivars.setdefault(var_name, idx)
+
+        return self._cultivars.get(cultivar)
+
+    def ecotype_line(self, ecotype):
+        """
+        Returns the number of the first line after the header whose ECO# is ``ecotype``, or None.
+        """
+        if self._ecotypes is None:
+            self._ecotypes = {}
+            if self.header_line_numbers:
+                head = self.header_line_numbers[0]
+                positions = extract_element_positions(self.lines[head])
+                for idx, data_part in self._aligned_rows(head, start=head + 1):
+                    eco_num = data_part[positions[0][0]:positions[0][1]].strip()
+                    if eco_num:
+                        self._ecotypes.setdefault(eco_num, idx)
+
+        return self._ecotypes.get(ecotype)
+
+    def parameter_position(self, parameter):
+        """
+        Returns the [start, end] character positions of a parameter of the header (see
+        find_parameter_position()).
+
+        Raises:
+            ValueError: If the parameter is not in the header.
+        """
+        span = self.parameter_spans.get(parameter)
+        if span is None:
+            raise ValueError(f"Parameter '{parameter}' does not exist in the header line of {self.file_path}.")
+        return list(span)
+
+
+# Genotype file indexes, by absolute path and header start, in least recently used order
+GENOTYPE_FILE_INDEXES = OrderedDict()
+GENOTYPE_FILE_INDEX_MAX_ENTRIES = 32
+
+
+def read_genotype_file_index(file_path, header_start):
+    """
+    Returns the GenotypeFileIndex of a .CUL or .ECO file. The index is built once and kept
+    in memory while the size and modification time of the file do not change; the least
+    recently used indexes are evicted.
 
     Parameters:
-    file_path (str): The path to the text file containing the .OUT file.
+    file_path (str): Path to the DSSAT genotype file.
+    header_start (str): Start of the header line of the parameter table (e.g. '@VAR#').
 
     Returns:
-    dict: A dictionary where the keys are TREATMENT names and the values are
-          tuples containing the start and end line numbers. If the same treatment
-          name appears more than once (e.g., in different experiments), the value
-          will be a list of tuples with all matching ranges.
+    GenotypeFileIndex: The index of the file.
     """
+    stat = os.stat(file_path)
+    key = (os.path.abspath(file_path), header_start)
+    file_stat = (stat.st_size, stat.st_mtime_ns)
 
-    # Initialize dictionaries and lists to store relevant data
-    result_dict = {}
-    dssat_lines = []
-    run_lines = []
+    memo = GENOTYPE_FILE_INDEXES.get(key)
+    if memo is not None and memo[0] == file_stat:
+        GENOTYPE_FILE_INDEXES.move_to_end(key)
+        return memo[1]
 
-    # Open the file and read all lines into a list
-    with open(file_path, 'r') as file:
-        lines = file.readlines()
+    index = GenotypeFileIndex(file_path, header_start)
+    GENOTYPE_FILE_INDEXES[key] = (file_stat, index)
+    GENOTYPE_FILE_INDEXES.move_to_end(key)
+    while len(GENOTYPE_FILE_INDEXES) > GENOTYPE_FILE_INDEX_MAX_ENTRIES:
+        GENOTYPE_FILE_INDEXES.popitem(last=False)
 
-    # Iterate through each line to identify lines starting with '*DSSAT' and 'TREATMENT'
-    for i, line in enumerate(lines):
-        if '*DSSAT' in line:
-            # Store the line number of each '*DSSAT' occurrence
-            dssat_lines.append(i)
-        if line.strip().startswith('TREATMENT'):
-            # Store the line number and the content of each 'TREATMENT' line
-            run_lines.append((i, line.strip()))
-
-    # Process the stored lines to populate the result dictionary
-    for i, start_line in enumerate(dssat_lines):
-        if i < len(dssat_lines) - 1:
-            # Determine the end line for the current '*DSSAT' section
-            end_line = dssat_lines[i + 1] - 1
-        else:
-            # If it's the last '*DSSAT' section, set the end line as the last line of the file
-            end_line = len(lines) - 1
-            end_line = len(lines)
-
-        # Find the appropriate 'TREATMENT' line within the current '*DSSAT' section
-        run_info = None
-        for run_start, run_line in run_lines:
-            if run_start >= start_line and run_start <= end_line:
-                # Extract only the 'treatment' name from the 'TREATMENT -n' line
-                run_info = run_line.split(':')[1].strip().rsplit(maxsplit=1)[0]
-                break
+    return index
+
+
+def replace_line_segments(line, segments):
+    """
+    Replaces fixed-width segments of a line and assembles the result in a single join.
+
+    Parameters:
+    line (str): The line to modify.
+    segments (dict): (start, end) character positions (end included, as returned by
+        find_parameter_position()) mapped to the text that replaces them. The segments
+        must not overlap.
+
+    Returns:
+    str: The line with the segments replaced.
+    """
+    parts = []
+    position = 0
+    for (start, end), text in sorted(segments.items()):
+        if start < position:
+            raise ValueError(f"Overlapping segments at position {start} of the line: {line!r}")
+        parts.append(line[position:start])
+        parts.append(text)
+        position = end + 1
+    parts.append(line[position:])
+
+    return ''.join(parts)
+
+
+### Index cache
+# Opt-in on-disk cache of the parsed layout of .OUT files and of the T-file tables. The cache is
+# enabled by passing ``cache_dir`` or by setting the DPEST_CACHE_DIR environment variable. Each
+# entry is a JSON '.dpidx' file validated against the size, modification time and a hash of the
+# first bytes of the source file; the least recently used entries are removed.
+
+INDEX_CACHE_DIR_ENV = 'DPEST_CACHE_DIR'
+INDEX_CACHE_SUFFIX = '.dpidx'
+INDEX_CACHE_VERSION = 2
+INDEX_CACHE_MAX_ENTRIES = 256
+INDEX_CACHE_HEADER_BYTES = 4096
+
+# Columnar cache of parsed time-series blocks: one '.dpcol' directory per block with one
+# .npy file per column and a JSON schema (see read_growth_file())
+COLUMN_CACHE_SUFFIX = '.dpcol'
+COLUMN_CACHE_MAX_ENTRIES = 4096
+
+
+def get_index_cache_dir(cache_dir=None):
+    """
+    Returns the directory of the index cache, or None if the cache is disabled.
+
+    Args:
+        cache_dir (str, optional): Explicit cache directory. If not provided, the
+            DPEST_CACHE_DIR environment variable is used.
+
+    Returns:
+        str or None: The cache directory.
+    """
+    if cache_dir is None:
+        cache_dir = os.environ.get(INDEX_CACHE_DIR_ENV) or None
+    return os.fspath(cache_dir) if cache_dir is not None else None
+
+
+def file_signature(file_path):
+    """
+    Returns the signature used to validate the cache entries of a file: its size,
+    modification time and a hash of its first bytes.
+
+    Args:
+        file_path (str): Path to the file.
+
+    Returns:
+        dict: The signature of the file.
+    """
+    stat = os.stat(file_path)
+    with open(file_path, 'rb') as file:
+        header_hash = hashlib.sha1(file.read(INDEX_CACHE_HEADER_BYTES)).hexdigest()
+
+    return {
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'header_hash': header_hash,
+    }
+
+
+def index_cache_path(file_path, kind, cache_dir):
+    """
+    Returns the path of the cache entry of a file.
+
+    Args:
+        file_path (str): Path to the source file.
+        kind (str): Kind of entry (e.g. 'out' for an OutFileIndex, 'tfile' for a T-file table).
+        cache_dir (str): The cache directory.
+
+    Returns:
+        str: Path to the '.dpidx' cache file.
+    """
+    source = os.path.abspath(file_path)
+    key = hashlib.sha1(f"{kind}:{source}".encode('utf-8')).hexdigest()[:16]
+    return os.path.join(cache_dir, f"{os.path.basename(source)}.{kind}.{key}{INDEX_CACHE_SUFFIX}")
+
+
+def load_index_cache(file_path, kind, cache_dir=None, signature=None):
+    """
+    Loads the cache entry of a file if it is still valid for the current file content.
+
+    Args:
+        file_path (str): Path to the source file.
+        kind (str): Kind of entry.
+        cache_dir (str, optional): Cache directory (see get_index_cache_dir()).
+        signature (dict, optional): Signature to compare with the cached one, for
+            sources that file_signature() does not apply to (e.g. directories).
+
+    Returns:
+        dict or None: The cached payload, or None if there is no valid entry.
+    """
+    cache_dir = get_index_cache_dir(cache_dir)
+    if cache_dir is None:
+        return None
+
+    cache_path = index_cache_path(file_path, kind, cache_dir)
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as cache_file:
+            entry = json.load(cache_file)
+        if signature is None:
+            signature = file_signature(file_path)
+    except (OSError, ValueError):
+        return None
+
+    if (entry.get('version') != INDEX_CACHE_VERSION
+            or entry.get('source') != os.path.abspath(file_path)
+            or entry.get('signature') != signature):
+        return None
+
+    # Mark the entry as recently used
+    try:
+        os.utime(cache_path)
+    except OSError:
+        pass
+
+    return entry['payload']
+
+
+def save_index_cache(file_path, kind, payload, signature, cache_dir=None, max_entries=INDEX_CACHE_MAX_ENTRIES):
+    """
+    Saves the cache entry of a file and removes the least recently used entries.
+    Errors writing the cache are ignored, since the cache is only an optimization.
+
+    Args:
+        file_path (str): Path to the source file.
+        kind (str): Kind of entry.
+        payload (dict): JSON-serializable content to cache.
+        signature (dict): Signature of the file taken before it was parsed (see file_signature()).
+        cache_dir (str, optional): Cache directory (see get_index_cache_dir()).
+        max_entries (int): Maximum number of entries kept in the cache directory.
+    """
+    cache_dir = get_index_cache_dir(cache_dir)
+    if cache_dir is None:
+        return
+
+    cache_path = index_cache_path(file_path, kind, cache_dir)
+    entry = {
+        'version': INDEX_CACHE_VERSION,
+        'source': os.path.abspath(file_path),
+        'kind': kind,
+        'signature': signature,
+        'payload': payload,
+    }
+
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+
+        # Write to a temporary file first so that readers never see a partial entry
+        temporary_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(temporary_path, 'w', encoding='utf-8') as cache_file:
+            json.dump(entry, cache_file)
+        os.replace(temporary_path, cache_path)
+    except (OSError, TypeError, ValueError):
+        return
+
+    evict_index_cache(cache_dir, max_entries)
+
+
+def evict_index_cache(cache_dir, max_entries=INDEX_CACHE_MAX_ENTRIES, suffix=INDEX_CACHE_SUFFIX):
+    """
+    Removes the least recently used entries of a cache directory, keeping at most
+    ``max_entries`` of them.
+
+    Args:
+        cache_dir (str): The cache directory.
+        max_entries (int): Maximum number of entries to keep.
+        suffix (str): Suffix of the entries: '.dpidx' files, or '.dpcol' directories
+            of the columnar cache of time-series blocks.
+    """
+    entries = []
+    try:
+        with os.scandir(cache_dir) as scan:
+            for entry in scan:
+                if entry.name.endswith(suffix):
+                    entries.append((entry.stat().st_mtime_ns, entry.path))
+    except OSError:
+        return
+
+    entries.sort()
+    for _, path in entries[:max(len(entries) - max_entries, 0)]:
+        try:
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+            else:
+                os.remove(path)
+        except OSError:
+            pass
+
+
+### DSSAT output file index
+# A single scan over a DSSAT .OUT file records the layout of every '*DSSAT' block, so that
+# ts(), uts(), overview() and read_overview() do not need to re-read the file for each lookup.
+
+# Encoding used to decode the .OUT files (the same default used by open() in text mode)
+OUT_FILE_ENCODING = locale.getpreferredencoding(False)
+
+# Simulation data rows of the time-series files start with YEAR and DOY (e.g. " 1975 145 ...")
+DATA_LINE_RE = re.compile(r"^\s*\d{4}\s+\d{1,3}\b")
+DATA_LINE_BYTES_RE = re.compile(rb"^\s*\d{4}\s+\d{1,3}\b")
+
+
+def decode_out_line(raw_line):
+    """
+    Decodes a line read in binary mode from a DSSAT .OUT file, normalizing the line
+    ending in the same way as reading the file in text mode.
+
+    Args:
+        raw_line (bytes): The raw line, including its line ending.
+
+    Returns:
+        str: The decoded line.
+    """
+    line = raw_line.decode(OUT_FILE_ENCODING, errors='replace')
+    if line.endswith('\r\n'):
+        line = line[:-2] + '\n'
+    return line
+
+
+def parse_out_block_line(line, block):
+    """
+    Updates a block description with the information found on one header line of a
+    '*DSSAT' block (RUN, MODEL, EXPERIMENT, TREATMENT and CROP/CULTIVAR lines). Only
+    the first occurrence of each field inside the block is kept.
+
+    Args:
+        line (str): A line of the block.
+        block (dict): The block description to update.
+
+    Returns:
+        bool: True if the line carried block information, False otherwise.
+    """
+    stripped = line.strip()
+
+    if stripped.startswith('*RUN'):
+        # Example: "*RUN   1        : 0 KG N/HA DRY             CSCER048 SWSW7501    1"
+        if block.get('run') is None:
+            run = stripped[len('*RUN'):].split(':')[0].strip()
+            block['run'] = int(run) if run.isdigit() else run
+        return True
+
+    if stripped.startswith('MODEL'):
+        # Example: "MODEL          : CSCER048 - Wheat"
+        if block.get('model_crop') is None:
+            model_crop = stripped.split(':')[1].strip()
+            parts = model_crop.split('-')
+            block['model_crop'] = model_crop
+            block['model'] = parts[0].strip()
+            block['crop'] = parts[1].strip() if len(parts) > 1 else None
+        return True
+
+    if stripped.startswith('EXPERIMENT'):
+        # Example: "EXPERIMENT     : SWSW7501 WH N RESPONSE,SWIFT CURRENT  7FE(N)*2IR  (DSSAT3)"
+        if block.get('experiment') is None:
+            experiment_name = stripped.split(':')[1].strip()
+            block['experiment_name'] = experiment_name
+            block['experiment'] = experiment_name.split()[0] if experiment_name else None
+        return True
+
+    if stripped.startswith('TREATMENT'):
+        # Example: "TREATMENT  1   : 0 KG N/HA DRY             CSCER048"
+        if block.get('treatment') is None:
+            block['trno'] = stripped.split()[1].strip()
+            block['treatment'] = stripped.split(':')[1].strip().rsplit(maxsplit=1)[0]
+        return True
+
+    if stripped.startswith('CROP') and 'CULTIVAR :' in stripped:
+        # Example: "CROP           : Wheat            CULTIVAR : MANITOU          ECOTYPE :CAWH01"
+        if block.get('cultivar') is None:
+            block['cultivar'] = stripped.split('CULTIVAR :')[1].split('ECOTYPE')[0].strip()
+        return True
+
+    return False
+
+
+class OutFileIndex:
+    """
+    Index of the '*DSSAT' blocks of a DSSAT output (.OUT) file, built in a single scan.
+
+    For each block the index records its line range (with the same convention used by
+    ``simulations_lines``), its byte range, the RUN number, experiment code and name,
+    MODEL and crop, TREATMENT number and name, cultivar, the first '@' header line
+    (e.g. '@YEAR DOY DAS ...') and the first and last simulation data rows.
+
+    An index can be passed instead of a file path to ts(), uts(), overview() and
+    read_overview(), and to the helper functions that take the ``file_path`` of a .OUT file.
+    For a file that is still growing, update() parses only the appended bytes (see also
+    OutFileMonitor).
+
+    When an index cache is enabled (``cache_dir`` or the DPEST_CACHE_DIR environment
+    variable), the block layout is loaded from the cache if the file did not change, and
+    saved to it after each build.
 
-        # If the treatment information was found, store it in the result dictionary
-        if run_info:
-            block_range = (start_line, end_line)
+    Args:
+        file_path (str): Path to the DSSAT .OUT file.
+        cache_dir (str, optional): Directory of the index cache.
+
+    Attributes:
+        file_path (str): Path to the indexed file.
+        blocks (list of dict): One description per '*DSSAT' block, in file order.
+        line_count (int): Number of lines in the file.
+        size (int): File size in bytes when the index was built.
+        mtime_ns (int): File modification time when the index was built.
+        head_size (int): Number of bytes at the start of the file covered by ``head_hash``.
+        head_hash (str): Hash of the first bytes of the file, used by update().
+        anchor_hash (str): Hash of the bytes before the last block, used by update().
+        parsed_blocks (dict): Start lines of the blocks parsed by parse_blocks() mapped to
+            their data (see parsed_block()).
+    """
+
+    def __init__(self, file_path, cache_dir=None):
+        self.file_path = os.fspath(file_path)
+        self.cache_dir = get_index_cache_dir(cache_dir)
+        self.parsed_blocks = {}
+        if not self.load_cache():
+            self.build()
+
+    def load_cache(self):
+        """
+        Loads the block layout from the index cache.
+
+        Returns:
+            bool: True if a valid cache entry was found, False otherwise.
+        """
+        payload = load_index_cache(self.file_path, 'out', self.cache_dir)
+        if payload is None:
+            return False
+
+        self.blocks = payload['blocks']
+        self.line_count = payload['line_count']
+        self.size = payload['size']
+        self.mtime_ns = payload['mtime_ns']
+        self.head_size = payload['head_size']
+        self.head_hash = payload['head_hash']
+        self.anchor_hash = payload['anchor_hash']
+        self._blocks_by_start = {block['start_line']: block for block in self.blocks}
+        return True
+
+    def __fspath__(self):
+        return self.file_path
+
+    def __repr__(self):
+        return f"OutFileIndex({self.file_path!r}, blocks={len(self.blocks)})"
+
+    def build(self):
+        """
+        Scans the file once and (re)builds the block descriptions.
+        """
+        self._scan([], 0, 0)
+
+    def update(self):
+        """
+        Brings the index up to date with the file, parsing only the bytes appended since the
+        last scan (e.g. while DSSAT appends RUN blocks during a batch run). The last known
+        block is parsed again, since it may have been incomplete. If the file was not only
+        appended to (it shrank or its first bytes changed), the whole file is scanned again.
+
+        Returns:
+            list of dict: The blocks that are new or were parsed again, in file order.
+        """
+        stat = os.stat(self.file_path)
+        if stat.st_size == self.size and stat.st_mtime_ns == self.mtime_ns:
+            return []
+
+        # The file was only appended to if it did not shrink and both its first bytes and the
+        # bytes before the last block are unchanged (e.g. uts() inserts rows inside blocks)
+        last_block = self.blocks[-1] if self.blocks else None
+        if (last_block is None
+                or stat.st_size < self.size
+                or self._head_hash(self.head_size) != self.head_hash
+                or self._anchor_hash(last_block['start_byte']) != self.anchor_hash):
+            self.build()
+            return list(self.blocks)
+
+        # Parse again from the start of the last block, keeping the blocks before it
+        kept_blocks = self.blocks[:-1]
+        self._scan(kept_blocks, last_block['start_byte'], last_block['start_line'])
+
+        return self.blocks[len(kept_blocks):]
+
+    def _head_hash(self, size):
+        # Hash of the first bytes of the file, used by update() to detect rewritten files
+        with open(self.file_path, 'rb') as file:
+            return hashlib.sha1(file.read(size)).hexdigest()
+
+    def _anchor_hash(self, start_byte):
+        # Hash of the bytes before (and of the '*DSSAT' mark at) the start of the last block,
+        # used by update() to detect changes inside the file
+        window_start = max(start_byte - INDEX_CACHE_HEADER_BYTES, 0)
+        with open(self.file_path, 'rb') as file:
+            file.seek(window_start)
+            return hashlib.sha1(file.read(start_byte - window_start + len(b'*DSSAT'))).hexdigest()
+
+    def _scan(self, blocks, offset, line_number):
+        """
+        Scans the file from the byte ``offset`` (the start of line ``line_number``) and appends
+        the blocks found to ``blocks``, which hold the blocks before that offset.
+        """
+        blocks = list(blocks)
+        block = None
+        line_count = line_number
+
+        stat = os.stat(self.file_path)
+        signature = file_signature(self.file_path) if self.cache_dir is not None else None
+
+        with open(self.file_path, 'rb') as file:
+            file.seek(offset)
+            for line_number, raw_line in enumerate(file, start=line_number):
+                line_count += 1
+
+                if b'*DSSAT' in raw_line:
+                    # A new block starts at each '*DSSAT' line
+                    block = self._new_block(line_number, offset)
+                    blocks.append(block)
+
+                elif block is not None:
+                    stripped = raw_line.lstrip()
+                    first_char = stripped[:1]
+
+                    if first_char.isdigit():
+                        # Simulation data rows: keep the first and the last one of the block
+                        if DATA_LINE_BYTES_RE.match(raw_line):
+                            if block['first_data_line'] is None:
+                                block['first_data_line'] = decode_out_line(raw_line)
+                                block['first_data_line_number'] = line_number
+                            block['last_data_line'] = raw_line
+                            block['last_data_line_number'] = line_number
+
+                    elif first_char == b'@':
+                        # Column header of the block (only the first one is kept)
+                        if block['header_line'] is None:
+                            block['header_line'] = decode_out_line(raw_line)
+                            block['header_line_number'] = line_number
+
+                    elif first_char in (b'*', b'M', b'E', b'T', b'C'):
+                        parse_out_block_line(decode_out_line(raw_line), block)
+
+                offset += len(raw_line)
+
+        # Close the line and byte ranges of each block
+        for i, block in enumerate(blocks):
+            if i < len(blocks) - 1:
+                block['end_line'] = blocks[i + 1]['start_line'] - 1
+                block['end_byte'] = blocks[i + 1]['start_byte']
+            else:
+                block['end_line'] = line_count
+                block['end_byte'] = offset
+
+            if isinstance(block['last_data_line'], bytes):
+                block['last_data_line'] = decode_out_line(block['last_data_line'])
+
+        self.blocks = blocks
+        self.parsed_blocks = {}
+        self.line_count = line_count
+        self.size = stat.st_size
+        self.mtime_ns = stat.st_mtime_ns
+        self.head_size = min(stat.st_size, INDEX_CACHE_HEADER_BYTES)
+        self.head_hash = self._head_hash(self.head_size)
+        self.anchor_hash = self._anchor_hash(blocks[-1]['start_byte']) if blocks else None
+        self._blocks_by_start = {block['start_line']: block for block in blocks}
+
+        if signature is not None:
+            payload = {
+                'blocks': blocks,
+                'line_count': line_count,
+                'size': self.size,
+                'mtime_ns': self.mtime_ns,
+                'head_size': self.head_size,
+                'head_hash': self.head_hash,
+                'anchor_hash': self.anchor_hash,
+            }
+            save_index_cache(self.file_path, 'out', payload, signature, self.cache_dir)
+
+    @staticmethod
+    def _new_block(line_number, offset):
+        return {
+            'start_line': line_number,
+            'end_line': None,
+            'start_byte': offset,
+            'end_byte': None,
+            'run': None,
+            'model_crop': None,
+            'model': None,
+            'crop': None,
+            'experiment': None,
+            'experiment_name': None,
+            'trno': None,
+            'treatment': None,
+            'cultivar': None,
+            'header_line': None,
+            'header_line_number': None,
+            'first_data_line': None,
+            'first_data_line_number': None,
+            'last_data_line': None,
+            'last_data_line_number': None,
+        }
+
+    def is_current(self):
+        """
+        Checks that the file has not changed (size and modification time) since the
+        index was built.
+        """
+        try:
+            stat = os.stat(self.file_path)
+        except OSError:
+            return False
+        return stat.st_size == self.size and stat.st_mtime_ns == self.mtime_ns
+
+    def block_at(self, start_line):
+        """
+        Returns the description of the block starting at ``start_line``, or None.
+        """
+        return self._blocks_by_start.get(start_line)
+
+    def treatment_dict(self):
+        """
+        Returns the treatment line ranges in the same format as ``simulations_lines``.
+        """
+        result_dict = {}
+        for block in self.blocks:
+            treatment = block['treatment']
+            if not treatment:
+                continue
+
+            block_range = (block['start_line'], block['end_line'])
 
             # If the same treatment appears multiple times, store all ranges instead of overwriting
-            if run_info in result_dict:
-                # Convert existing tuple to list (if needed) and append the new range
-                if isinstance(result_dict[run_info], list):
-                    result_dict[run_info].append(block_range)
+            if treatment in result_dict:
+                if isinstance(result_dict[treatment], list):
+                    result_dict[treatment].append(block_range)
                 else:
-                    result_dict[run_info] = [result_dict[run_info], block_range]
+                    result_dict[treatment] = [result_dict[treatment], block_range]
             else:
-                # First time this treatment appears
-                result_dict[run_info] = block_range
+                result_dict[treatment] = block_range
+
+        return result_dict
+
+    def read_block_bytes(self, block, use_mmap=False):
+        """
+        Reads only the byte range of one block.
+
+        Args:
+            block (dict): A block description from this index.
+            use_mmap (bool): If True, the file is memory-mapped and only the pages of
+                the block are touched. The map is closed before returning, so the file
+                is not kept locked (e.g. while DSSAT rewrites it on Windows).
+
+        Returns:
+            bytes: The raw content of the block.
+        """
+        with open(self.file_path, 'rb') as file:
+            if use_mmap:
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+                    return mapped_file[block['start_byte']:block['end_byte']]
+
+            file.seek(block['start_byte'])
+            return file.read(block['end_byte'] - block['start_byte'])
+
+    def read_block_lines(self, block, use_mmap=False):
+        """
+        Reads only the byte range of one block and returns its lines.
+
+        Args:
+            block (dict): A block description from this index.
+            use_mmap (bool): If True, the block is read through a memory map of the file.
+
+        Returns:
+            list of str: The lines of the block, including line endings.
+        """
+        raw = self.read_block_bytes(block, use_mmap=use_mmap)
+        return [decode_out_line(raw_line) for raw_line in raw.splitlines(keepends=True)]
+
+    def parse_blocks(self):
+        """
+        Parses the data of every block and keeps it on the index: the rows of the OVERVIEW.OUT
+        blocks (as returned by parse_overview_block()) and the DataFrames of the time-series
+        blocks with a '@YEAR' header (as returned by read_growth_file()). Other blocks are left
+        out. Used by load_run_directory() to parse the files in worker processes; the parsed
+        data travels with the index and is reused by read_growth_file(), extract_overview_data()
+        and read_overview() while the file does not change.
+        """
+        parsed_blocks = {}
+        for block in self.blocks:
+            header_tokens = (block['header_line'] or '').split()
+            if header_tokens[:2] == ['@', 'VARIABLE']:
+                parsed_blocks[block['start_line']] = parse_overview_block(self.read_block_lines(block))
+            elif header_tokens[:1] == ['@YEAR']:
+                parsed_blocks[block['start_line']] = growth_lines_to_dataframe(self.read_block_lines(block))
+        self.parsed_blocks = parsed_blocks
+
+    def parsed_block(self, start_line):
+        """
+        Returns the data of the block starting at ``start_line`` kept by parse_blocks(), or
+        None if the block was not parsed or the file changed since.
+        """
+        parsed = self.parsed_blocks.get(start_line)
+        if parsed is None or not self.is_current():
+            return None
+        return parsed
+
+
+def validate_out_file(file_path, cache_dir=None):
+    """
+    Validates a DSSAT .OUT file given either as a path or as an OutFileIndex, and
+    returns the validated path together with an up-to-date index of the file.
+
+    Args:
+        file_path (str or OutFileIndex): Path to the .OUT file, or a prebuilt index.
+        cache_dir (str, optional): Directory of the index cache used when building a new
+            index (see OutFileIndex).
+
+    Returns:
+        tuple: (validated_path, OutFileIndex)
+    """
+    if isinstance(file_path, OutFileIndex):
+        out_index = file_path
+        validated_path = validate_file(out_index.file_path, '.OUT')
+
+        # Update the index if the file changed since it was built (e.g. after uts()); only
+        # appended bytes are parsed when the file grew
+        if not out_index.is_current():
+            out_index.update()
+
+        return validated_path, out_index
+
+    validated_path = validate_file(file_path, '.OUT')
+    return validated_path, OutFileIndex(validated_path, cache_dir=cache_dir)
+
+
+def simulations_lines(file_path):
+    """
+    Identifies and extracts the line ranges associated with specific treatments in the OVERVIEW and TS (PlantGro.OUT, PlantN.OUT, etc.) output files.
+
+    Parameters:
+    file_path (str or OutFileIndex): The path to the text file containing the .OUT file, or a prebuilt
+        OutFileIndex of that file (in which case the file is not read again).
+
+    Returns:
+    dict: A dictionary where the keys are TREATMENT names and the values are
+          tuples containing the start and end line numbers. If the same treatment
+          name appears more than once (e.g., in different experiments), the value
+          will be a list of tuples with all matching ranges.
+    """
+
+    # Build the block index in a single scan unless one was provided
+    if not isinstance(file_path, OutFileIndex):
+        file_path = OutFileIndex(file_path)
 
     # Return the entire dictionary with all treatment information
-    return result_dict
+    return file_path.treatment_dict()
 
 def resolve_treatment_block_by_experiment(file_path, treatment, treatment_dict, experiment=None):
     """
@@ -332,7 +1114,15 @@ def extract_experiment_code_from_range(file_path, start_i, end_i):
     The experiment code is assumed to be on a line like:
         EXPERIMENT     : AZMC9311 .....
     and the code is taken as the first token after ':'.
+
+    When ``file_path`` is an OutFileIndex, the code recorded in the index is
+    returned without reading the file.
     """
+    if isinstance(file_path, OutFileIndex):
+        block = file_path.block_at(start_i)
+        if block is not None:
+            return block['experiment']
+
     with open(file_path, "r") as f:
         lines = f.readlines()
 
@@ -349,13 +1139,92 @@ def extract_experiment_code_from_range(file_path, start_i, end_i):
     return experiment_info
 
 
+# Columns of the OVERVIEW.OUT data rows that may hold the '--------' separator lines
+OVERVIEW_VALUE_COLUMNS = ['VARIABLE', 'VALUE_SIMULATED', 'VALUE_MEASURED']
+
+
+def parse_overview_block(lines, variables=None):
+    """
+    Parses the rows that follow the '@' header line of one OVERVIEW.OUT block.
+
+    Parameters:
+    lines (list of str): The lines of the block.
+    variables (set, optional): If provided, only the rows of these variables are returned; the
+        other rows are skipped before their values are processed.
+
+    Returns:
+    list of tuple: One (variable_name, simulated_value, measured_value, position) tuple per
+        row, where the values are strings ('' when the value starts with '-99') and position
+        is the 1-based line number of the row after the header line.
+    """
+    rows = []
+
+    for i, line in enumerate(lines):
+
+        # Look for the line with simulation results (lines after @)
+        if not line.strip().startswith('@'):
+            continue
+
+        for position, data_line in enumerate(lines[i + 1:], start=1):
+
+            if not data_line.strip() or data_line.startswith('*'):
+                break
+
+            # Skip the rows of the variables that were not requested
+            if variables is not None and ' '.join(data_line.rsplit(None, 2)[0].split()) not in variables:
+                continue
+
+            data_line = data_line.strip().split()
+            simulated_value = data_line[-2]
+            measured_value = data_line[-1]
+
+            rows.append((
+                ' '.join(data_line[:-2]),  # Variable name
+                # Replace any value starting with '-99' with an empty string
+                '' if simulated_value.startswith('-99') else simulated_value,
+                '' if measured_value.startswith('-99') else measured_value,
+                position,
+            ))
+
+    return rows
+
+
+def build_overview_frame(columns):
+    """
+    Builds the OVERVIEW.OUT data frame from column lists collected across all blocks, removes
+    the '--------' separator rows and converts the simulated and measured values to numbers.
+
+    Parameters:
+    columns (dict): Column names mapped to the list of values of each column.
+
+    Returns:
+    pd.DataFrame: The data frame, with the index of each row before the separator rows were removed.
+    """
+    overview_df = pd.DataFrame(columns, dtype=object)
+
+    # Remove rows where any of the columns 'VARIABLE', 'VALUE_SIMULATED',
+    # or 'VALUE_MEASURED' contain '--------'
+    is_separator = pd.Series(False, index=overview_df.index)
+    for column in OVERVIEW_VALUE_COLUMNS:
+        is_separator |= overview_df[column].astype(str).str.contains('--------', regex=False)
+    overview_df = overview_df[~is_separator]
+
+    # Convert the 'VALUE_SIMULATED' and 'VALUE_MEASURED' columns to numeric values
+    # (always float, also when the selected rows only hold integer values)
+    overview_df['VALUE_SIMULATED'] = pd.to_numeric(overview_df['VALUE_SIMULATED'], errors='coerce').astype(float)
+    overview_df['VALUE_MEASURED'] = pd.to_numeric(overview_df['VALUE_MEASURED'], errors='coerce').astype(float)
+
+    return overview_df
+
+
 def extract_overview_data(file_path, treatment_dict=None):
     """
     Extracts simulation data from the OVERVIEW.OUT file for each cultivar, including the experiment information,
     and returns a DataFrame with all the data.
 
     Parameters:
-    file_path (str): The path to the text file containing the growth aspects data.
+    file_path (str or OutFileIndex): The path to the text file containing the growth aspects data, or a
+        prebuilt OutFileIndex of that file.
     treatment_dict (dict, optional): A dictionary mapping treatment names to their
         line ranges. If None, it will be created with simulations_lines(file_path).
 
@@ -363,112 +1232,61 @@ def extract_overview_data(file_path, treatment_dict=None):
     pd.DataFrame: A DataFrame containing the parsed data for all cultivars, including the experiment info.
     """
 
+    # Index the file once; only the byte ranges of the selected blocks are read afterwards
+    out_index = file_path if isinstance(file_path, OutFileIndex) else OutFileIndex(file_path)
+
     # Get the dictionary with the line ranges for each cultivar
     if treatment_dict is None:
-        treatment_dict = simulations_lines(file_path)
-
-    # Initialize an empty DataFrame to store all the data
-    all_data = pd.DataFrame(
-        columns=[
-            'TREATMENT',
-            'cultivar',
-            'VARIABLE',
-            'VALUE_SIMULATED',
-            'VALUE_MEASURED',
-            'EXPERIMENT',
-            'POSITION'
-        ]
-    )
-
-    with open(file_path, 'r') as file:
-        lines = file.readlines()
-
-        # Iterate through each cultivar and extract data
-        for treatment, blocks in treatment_dict.items():
-
-            # Normalize to a list of (start_line, end_line) ranges
-            # (this allows the same treatment name to appear in more than one experiment)
-            if not isinstance(blocks, list):
-                blocks = [blocks]
-
-            # Iterate over each block associated with the treatment
-            for (start_line, end_line) in blocks:
-
-                cultivar_data = []
-                experiment_info = None
-                model_crop = None
-                cultivar = None
-
-                # Iterate through the lines in the specified range to find the EXPERIMENT line
-                for i in range(start_line, end_line):
-                    line = lines[i].strip()
-
-                    # Look for the line containing 'MODEL'
-                    if line.startswith("MODEL"):
-                        # Extract model and crop names
-                        model_crop = line.split(':')[1].strip()
-
-                    # Look for the line containing 'EXPERIMENT'
-                    if line.startswith('EXPERIMENT'):
-                        # Extract the experiment description after the colon
-                        experiment_info = line.split(':')[1].strip()
-
-                    if line.startswith('CROP') and 'CULTIVAR :' in line:
-                        # Extract CULTIVAR information using split
-                        parts = line.split('CULTIVAR :')
-                        if len(parts) > 1:
-                            cultivar = parts[1].split('ECOTYPE')[0].strip()
-                            # Extract everything between 'CULTIVAR :' and 'ECOTYPE'
-
-                    # Look for the line with simulation results (lines after @)
-                    if line.startswith('@'):
-
-                        # Store the header line to return it
-                        header_line = line
-
-                        line_number = 0
-                        for data_line in lines[i + 1:]:
-
-                            line_number += 1
-
-                            if not data_line.strip() or data_line.startswith('*'):
-                                break
-
-                            data_line = data_line.strip().split()
-                            variable_name = ' '.join(data_line[:-2])  # Get the variable name
-                            simulated_value = data_line[-2]
-                            measured_value = data_line[-1]
-
-                            # Replace any value starting with '-99' with an empty string
-                            simulated_value = '' if simulated_value.startswith('-99') else simulated_value
-                            measured_value = '' if measured_value.startswith('-99') else measured_value
-
-                            # Append the row data
-                            cultivar_data.append({
-                                'TREATMENT': treatment,
-                                'cultivar': cultivar,
-                                'VARIABLE': variable_name,
-                                'VALUE_SIMULATED': simulated_value,
-                                'VALUE_MEASURED': measured_value,
-                                'EXPERIMENT': experiment_info,
-                                'POSITION': line_number,
-                            })
-
-                        # Convert to DataFrame and append to all_data
-                        cultivar_df = pd.DataFrame(cultivar_data)
-                        all_data = pd.concat([all_data, cultivar_df], ignore_index=True)
+        treatment_dict = out_index.treatment_dict()
+
+    # Collect the values of each column across all blocks; the frame is built once at the end
+    columns = {
+        'TREATMENT': [],
+        'cultivar': [],
+        'VARIABLE': [],
+        'VALUE_SIMULATED': [],
+        'VALUE_MEASURED': [],
+        'EXPERIMENT': [],
+        'POSITION': [],
+    }
+    header_line = None
+    model_crop = None
+
+    # Iterate through each cultivar and extract data
+    for treatment, blocks in treatment_dict.items():
+
+        # Normalize to a list of (start_line, end_line) ranges
+        # (this allows the same treatment name to appear in more than one experiment)
+        if not isinstance(blocks, list):
+            blocks = [blocks]
+
+        # Iterate over each block associated with the treatment
+        for (start_line, end_line) in blocks:
+
+            # Model, experiment and cultivar were already recorded by the index
+            block = out_index.block_at(start_line)
+            model_crop = block['model_crop']
+
+            # Store the header line to return it
+            if block['header_line'] is not None:
+                header_line = block['header_line'].strip()
+
+            rows = out_index.parsed_block(start_line)
+            if rows is None:
+                rows = parse_overview_block(out_index.read_block_lines(block))
+            if not rows:
+                continue
 
-    # Remove rows where any of the columns 'VARIABLE', 'VALUE_SIMULATED',
-    # or 'VALUE_MEASURED' contain '--------'
-    all_data = all_data[
-        ~all_data[['VARIABLE', 'VALUE_SIMULATED', 'VALUE_MEASURED']]
-        .apply(lambda x: x.astype(str).str.contains('--------'))
-        .any(axis=1)
-    ]
+            variable_names, simulated_values, measured_values, positions = zip(*rows)
+            columns['TREATMENT'].extend([treatment] * len(rows))
+            columns['cultivar'].extend([block['cultivar']] * len(rows))
+            columns['VARIABLE'].extend(variable_names)
+            columns['VALUE_SIMULATED'].extend(simulated_values)
+            columns['VALUE_MEASURED'].extend(measured_values)
+            columns['EXPERIMENT'].extend([block['experiment_name']] * len(rows))
+            columns['POSITION'].extend(positions)
 
-    # Convert the 'VALUE_SIMULATED' and 'VALUE_MEASURED' columns to numeric values
-    all_data['VALUE_SIMULATED'] = pd.to_numeric(all_data['VALUE_SIMULATED'], errors='coerce')
-    all_data['VALUE_MEASURED'] = pd.to_numeric(all_data['VALUE_MEASURED'], errors='coerce')
+    all_data = build_overview_frame(columns)
 
     # Convert all column names to lowercase
     all_data.columns = all_data.columns.str.lower()
@@ -498,29 +1316,152 @@ def adjust_variable_name(name, existing_names):
 
     # Check for duplicates and append suffix if necessary
     original_name = name
-    suffix = 'A'
+    counter = 0
     while name in existing_names:
-        name = f"{original_name[:18]}_{suffix}"
-        suffix = chr(ord(suffix) + 1)  # Increment suffix (A -> B -> C, etc.)
+        counter += 1
+        suffix = observation_name_suffix(counter)  # A -> B -> ... -> Z -> AA, etc.
+        name = f"{original_name[:19 - len(suffix)]}_{suffix}"
 
     return name
 
 
 def process_variable_names(df):
-    # Clean variable names
-    df['variable_name'] = df['variable'].apply(clean_variable_name)
+    # Clean variable names (same rules as clean_variable_name(), applied to the whole column)
+    names = df['variable'].astype(str)
+    names = names.str.replace(r'\s+', '_', regex=True).str.replace(r'[\W]', '', regex=True)
+
+    # Names longer than 20 characters lose their underscores and are trimmed to 20 characters
+    too_long = names.str.len() > 20
+    if too_long.any():
+        names = names.where(~too_long, names.str.replace('_', '', regex=False).str.slice(0, 20))
+
+    # Repeated names get the suffixes _A, _B, ..., _Z, _AA, ... in order of appearance
+    # (see adjust_variable_name())
+    occurrence = names.groupby(names, sort=False).cumcount()
+    repeated = occurrence > 0
+    if repeated.any():
+        letters = occurrence[repeated].map(observation_name_suffix)
+        names = names.copy()
+        names[repeated] = [
+            f"{name[:19 - len(letter)]}_{letter}" for name, letter in zip(names[repeated], letters)
+        ]
+
+        # A suffixed name can still match another name (e.g. two names equal in their first
+        # 18 characters); those rare cases are resolved one name at a time
+        if names.duplicated().any():
+            existing_names = set()
+            adjusted_names = []
+            for name in df['variable'].apply(clean_variable_name):
+                adjusted_name = adjust_variable_name(name, existing_names)
+                adjusted_names.append(adjusted_name)
+                existing_names.add(adjusted_name)
+            names = pd.Series(adjusted_names, index=df.index)
+
+    df['variable_name'] = names
+    return df
 
-    # Adjust names to ensure uniqueness and length constraints
-    existing_names = set()
-    adjusted_names = []
 
-    for name in df['variable_name']:
-        adjusted_name = adjust_variable_name(name, existing_names)
-        adjusted_names.append(adjusted_name)
-        existing_names.add(adjusted_name)
+MAX_OBSERVATION_NAME_LENGTH = 20  # In PEST, the observation names should not exceed 20 characters
 
-    df['variable_name'] = adjusted_names
-    return df
+
+def observation_name_suffix(number):
+    """
+    Returns the short suffix used to make a repeated observation name unique: 1 -> 'A',
+    2 -> 'B', ..., 26 -> 'Z', 27 -> 'AA', 28 -> 'AB', ... (bijective base 26).
+    """
+    letters = []
+    while number > 0:
+        number, remainder = divmod(number - 1, 26)
+        letters.append(chr(ord('A') + remainder))
+    return ''.join(reversed(letters))
+
+
+class ObservationNameAllocator:
+    """
+    Allocates PEST observation names that are unique across every instruction file of a
+    PEST run. One allocator is passed to the ts(), ts_batch() and overview() calls of a
+    calibration (argument ``name_allocator``) and then to pst(), which checks that all
+    the observations were named by it.
+
+    A name that is free is kept as is (trimmed to ``max_length`` characters). A name
+    already taken gets the next suffix of its base name: ``_A``, ``_B``, ..., ``_Z``,
+    ``_AA``, ... The last suffix used is kept per base name in a dictionary, so each
+    name is allocated in constant time on average and the names do not depend on
+    anything but the order of allocation. PEST compares observation names without
+    regard to case, and so does the allocator.
+
+    Args:
+        max_length (int): Maximum length of the names. Defaults to 20 (PEST limit).
+
+    Example:
+        allocator = ObservationNameAllocator()
+        allocator.allocate('LAID_75167')  # 'LAID_75167'
+        allocator.allocate('laid_75167')  # 'laid_75167_A'
+    """
+
+    def __init__(self, max_length=MAX_OBSERVATION_NAME_LENGTH):
+        self.max_length = max_length
+        self.names = set()  # allocated names, lower-cased
+        self._counters = {}  # lower-cased base name -> last suffix number used
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return str(name).lower() in self.names
+
+    def __repr__(self):
+        return f"ObservationNameAllocator({len(self.names)} names)"
+
+    def allocate(self, name):
+        """
+        Returns a unique name for an observation and reserves it.
+
+        Args:
+            name (str): The preferred name.
+
+        Returns:
+            str: ``name`` (trimmed to ``max_length``), or the name with a suffix if it is
+                already taken.
+        """
+        name = str(name)[:self.max_length]
+        key = name.lower()
+        if key not in self.names:
+            self.names.add(key)
+            return name
+
+        # Next suffix of the base name that is not taken
+        counter = self._counters.get(key, 0)
+        while True:
+            counter += 1
+            suffix = observation_name_suffix(counter)
+            candidate = f"{name[:self.max_length - len(suffix) - 1]}_{suffix}"
+            if candidate.lower() not in self.names:
+                break
+
+        self._counters[key] = counter
+        self.names.add(candidate.lower())
+        return candidate
+
+    def allocate_many(self, names):
+        """Allocates the names of several observations, in order. Returns a list of names."""
+        allocate = self.allocate
+        return [allocate(name) for name in names]
+
+    def check(self, names):
+        """
+        Checks that observation names were allocated by this allocator.
+
+        Raises:
+            ValueError: If some names were not allocated by this allocator.
+        """
+        unknown = sorted({name for name in names if str(name).lower() not in self.names})
+        if unknown:
+            raise ValueError(
+                f"The following observation names were not allocated by the name allocator: {unknown[:10]}"
+                f"{' ...' if len(unknown) > 10 else ''}\n"
+                "Pass the same 'name_allocator' to every ts(), ts_batch() and overview() call."
+            )
 
 
 ### / Variables transformation functions
@@ -532,7 +1473,8 @@ def extract_treatment_info_plantgrowth(file_path, treatment_dict):
     and crop names from a PlantGro.OUT file.
 
     Args:
-        file_path (str): Path to the input file.
+        file_path (str or OutFileIndex): Path to the input file, or a prebuilt
+            OutFileIndex of that file (in which case the file is not read again).
         treatment_dict (dict): A dictionary with treatment names as keys and
             their line ranges as values.
 
@@ -549,6 +1491,19 @@ def extract_treatment_info_plantgrowth(file_path, treatment_dict):
     treatment_experiment_name = {}
     treatment_crop_name = {}
 
+    # Use the information recorded by the index when available
+    if isinstance(file_path, OutFileIndex):
+        for treatment, (start_line, end_line) in treatment_dict.items():
+            block = file_path.block_at(start_line)
+            if block is None or not block['treatment']:
+                continue
+
+            treatment_number_name[block['treatment']] = block['trno']
+            treatment_experiment_name[block['treatment']] = block['experiment']
+            treatment_crop_name[block['treatment']] = block['crop']
+
+        return treatment_number_name, treatment_experiment_name, treatment_crop_name
+
     # Read the file lines
     with open(file_path, 'r') as file:
         lines = file.readlines()
@@ -758,7 +1713,7 @@ def extract_treatment_info_plantgrowth(file_path, treatment_dict):
 #     return merged_df
 
 
-def wht_filedata_to_dataframe(file_path):
+def wht_filedata_to_dataframe(file_path, cache_dir=None):
     """
     Parses a DSSAT-style TXT/T file and returns a DataFrame containing all
     data present in the file, regardless of whether the data are stored in
@@ -768,6 +1723,9 @@ def wht_filedata_to_dataframe(file_path):
     ----------
     file_path : str
         Path to the DSSAT T/WHT/SBT file.
+    cache_dir : str, optional
+        Directory of the index cache. If not provided, the DPEST_CACHE_DIR
+        environment variable is used; without either, no cache is used.
 
     Returns
     -------
@@ -783,8 +1741,19 @@ def wht_filedata_to_dataframe(file_path):
       collapses rows with the same TRNO-DATE combination by taking the first
       non-missing value for each variable.
     - Missing values are filled with '-99' at the end.
+    - When the index cache is enabled, the parsed table is reused as long as
+      the file does not change.
     """
 
+    cache_dir = get_index_cache_dir(cache_dir)
+    signature = None
+    if cache_dir is not None:
+        payload = load_index_cache(file_path, 'tfile', cache_dir)
+        if payload is not None:
+            cached_df = pd.DataFrame(payload['data'], columns=payload['columns'])
+            return cached_df.astype(dict(zip(payload['columns'], payload['dtypes'])))
+        signature = file_signature(file_path)
+
     with open(file_path, "r") as file:
         lines = file.readlines()
 
@@ -866,18 +1835,555 @@ def wht_filedata_to_dataframe(file_path):
     # Optional sorting
     combined_df = combined_df.sort_values(["TRNO", "DATE"]).reset_index(drop=True)
 
+    if signature is not None:
+        payload = {
+            'columns': list(combined_df.columns),
+            'dtypes': [str(dtype) for dtype in combined_df.dtypes],
+            'data': combined_df.values.tolist(),
+        }
+        save_index_cache(file_path, 'tfile', payload, signature, cache_dir)
+
     return combined_df
 
 
-def get_header_and_first_sim(file_path, treatment, treatment_dict=None):
+def date_codes_to_datetime64(date_codes, anchor=None):
     """
-    Reads the header line and the first simulation date for a *specific treatment block*
-    inside a DSSAT time-series .OUT file (e.g., PlantGro.OUT).
+    Converts DSSAT date codes (YYDOY or YYYYDOY) to datetime64[D] values in one
+    vectorized operation.
+
+    Two-digit years are resolved with the nearest-century rule when ``anchor`` is
+    given: of the candidate years in the century of the anchor and in the centuries
+    before and after it, the one whose date is closest to the anchor is used (the
+    earlier candidate wins ties). Without an anchor, two-digit years follow the
+    strptime('%y') rule: 69-99 are 1969-1999 and 00-68 are 2000-2068.
+
+    Parameters:
+    date_codes (array-like of str): The date codes.
+    anchor (datetime or numpy.datetime64, optional): The reference date of the
+        nearest-century rule, usually the first simulated date.
 
     Returns:
-      header_line (str): the '@YEAR ...' header line (global header is fine)
-      first_sim_line (str): first numeric data line inside the treatment block
-      date_first_sim (datetime): datetime from YEAR + DOY of that first data line
+    numpy.ndarray: datetime64[D] array, with NaT for codes that are not dates
+        (wrong length, not numeric, or day of year outside 1-366).
+    """
+    code_strings = np.char.strip(np.asarray(date_codes, dtype=str).reshape(-1))
+    lengths = np.char.str_len(code_strings)
+    codes = pd.to_numeric(pd.Series(code_strings, dtype=object), errors='coerce').to_numpy(dtype=float)
+
+    years = np.floor(codes / 1000)
+    days = codes - years * 1000
+    two_digit = lengths == 5
+
+    valid = np.isin(lengths, (5, 7)) & ~np.isnan(codes) & (days >= 1) & (days <= 366)
+    years = np.where(valid, years, 1970).astype(np.int64)
+    day_offsets = np.where(valid, days - 1, 0).astype(np.int64)
+
+    def to_dates(year_values):
+        return (year_values - 1970).astype('datetime64[Y]').astype('datetime64[D]') + day_offsets
+
+    if anchor is None:
+        years = np.where(two_digit, np.where(years >= 69, 1900 + years, 2000 + years), years)
+        dates = to_dates(years)
+    else:
+        anchor = np.datetime64(anchor, 'D')
+        base_century = (anchor.astype('datetime64[Y]').astype(np.int64) + 1970) // 100 * 100
+
+        # Dates of the three candidate centuries, one row per candidate
+        candidates = np.stack([to_dates(base_century + offset + years) for offset in (-100, 0, 100)])
+        nearest = np.abs((candidates - anchor).astype(np.int64)).argmin(axis=0)
+        nearest_dates = candidates[nearest, np.arange(len(years))]
+
+        dates = np.where(two_digit, nearest_dates, to_dates(years))
+
+    return np.where(valid, dates, np.datetime64('NaT'))
+
+
+def check_date_codes(date_codes, dates):
+    """
+    Raises a ValueError for the first date code that could not be converted by
+    date_codes_to_datetime64().
+
+    Parameters:
+    date_codes (list of str): The date codes.
+    dates (numpy.ndarray): Their datetime64[D] values.
+    """
+    invalid = np.flatnonzero(np.isnat(dates))
+    if invalid.size == 0:
+        return
+
+    date_str = str(date_codes[invalid[0]]).strip()
+    if len(date_str) in (5, 7) and date_str.isdigit():
+        raise ValueError(f"Invalid day-of-year in date: {date_str}")
+    raise ValueError(f"Invalid date format: {date_str}")
+
+
+def days_between(dates, start_date):
+    """
+    Returns the number of days from ``start_date`` to each value of ``dates``.
+
+    Parameters:
+    dates (numpy.ndarray): datetime64[D] values.
+    start_date (datetime or numpy.datetime64): The reference date.
+
+    Returns:
+    numpy.ndarray: int64 day offsets (negative before ``start_date``).
+    """
+    return (dates - np.datetime64(start_date, 'D')).astype(np.int64)
+
+
+class ObservationTable:
+    """
+    Typed table of the measured observations of a DSSAT T file.
+
+    Rows are the TRNO-DATE combinations of the file, in the order of
+    wht_filedata_to_dataframe(). Values are kept as float64, so that the
+    measured values written to the PEST files are exactly the values of the file.
+
+    Args:
+        t_df (pd.DataFrame): The table returned by wht_filedata_to_dataframe().
+
+    Attributes:
+        trno (numpy.ndarray): Treatment numbers (int64).
+        date (numpy.ndarray): Date codes as written in the file (e.g. '75167').
+        dates (numpy.ndarray): Dates as datetime64[D].
+        variables (list of str): Names of the variable columns.
+        values (dict): Variable names mapped to float64 arrays (NaN where missing).
+        missing (dict): Variable names mapped to boolean arrays marking missing values
+            (-99, empty or not numeric).
+        literal_zero (dict): Variable names mapped to boolean arrays marking the values
+            written as '0', which are not used as observations.
+    """
+
+    def __init__(self, t_df):
+        critical_columns = {'TRNO', 'DATE'}
+        missing_critical = critical_columns - set(t_df.columns)
+        if missing_critical:
+            raise ValueError(f"Missing critical columns: {missing_critical}")
+
+        self.trno = pd.to_numeric(t_df['TRNO'].astype(str).str.strip()).to_numpy(dtype=np.int64)
+        self.date = t_df['DATE'].astype(str).str.strip().to_numpy(dtype=object)
+        self.dates = date_codes_to_datetime64(self.date)
+        self.variables = [column for column in t_df.columns if column not in critical_columns]
+
+        self.values = {}
+        self.missing = {}
+        self.literal_zero = {}
+        for variable in self.variables:
+            text = t_df[variable].astype(str).str.strip()
+            values = pd.to_numeric(text, errors='coerce').to_numpy(dtype=np.float64)
+            values[values == -99] = np.nan
+            self.values[variable] = values
+            self.missing[variable] = np.isnan(values)
+            self.literal_zero[variable] = (text == '0').to_numpy()
+
+        self._long_format = None
+
+    def __len__(self):
+        return len(self.trno)
+
+    def long_format(self):
+        """
+        Returns the observations of all treatments in long format, skipping missing values
+        and values written as '0'. The table is built once, with array masks, and reused.
+
+        Returns:
+        pd.DataFrame: Columns 'trno', 'date' (DATE code), 'variable' and 'value', one row per
+            observation, ordered by row of the T table and then by variable column.
+        """
+        if self._long_format is None:
+            if self.variables:
+                values = np.column_stack([self.values[variable] for variable in self.variables])
+                keep = np.column_stack([
+                    ~self.missing[variable] & ~self.literal_zero[variable] for variable in self.variables
+                ])
+            else:
+                values = np.empty((len(self), 0))
+                keep = np.empty((len(self), 0), dtype=bool)
+
+            rows, columns = np.nonzero(keep)
+            self._long_format = pd.DataFrame({
+                'trno': self.trno[rows],
+                'date': self.date[rows],
+                'variable': np.array(self.variables, dtype=object)[columns],
+                'value': values[rows, columns],
+            })
+
+        return self._long_format
+
+    def observations(self, trno, variables):
+        """
+        Returns the observed values of one treatment, sliced from long_format().
+
+        Parameters:
+        trno (int): The treatment number.
+        variables (list): The variable names.
+
+        Returns:
+        dict: DATE codes (sorted) mapped to dictionaries of variable values, in the order
+            of ``variables``.
+        """
+        long_df = self.long_format()
+        selected = long_df[(long_df['trno'] == int(trno)) & long_df['variable'].isin(variables)]
+
+        # Order by date, then by the requested order of the variables
+        variable_rank = {variable: rank for rank, variable in enumerate(variables)}
+        order = np.lexsort((selected['variable'].map(variable_rank).to_numpy(), selected['date'].to_numpy()))
+        selected = selected.iloc[order]
+
+        variable_value = {}
+        for date, variable, value in zip(selected['date'], selected['variable'], selected['value']):
+            variable_value.setdefault(date, {})[variable] = float(value)
+
+        return variable_value
+
+
+# Observation tables of the T files read by read_observation_table(), in least recently used order
+OBSERVATION_TABLES = OrderedDict()
+OBSERVATION_TABLE_MAX_ENTRIES = 32
+
+
+def read_observation_table(t_file_path):
+    """
+    Returns the typed ObservationTable of a T file. The table is parsed once and kept
+    in memory while the size and modification time of the file do not change; the least
+    recently used tables are evicted.
+
+    Parameters:
+    t_file_path (str): Path to the DSSAT T file.
+
+    Returns:
+    ObservationTable: The observations of the file.
+    """
+    stat = os.stat(t_file_path)
+    file_stat = (stat.st_size, stat.st_mtime_ns)
+
+    memo = OBSERVATION_TABLES.get(os.path.abspath(t_file_path))
+    if memo is not None and memo[0] == file_stat:
+        OBSERVATION_TABLES.move_to_end(os.path.abspath(t_file_path))
+        return memo[1]
+
+    return remember_observation_table(t_file_path, wht_filedata_to_dataframe(t_file_path), file_stat)
+
+
+def remember_observation_table(t_file_path, t_df, file_stat=None):
+    """
+    Keeps the ObservationTable of an already parsed T file in the tables of
+    read_observation_table(), so that ts() and uts() do not parse the file again
+    while it does not change (e.g. for the T files parsed by load_run_directory()).
+
+    Parameters:
+    t_file_path (str): Path to the DSSAT T file.
+    t_df (pd.DataFrame or ObservationTable): The table returned by wht_filedata_to_dataframe()
+        for this file, or its ObservationTable.
+    file_stat (tuple, optional): (size, mtime_ns) of the file when it was parsed. If not
+        provided, the current size and modification time of the file are used.
+
+    Returns:
+    ObservationTable: The observations of the file.
+    """
+    if file_stat is None:
+        stat = os.stat(t_file_path)
+        file_stat = (stat.st_size, stat.st_mtime_ns)
+
+    key = os.path.abspath(t_file_path)
+    table = t_df if isinstance(t_df, ObservationTable) else ObservationTable(t_df)
+    OBSERVATION_TABLES[key] = (tuple(file_stat), table)
+    OBSERVATION_TABLES.move_to_end(key)
+    while len(OBSERVATION_TABLES) > OBSERVATION_TABLE_MAX_ENTRIES:
+        OBSERVATION_TABLES.popitem(last=False)
+
+    return table
+
+
+class ObservationStore:
+    """
+    Array-backed store of measured observations, keyed by (experiment, trno,
+    variable, date).
+
+    ts(), ts_batch() and overview() can add their observations to a store (argument
+    ``observation_store``), and pst() accepts a store in ``dataframe_observations``.
+    Observations are kept in NumPy arrays: experiments, variables and groups as
+    integer codes, dates as datetime64[D] and the date codes and PEST observation
+    names as byte strings (UTF-8), so that 100k observations take a few MB.
+
+    Two-digit years (YYDOY) are resolved to the century nearest to the first simulated
+    date of the experiment, as in ts(), when add() is given that date (``date_anchor``).
+    Date codes given to get() and rows() for an experiment are resolved the same way.
+
+    Rows are sorted by key when the store is first queried after an addition. A hash
+    index maps each (experiment, trno, variable) series to its slice of the sorted
+    rows, so point lookups and date ranges are a dictionary access plus a binary
+    search over the dates of one series. OVERVIEW observations have no date (NaT).
+    """
+
+    def __init__(self):
+        self._categories = {'experiment': {}, 'variable': {}, 'group': {}}
+        self._chunks = []
+        self._columns = None
+        self._order = None
+        self._series = None
+        self._anchors = {}
+        self._days_of_codes = {}
+
+    def __len__(self):
+        return sum(len(chunk['values']) for chunk in self._chunks) + (
+            0 if self._columns is None else len(self._columns['values'])
+        )
+
+    def __repr__(self):
+        return f"ObservationStore({len(self)} observations)"
+
+    def _encode(self, kind, labels):
+        """Returns the integer codes of ``labels`` in the categories of ``kind``."""
+        mapping = self._categories[kind]
+        codes, uniques = pd.factorize(np.asarray(labels, dtype=object))
+        unique_codes = np.array([mapping.setdefault(label, len(mapping)) for label in uniques], dtype=np.int32)
+        return unique_codes[codes] if len(codes) else np.empty(0, dtype=np.int32)
+
+    def _labels(self, kind):
+        """Returns the categories of ``kind`` as an object array indexed by code."""
+        return np.array(list(self._categories[kind]), dtype=object)
+
+    def add(self, experiment, trno, variables, dates, values, variable_names, groups, date_anchor=None):
+        """
+        Adds the observations of one treatment.
+
+        Args:
+            experiment (str): Experiment code (e.g. 'SWSW7501').
+            trno (int or str): Treatment number.
+            variables (sequence of str): Variable of each observation.
+            dates (sequence of str or None): DATE code of each observation (YYDOY or
+                YYYYDOY), or None for observations without a date (OVERVIEW).
+            values (sequence of float): Measured values.
+            variable_names (sequence of str): PEST observation names.
+            groups (sequence of str): Observation groups.
+            date_anchor (datetime, optional): First simulated date of the treatment. Two-digit
+                years are resolved to the century nearest to it (see date_codes_to_datetime64()).
+                Without it, the strptime rule for '%y' is used.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        size = len(values)
+
+        if dates is None:
+            date_codes = np.full(size, b'', dtype='S7')
+            date_values = np.full(size, np.datetime64('NaT'), dtype='datetime64[D]')
+        else:
+            date_codes = np.char.strip(np.asarray(dates, dtype=str)).astype('S7')
+            date_values = date_codes_to_datetime64(date_codes.astype(str), anchor=date_anchor)
+            if date_anchor is not None:
+                self._anchors.setdefault(experiment, date_anchor)
+
+        chunk = {
+            'experiment': self._encode('experiment', np.full(size, experiment, dtype=object)),
+            'trno': np.full(size, int(trno), dtype=np.int32),
+            'variable': self._encode('variable', variables),
+            'date_code': date_codes,
+            'date': date_values,
+            'values': values,
+            'variable_name': np.char.encode(np.asarray(variable_names, dtype=str), 'utf-8'),
+            'group': self._encode('group', groups),
+        }
+        if any(len(column) != size for column in chunk.values()):
+            raise ValueError("All the observation columns must have the same length.")
+
+        self._chunks.append(chunk)
+        self._order = None
+        self._series = None
+
+    def _consolidate(self):
+        """Merges the added chunks into the column arrays and rebuilds the index."""
+        if self._chunks:
+            parts = ([self._columns] if self._columns is not None else []) + self._chunks
+            self._columns = {name: np.concatenate([part[name] for part in parts]) for name in parts[0]}
+            self._chunks = []
+
+        if self._columns is None:
+            self._columns = {
+                'experiment': np.empty(0, dtype=np.int32),
+                'trno': np.empty(0, dtype=np.int32),
+                'variable': np.empty(0, dtype=np.int32),
+                'date_code': np.empty(0, dtype='S7'),
+                'date': np.empty(0, dtype='datetime64[D]'),
+                'values': np.empty(0, dtype=np.float64),
+                'variable_name': np.empty(0, dtype='S1'),
+                'group': np.empty(0, dtype=np.int32),
+            }
+
+        if self._order is None:
+            columns = self._columns
+
+            # Dates sort with NaT last, as expected by searchsorted
+            order = np.lexsort((columns['date'], columns['variable'], columns['trno'], columns['experiment']))
+
+            # Series boundaries in the sorted rows
+            series_keys = np.column_stack((
+                columns['experiment'][order],
+                columns['trno'][order],
+                columns['variable'][order],
+            ))
+            new_series = np.ones(len(order), dtype=bool)
+            new_series[1:] = (series_keys[1:] != series_keys[:-1]).any(axis=1)
+            starts = np.flatnonzero(new_series)
+            ends = np.append(starts[1:], len(order))
+
+            # Each key must identify a single observation
+            sorted_days = columns['date'][order].astype(np.int64)
+            repeated = ~new_series[1:] & (sorted_days[1:] == sorted_days[:-1])
+            if repeated.any():
+                row = order[np.flatnonzero(repeated)[0] + 1]
+                raise ValueError(f"Duplicate observation in the store: {self._key_of(row)}")
+
+            self._order = order
+            self._series = {
+                tuple(int(code) for code in series_keys[start]): (int(start), int(end))
+                for start, end in zip(starts, ends)
+            }
+
+        return self._columns
+
+    def _key_of(self, row):
+        columns = self._columns
+        return (
+            self._labels('experiment')[columns['experiment'][row]],
+            int(columns['trno'][row]),
+            self._labels('variable')[columns['variable'][row]],
+            columns['date_code'][row].decode() or None,
+        )
+
+    def _to_day(self, date, experiment=None):
+        """
+        Converts a DATE code, datetime or datetime64 to datetime64[D]. Two-digit years are
+        resolved with the date anchor of ``experiment``, if add() was given one.
+        """
+        if not isinstance(date, str):
+            return np.datetime64(date, 'D')
+
+        anchor = self._anchors.get(experiment)
+        day = self._days_of_codes.get((date, anchor))
+        if day is None:
+            day = self._days_of_codes[date, anchor] = date_codes_to_datetime64([date], anchor=anchor)[0]
+        return day
+
+    def _series_rows(self, experiment, trno, variable):
+        """Returns the sorted row positions of one series (empty if it does not exist)."""
+        self._consolidate()
+        key = (
+            self._categories['experiment'].get(experiment),
+            int(trno),
+            self._categories['variable'].get(variable),
+        )
+        start, end = self._series.get(key, (0, 0))
+        return self._order[start:end]
+
+    def rows(self, experiment=None, trno=None, variable=None, start=None, end=None):
+        """
+        Returns the positions of the observations that match the given key parts,
+        with dates between ``start`` and ``end`` (both included) when given.
+
+        Args:
+            experiment (str, optional): Experiment code.
+            trno (int, optional): Treatment number.
+            variable (str, optional): Variable name.
+            start, end (str, datetime or numpy.datetime64, optional): Date range. Date
+                codes are converted with date_codes_to_datetime64(), with the date anchor
+                of ``experiment`` (see add()).
+
+        Returns:
+            numpy.ndarray: Row positions, ordered by experiment, treatment, variable and date.
+        """
+        columns = self._consolidate()
+
+        if experiment is not None and trno is not None and variable is not None:
+            # One series: hash lookup, then binary search over its dates
+            rows = self._series_rows(experiment, trno, variable)
+            dates = columns['date'][rows]
+            low = 0 if start is None else np.searchsorted(dates, self._to_day(start, experiment), side='left')
+            high = len(rows) if end is None else np.searchsorted(dates, self._to_day(end, experiment), side='right')
+            return rows[low:high]
+
+        mask = np.ones(len(columns['values']), dtype=bool)
+        if experiment is not None:
+            mask &= columns['experiment'] == self._categories['experiment'].get(experiment, -1)
+        if trno is not None:
+            mask &= columns['trno'] == int(trno)
+        if variable is not None:
+            mask &= columns['variable'] == self._categories['variable'].get(variable, -1)
+        if start is not None:
+            mask &= columns['date'] >= self._to_day(start, experiment)
+        if end is not None:
+            mask &= columns['date'] <= self._to_day(end, experiment)
+
+        return self._order[mask[self._order]]
+
+    def get(self, experiment, trno, variable, date=None, default=None):
+        """
+        Returns the measured value of one observation, or ``default`` if it is not stored.
+
+        ``date`` is the DATE code of the observation (None for OVERVIEW observations).
+        """
+        columns = self._consolidate()
+        rows = self._series_rows(experiment, trno, variable)
+        day = np.datetime64('NaT', 'D') if date is None else self._to_day(date, experiment)
+        if date is not None and np.isnat(day):
+            return default
+
+        dates = columns['date'][rows]
+        position = np.searchsorted(dates, day)
+        if position < len(rows) and dates[position].astype(np.int64) == day.astype(np.int64):
+            return float(columns['values'][rows[position]])
+        return default
+
+    def __contains__(self, key):
+        return self.get(*key) is not None
+
+    def to_frame(self, rows=None):
+        """
+        Returns the observations as a DataFrame with the columns 'experiment', 'trno',
+        'variable', 'date', 'date_code', 'variable_name', 'value_measured' and 'group'.
+
+        Without ``rows``, the numeric columns are views of the store arrays and the
+        label columns are categoricals over the store codes. ``rows`` selects positions
+        (e.g. from rows()).
+        """
+        columns = self._consolidate()
+        if rows is not None:
+            columns = {name: column[rows] for name, column in columns.items()}
+
+        return pd.DataFrame({
+            'experiment': pd.Categorical.from_codes(columns['experiment'], self._labels('experiment')),
+            'trno': columns['trno'],
+            'variable': pd.Categorical.from_codes(columns['variable'], self._labels('variable')),
+            'date': columns['date'],
+            'date_code': columns['date_code'].astype(str),
+            'variable_name': np.char.decode(columns['variable_name'], 'utf-8').astype(object),
+            'value_measured': columns['values'],
+            'group': pd.Categorical.from_codes(columns['group'], self._labels('group')),
+        }, copy=False)
+
+    def observation_frame(self, rows=None):
+        """
+        Returns the 'variable_name', 'value_measured' and 'group' columns, in the format
+        of the DataFrames returned by ts() and overview() and accepted by pst().
+        """
+        frame = self.to_frame(rows)[['variable_name', 'value_measured', 'group']]
+        return frame.astype({'group': object})
+
+    @property
+    def nbytes(self):
+        """Size in bytes of the store arrays."""
+        columns = self._consolidate()
+        return sum(column.nbytes for column in columns.values()) + self._order.nbytes
+
+
+def get_header_and_first_sim(file_path, treatment, treatment_dict=None):
+    """
+    Reads the header line and the first simulation date for a *specific treatment block*
+    inside a DSSAT time-series .OUT file (e.g., PlantGro.OUT).
+
+    Returns:
+      header_line (str): the '@YEAR ...' header line (global header is fine)
+      first_sim_line (str): first numeric data line inside the treatment block
+      date_first_sim (datetime): datetime from YEAR + DOY of that first data line
     """
     with open(file_path, "r") as f:
         lines = f.readlines()
@@ -938,43 +2444,34 @@ def get_header_first_and_last_sim(file_path, treatment, treatment_dict=None):
         Datetime corresponding to the first simulated row.
     date_last_sim : datetime
         Datetime corresponding to the last simulated row.
+
+    ``file_path`` can also be an OutFileIndex, in which case the header and the
+    first and last rows recorded in the index are used without reading the file.
     """
 
-    # Read all lines from file
-    with open(file_path, "r") as f:
-        lines = f.readlines()
+    # Index the file in a single scan unless an index was provided
+    out_index = file_path if isinstance(file_path, OutFileIndex) else OutFileIndex(file_path)
 
-    # If treatment ranges were not provided, build them
+    # If treatment ranges were not provided, take them from the index
     if treatment_dict is None:
-        treatment_dict = simulations_lines(file_path)
+        treatment_dict = out_index.treatment_dict()
 
     # Ensure the treatment exists in the file
     if treatment not in treatment_dict:
-        raise ValueError(f"No data found for treatment '{treatment}' in: {file_path}")
+        raise ValueError(f"No data found for treatment '{treatment}' in: {out_index.file_path}")
 
-    # Get the line range corresponding to this treatment block
+    # Get the block corresponding to this treatment
     start_i, end_i = treatment_dict[treatment]
-
-    # Find the header line (contains '@YEAR DOY DAS ...')
-    header_idx = next(i for i, line in enumerate(lines) if "@YEAR" in line)
-    header_line = lines[header_idx]
-
-    # Regex to identify simulation data rows (start with YEAR DOY)
-    data_line_re = re.compile(r"^\s*\d{4}\s+\d{1,3}\b")
-
-    # Collect all simulation lines within the treatment block
-    sim_lines = []
-    for i in range(start_i, min(end_i, len(lines))):
-        if data_line_re.match(lines[i]):
-            sim_lines.append(lines[i])
+    block = out_index.block_at(start_i)
 
     # Safety check: ensure we found simulation data
-    if not sim_lines:
+    if block is None or block['first_data_line'] is None:
         raise ValueError(f"Could not find simulation data lines for '{treatment}'")
 
-    # First and last simulated rows
-    first_sim_line = sim_lines[0]
-    last_sim_line = sim_lines[-1]
+    # Header line ('@YEAR DOY DAS ...') and first and last simulated rows
+    header_line = block['header_line']
+    first_sim_line = block['first_data_line']
+    last_sim_line = block['last_data_line']
 
     # --- Parse first simulated date ---
     first_parts = first_sim_line.split()
@@ -994,10 +2491,13 @@ def get_header_first_and_last_sim(file_path, treatment, treatment_dict=None):
 
     return header_line, first_sim_line, date_first_sim, date_last_sim
 
+
 def filter_dates_to_simulation_window(dates_variable_values_dict, date_first_sim, date_last_sim):
     """
     Split measured observations into those inside and beyond the simulation window.
 
+    Two-digit years (YYDOY) are resolved to the century nearest to date_first_sim.
+
     Returns
     -------
     kept_dict : dict
@@ -1005,56 +2505,22 @@ def filter_dates_to_simulation_window(dates_variable_values_dict, date_first_sim
     dropped_dict : dict
         Observations whose date is after date_last_sim.
     """
-    # Dictionaries to store valid and out-of-range observations
-    kept_dict = {}
-    dropped_dict = {}
-
-    # Loop through each measured date and its variables
-    for date_str, variables in dates_variable_values_dict.items():
-
-        # Case 1: YYYYDOY format (e.g. 2022249)
-        if len(date_str) == 7:
-            year_var = int(date_str[:4])
-            day_var = int(date_str[4:])
-
-            # Convert YEAR + DOY to datetime
-            date_var = datetime(year_var, 1, 1) + timedelta(days=day_var - 1)
+    date_codes = list(dates_variable_values_dict)
 
-        # Case 2: YYDOY format (e.g. 22249)
-        elif len(date_str) == 5:
-            yy = int(date_str[:2])
-            day_var = int(date_str[2:])
+    # Convert all measured dates at once, anchored on the first simulated date
+    dates = date_codes_to_datetime64(date_codes, anchor=date_first_sim)
+    check_date_codes(date_codes, dates)
 
-            # Use simulation start year to infer correct century
-            base_century = (date_first_sim.year // 100) * 100
+    # Keep observations within the simulation window, drop the ones beyond it
+    kept = dates <= np.datetime64(date_last_sim, 'D')
 
-            # Build candidate years around simulation period
-            candidate_years = [
-                base_century - 100 + yy,
-                base_century + yy,
-                base_century + 100 + yy,
-            ]
-
-            # Convert candidates to datetime objects
-            candidate_dates = [
-                datetime(year, 1, 1) + timedelta(days=day_var - 1)
-                for year in candidate_years
-            ]
-
-            # Select the date closest to the first simulation date
-            date_var = min(candidate_dates, key=lambda d: abs((d - date_first_sim).days))
-
-        # Invalid date format
-        else:
-            raise ValueError(f"Invalid date format: {date_str}")
-
-        # Compare measured date with last simulated date
-        if date_var <= date_last_sim:
-            # Keep observations within simulation window
-            kept_dict[date_str] = variables
+    kept_dict = {}
+    dropped_dict = {}
+    for date_str, is_kept in zip(date_codes, kept.tolist()):
+        if is_kept:
+            kept_dict[date_str] = dates_variable_values_dict[date_str]
         else:
-            # Store observations beyond simulation window
-            dropped_dict[date_str] = variables
+            dropped_dict[date_str] = dates_variable_values_dict[date_str]
 
     return kept_dict, dropped_dict
 
@@ -1065,61 +2531,24 @@ def calculate_days_dict(dates_dict, date_first_sim):
 
     Parameters:
     dates_dict (dict): Dictionary mapping YYDOY/YYYYDOY values to variable names.
-    date_first_sim (datetime): The first simulation date.
+    date_first_sim (datetime): The first simulation date. Two-digit years are
+        resolved to the century nearest to it.
 
     Returns:
     dict: A dictionary mapping each date string to:
           [days_from_start, list_of_variables]
     """
+    date_codes = list(dates_dict)
 
-    days_dict = {}
-
-    for date_str, variables in dates_dict.items():
-
-        # YYYYDOY
-        if len(date_str) == 7:
-            year_var = int(date_str[:4])
-            day_var = int(date_str[4:])
-
-            if not (1 <= day_var <= 366):
-                raise ValueError(f"Invalid day-of-year in date: {date_str}")
-
-            date_var = datetime(year_var, 1, 1) + timedelta(days=day_var - 1)
-
-        # YYDOY
-        elif len(date_str) == 5:
-            yy = int(date_str[:2])
-            day_var = int(date_str[2:])
-
-            if not (1 <= day_var <= 366):
-                raise ValueError(f"Invalid day-of-year in date: {date_str}")
-
-            # Use the simulation year century as anchor and test nearby centuries
-            base_century = (date_first_sim.year // 100) * 100
-            candidate_years = [
-                base_century - 100 + yy,
-                base_century + yy,
-                base_century + 100 + yy,
-            ]
-
-            candidate_dates = [
-                datetime(year, 1, 1) + timedelta(days=day_var - 1)
-                for year in candidate_years
-            ]
-
-            # Choose the candidate closest to the first simulation date
-            date_var = min(
-                candidate_dates,
-                key=lambda d: abs((d - date_first_sim).days)
-            )
-
-        else:
-            raise ValueError(f"Invalid date format: {date_str}")
-
-        days_from_start = (date_var - date_first_sim).days
-        days_dict[date_str] = [days_from_start, list(variables.keys())]
+    # Convert all dates at once and take their offsets from the first simulated date
+    dates = date_codes_to_datetime64(date_codes, anchor=date_first_sim)
+    check_date_codes(date_codes, dates)
+    days_from_start = days_between(dates, date_first_sim).tolist()
 
-    return days_dict
+    return {
+        date_str: [days, list(dates_dict[date_str].keys())]
+        for date_str, days in zip(date_codes, days_from_start)
+    }
 
 
 def adjust_days_dict(days_dict):
@@ -1149,6 +2578,134 @@ def adjust_days_dict(days_dict):
     return adjusted_days_dict
 
 
+class HeaderLayout:
+    """
+    Column layout of a DSSAT fixed-width table, computed once from its '@' header line.
+    Layouts are cached by header line (see header_layout()), so the instruction files of
+    every date and treatment of a file share the same layout.
+
+    Args:
+        header_line (str): The header line of the table (e.g. '@YEAR DOY   DAS ...').
+
+    Attributes:
+        header_line (str): The header line, without the line ending.
+        columns (list of str): Column names.
+        spans (list of tuple): (start, end) character span of each column (end excluded).
+            Values are right-aligned under their header, so each column spans from the end
+            of the previous header to the end of its own.
+        widths (list of int): Width of each column.
+        index (dict): Column names mapped to their token position, starting at 1 (YEAR is
+            column 1). For repeated names, the last position is kept.
+
+    The layout depends only on the header line: the decimals of the values come from the
+    data lines of each file (see field_decimals()).
+    """
+
+    def __init__(self, header_line):
+        self.header_line = header_line.rstrip('\r\n')
+        self.columns = self.header_line.replace('@', ' ').split()
+        self.spans = [(start, end + 1) for start, end in find_parameter_position(self.header_line)]
+        self.widths = [end - start for start, end in self.spans]
+        self.index = {column: position for position, column in enumerate(self.columns, start=1)}
+
+    def __repr__(self):
+        return f"HeaderLayout({len(self.columns)} columns)"
+
+    def check_data_line(self, data_line):
+        """
+        Checks that a data line has one token per column of the header.
+
+        Raises:
+            ValueError: If the header and data token counts differ.
+        """
+        data_tokens = data_line.split()
+        if len(self.columns) != len(data_tokens):
+            raise ValueError(
+                f"Header and data token counts differ: "
+                f"{len(self.columns)} vs {len(data_tokens)}"
+            )
+
+    @staticmethod
+    def field_decimals(data_line):
+        """Returns the number of decimals of each field of a data line (0 for integers)."""
+        return [len(token.split('.')[-1]) if '.' in token else 0 for token in data_line.split()]
+
+    def positions(self, variables):
+        """
+        Returns the token positions (starting at 1) of the variables found in the header,
+        in the order of the header. Variables not in the header are left out.
+        """
+        index = self.index
+        found = [variable for variable in set(variables) if variable in index]
+        found.sort(key=index.get)
+        return {variable: index[variable] for variable in found}
+
+    def format_row(self, values, decimals, integer_columns=('@YEAR', 'YEAR', 'DOY', 'DAS', 'DAP')):
+        """
+        Formats a data row of the table, each value right-aligned in the span of its column.
+
+        Args:
+            values (dict): Column names mapped to their values. Missing columns are written as 0.
+            decimals (list of int): Number of decimals of each column, e.g. the
+                field_decimals() of a data line of the same table.
+            integer_columns (tuple): Columns always written as integers.
+
+        Returns:
+            str: The formatted row, without line ending.
+        """
+        fields = []
+        for column, width, column_decimals in zip(self.columns, self.widths, decimals):
+            value = values.get(column, values.get('@' + column, 0))
+            if column in integer_columns or column_decimals == 0:
+                value_str = str(int(float(value)))
+            else:
+                value_str = f"{float(value):.{column_decimals}f}"
+                # DSSAT drops the leading zero of fractions that do not fit (e.g. '.0003')
+                if len(value_str) >= width and value_str.startswith(('0.', '-0.')):
+                    value_str = value_str.replace('0.', '.', 1)
+            # A value wider than its column is kept whole, separated by one blank
+            if len(value_str) >= width and fields:
+                value_str = ' ' + value_str
+            fields.append(value_str.rjust(width))
+
+        return ''.join(fields)
+
+
+# Layouts by header line, in least recently used order
+HEADER_LAYOUTS = OrderedDict()
+HEADER_LAYOUT_MAX_ENTRIES = 64
+
+
+def header_layout(header_line, data_line=None):
+    """
+    Returns the cached layout of a DSSAT header line, building it on first use.
+
+    Args:
+        header_line (str): The '@' header line of the table.
+        data_line (str, optional): A data line of the table, checked to have one token per
+            column.
+
+    Returns:
+        HeaderLayout: The layout of the header.
+
+    Raises:
+        ValueError: If the header and data token counts differ.
+    """
+    layout = HEADER_LAYOUTS.get(header_line)
+    if layout is None:
+        layout = HeaderLayout(header_line)
+        HEADER_LAYOUTS[header_line] = layout
+        while len(HEADER_LAYOUTS) > HEADER_LAYOUT_MAX_ENTRIES:
+            HEADER_LAYOUTS.popitem(last=False)
+    else:
+        HEADER_LAYOUTS.move_to_end(header_line)
+
+    if data_line is not None:
+        layout.check_data_line(data_line)
+
+    return layout
+
+
 def find_variable_position(header_line, data_line, variables):
     """
         Counts space groups until the specified variables.
@@ -1162,25 +2719,8 @@ def find_variable_position(header_line, data_line, variables):
         Returns:
         dict: A dictionary with variables as keys and their positions as values.
     """
-    # Remove '@' from header and split into tokens
-    header_tokens = header_line.replace('@', ' ').split()
-    # Split the data line in the same way PEST sees fields
-    data_tokens = data_line.split()
-
-    # Sanity check: header and data must have the same number of tokens
-    if len(header_tokens) != len(data_tokens):
-        raise ValueError(
-            f"Header and data token counts differ: "
-            f"{len(header_tokens)} vs {len(data_tokens)}"
-        )
-
-    positions = {}
-    space_count = 1  # Start at 1 (YEAR is column 1)
-
-    for variable_file in header_tokens:
-        if variable_file in variables:
-            positions[variable_file] = space_count
-        space_count += 1
+    # The header is tokenized once and checked against the data line once (cached layout)
+    positions = header_layout(header_line, data_line).positions(variables)
 
     # Check if all variables were found
     for variable in variables:
@@ -1196,29 +2736,33 @@ def filter_dataframe(dataframe, treatment, treatment_number_name, variables):
     and variables where values are not -99.
 
     Parameters:
-    dataframe (pd.DataFrame): Input DataFrame.
+    dataframe (pd.DataFrame or ObservationTable): Input DataFrame (as returned by
+        wht_filedata_to_dataframe()) or the ObservationTable of the T file.
     treatment (str): Treatment name to filter by.
     treatment_number_name (dict): Mapping of treatments to their corresponding TRNO values.
     variables (list): List of variable names to check in the dataset.
 
     Returns:
-    dict: A dictionary containing filtered data with DATE as keys and variables as values.
+    dict: A dictionary containing filtered data with DATE as keys and variables as values (float).
     """
 
     # Check critical columns
-    critical_columns = {'TRNO', 'DATE'}
-    missing_critical = critical_columns - set(dataframe.columns)
+    if not isinstance(dataframe, ObservationTable):
+        critical_columns = {'TRNO', 'DATE'}
+        missing_critical = critical_columns - set(dataframe.columns)
+
+        if missing_critical:
+            raise ValueError(f"Missing critical columns: {missing_critical}")
 
-    if missing_critical:
-        raise ValueError(f"Missing critical columns: {missing_critical}")
+        dataframe = ObservationTable(dataframe)
 
     # Check if the treatment exists
     if treatment not in treatment_number_name:
         raise ValueError(f"Treatment '{treatment}' not found.")
 
     # Identify present and missing variables
-    present_variables = [var for var in variables if var in dataframe.columns]
-    missing_variables = [var for var in variables if var not in dataframe.columns]
+    present_variables = [var for var in variables if var in dataframe.variables]
+    missing_variables = [var for var in variables if var not in dataframe.variables]
 
     if missing_variables:
         print(f"Warning: The following variables are missing and will be skipped: {missing_variables}")
@@ -1232,31 +2776,164 @@ def filter_dataframe(dataframe, treatment, treatment_number_name, variables):
     # Get the TRNO value for the treatment
     trno_value = str(treatment_number_name[treatment]).strip()
 
-    # Make sure TRNO is comparable as string
-    df = dataframe.copy()
-    df['TRNO'] = df['TRNO'].astype(str).str.strip()
-    df['DATE'] = df['DATE'].astype(str).str.strip()
-
-    # Initialize result dictionary
-    variable_value = {}
-
-    for variable in present_variables:
-        filtered_df = df[
-            (df['TRNO'] == trno_value) &
-            (df[variable].notna()) &
-            (df[variable] != '-99') &
-            (df[variable] != -99) &
-            (df[variable] != 0) &
-            (df[variable] != '0')
-        ]
+    return dataframe.observations(trno_value, present_variables)
+
+
+# Suffix of the observation names of each treatment when ts() or overview() write several
+# treatments to one instruction file
+DEFAULT_TREATMENT_SUFFIX = 'T{trno}'
+
 
-        for _, row in filtered_df.iterrows():
-            date = row['DATE']
-            if date not in variable_value:
-                variable_value[date] = {}
-            variable_value[date][variable] = row[variable]
+def validate_treatment_list(treatment, suffix):
+    """
+    Validates the 'treatment' and 'suffix' arguments of ts() and overview(). The treatment
+    is a treatment name, or a list of treatment names read from a single instruction file.
 
-    return dict(sorted(variable_value.items()))
+    Args:
+        treatment (str or list of str): Treatment name(s).
+        suffix (str or list of str): Suffix of the observation names. With a list of
+            treatments, None (the default suffix 'T<treatment number>' is used for every
+            treatment) or a list with one suffix per treatment.
+
+    Returns:
+        tuple: (treatments, suffixes), two lists of the same length.
+    """
+    if isinstance(treatment, list):
+        if not treatment or not all(isinstance(name, str) and name for name in treatment):
+            raise ValueError("The 'treatment' must be a non-empty string or a non-empty list of strings.")
+        if len(set(treatment)) != len(treatment):
+            raise ValueError("The 'treatment' list contains repeated treatments.")
+
+        if suffix is None:
+            suffixes = [DEFAULT_TREATMENT_SUFFIX] * len(treatment)
+        elif isinstance(suffix, list) and len(suffix) == len(treatment):
+            suffixes = suffix
+        else:
+            raise ValueError(
+                "With a list of treatments, the 'suffix' must be None or a list with one suffix per treatment."
+            )
+        return list(treatment), list(suffixes)
+
+    if not treatment or not isinstance(treatment, str):
+        raise ValueError("The 'treatment' must be a non-empty string.")
+    return [treatment], [suffix]
+
+
+def order_treatment_instructions(treatment_instructions):
+    """
+    Orders the instructions of several treatments of an output file by the position of their
+    blocks in the file, so that a single instruction file reads them from the top of the
+    file in one pass, each block starting from its own anchors.
+
+    Args:
+        treatment_instructions (list of dict): One entry per treatment, with at least the
+            'start_line' of its block and its 'observations' DataFrame.
+
+    Returns:
+        list of dict: The entries in file order.
+
+    Raises:
+        ValueError: If two treatments resolve to the same block or share observation names.
+    """
+    ordered = sorted(treatment_instructions, key=lambda instructions: instructions['start_line'])
+
+    start_lines = [instructions['start_line'] for instructions in ordered]
+    if len(set(start_lines)) != len(start_lines):
+        raise ValueError("More than one treatment resolves to the same block of the output file.")
+
+    if len(ordered) > 1:
+        names = pd.concat([instructions['observations']['variable_name'] for instructions in ordered])
+        duplicated_names = sorted(names[names.duplicated()].unique())
+        if duplicated_names:
+            raise ValueError(
+                f"The following observation names are repeated across treatments: {duplicated_names}\n"
+                "Use one suffix per treatment."
+            )
+
+    return ordered
+
+
+# Ways of addressing the values of a time-series file in an instruction file (see ts()):
+# 'whitespace' skips blank-delimited fields with 'w', 'columns' reads fixed columns
+INS_STYLES = ('whitespace', 'columns')
+
+
+class InsWriter:
+    """
+    Writes a ``PEST instruction file (.INS)`` line by line.
+
+    The header lines written by ts() and overview() (the first line with the primary
+    marker, then one primary-marker anchor per entry of ``anchors``, e.g. the
+    experiment code, the treatment and the header line) are written when the writer
+    is opened, and each instruction line is streamed to the file as it is generated,
+    so memory use does not grow with the number of observations. The file is written
+    to a temporary path and moved into place when the writer is closed without an
+    error; if an error is raised while writing, no file is left behind.
+
+    Args:
+        file_path (str): Path of the .INS file.
+        first_line (str): First line of the file (e.g. 'pif').
+        mrk (str): Primary marker delimiter.
+        anchors (iterable of str): Texts written as primary-marker anchors after the
+            first line.
+
+    Example:
+        with InsWriter(ins_path, 'pif', '~', [experiment_code, treatment]) as ins_writer:
+            ins_writer.write('l1 ~LAID~ !LAID_75167!')
+    """
+
+    def __init__(self, file_path, first_line, mrk, anchors=()):
+        self.file_path = file_path
+        self.first_line = first_line
+        self.mrk = mrk
+        self.anchors = list(anchors)
+        self.lines = 0
+        self._file = None
+        self._temporary_path = f"{file_path}.{os.getpid()}.tmp"
+
+    def __enter__(self):
+        self._file = open(self._temporary_path, 'w')
+        self._file.write(f"{self.first_line} {self.mrk}\n")
+        for anchor in self.anchors:
+            self._file.write(f"{self.mrk}{anchor}{self.mrk}\n")
+        return self
+
+    def write(self, line):
+        """Writes one instruction line."""
+        self._file.write(line)
+        self._file.write("\n")
+        self.lines += 1
+
+    def writelines(self, lines):
+        """
+        Writes several instruction lines. A list of lines is joined and written at once;
+        other iterables (e.g. generators) are streamed line by line.
+        """
+        if isinstance(lines, list):
+            if lines:
+                self._file.write("\n".join(lines))
+                self._file.write("\n")
+                self.lines += len(lines)
+            return
+
+        for line in lines:
+            self.write(line)
+
+    def write_anchors(self, anchors):
+        """Writes primary-marker anchors, e.g. those of the next treatment block of the file."""
+        for anchor in anchors:
+            self.write(f"{self.mrk}{anchor}{self.mrk}")
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._file.close()
+        if exc_type is None:
+            os.replace(self._temporary_path, self.file_path)
+        else:
+            try:
+                os.remove(self._temporary_path)
+            except OSError:
+                pass
+        return False
 
 
 def validate_marker(marker, marker_name):
@@ -1337,44 +3014,367 @@ def validate_file_path(file_path):
 #     return all_params
 
 
-def read_growth_file(file_path, treatment_range):
+def header_column_spans(header_line):
+    """
+    Computes the character span of each column of a DSSAT fixed-width table from its
+    '@' header line (e.g. '@YEAR DOY   DAS ...'). Values are right-aligned under their
+    header, so each column spans from the end of the previous header to the end of its own.
+
+    Args:
+        header_line (str): The header line of the table.
+
+    Returns:
+        tuple: (columns, spans), where columns is the list of column names and spans is
+            a list of (start, end) tuples (end excluded) for each column.
+    """
+    layout = header_layout(header_line)
+    # Copies, as the callers may adjust them
+    return list(layout.columns), list(layout.spans)
+
+
+def fields_to_float(fields):
+    """
+    Converts right-aligned numeric fields to float64.
+
+    Plain decimal fields (an optional leading '-', digits and at most one '.') are
+    converted arithmetically as an integer mantissa divided by a power of ten, which
+    gives the same correctly rounded values as ``float()``. If any field is not plain
+    (e.g. it has an exponent), NumPy's string parser is used instead.
+
+    Args:
+        fields (numpy.ndarray): uint8 array of shape (field width, rows, columns) with
+            the characters of each field, one character position per plane.
+
+    Returns:
+        numpy.ndarray: float64 array of shape (rows, columns).
+
+    Raises:
+        ValueError: If a field is not a number.
+    """
+    field_width, rows, columns = fields.shape
+
+    mantissa = np.zeros((rows, columns), dtype=np.int64)
+    decimals = np.zeros((rows, columns), dtype=np.int64)
+    negative = np.zeros((rows, columns), dtype=bool)
+    seen_point = np.zeros((rows, columns), dtype=bool)
+    has_digit = np.zeros((rows, columns), dtype=bool)
+    groups = np.zeros((rows, columns), dtype=np.int64)
+    previous_blank = np.ones((rows, columns), dtype=bool)
+    invalid = np.zeros((rows, columns), dtype=bool)
+
+    # Horner's scheme over the character positions, checking the layout on the way
+    for characters in fields:
+        is_digit = (characters >= ord('0')) & (characters <= ord('9'))
+        is_point = characters == ord('.')
+        is_minus = characters == ord('-')
+        is_blank = characters == ord(' ')
+
+        invalid |= ~(is_digit | is_point | is_minus | is_blank)
+        invalid |= is_point & seen_point
+        invalid |= is_minus & ~previous_blank
+        groups += ~is_blank & previous_blank
+
+        mantissa = np.where(is_digit, mantissa * 10 + (characters - ord('0')), mantissa)
+        decimals += is_digit & seen_point
+        negative |= is_minus
+        seen_point |= is_point
+        has_digit |= is_digit
+        previous_blank = is_blank
+
+    if field_width > 15 or invalid.any() or not has_digit.all() or np.any(groups != 1):
+        return (
+            np.ascontiguousarray(fields.transpose(1, 2, 0))
+            .view(f'S{field_width}').reshape(rows, columns).astype(np.float64)
+        )
+
+    values = mantissa.astype(np.float64) / 10.0 ** decimals
+
+    return np.where(negative, -values, values)
+
+
+def parse_fixed_width_block(header_line, data_lines, missing_value=-99):
+    """
+    Converts the data rows of a DSSAT fixed-width table into a 2-D float64 NumPy array in
+    a single pass, using the column spans of its '@' header line. Values such as '.0003',
+    '-99' and '-99.0' are handled.
+
+    Args:
+        header_line (str): The '@' header line of the table.
+        data_lines (list of str): The data rows of the table.
+        missing_value (float): The DSSAT missing value marker. Defaults to -99.
+
+    Returns:
+        tuple: (columns, values, missing, integer_columns), where columns is the list of
+            column names, values the (rows, columns) float64 array, missing a boolean array
+            marking the missing values and integer_columns a boolean array marking the
+            columns written without decimals.
+
+    Raises:
+        ValueError: If the rows do not follow the fixed-width layout of the header (e.g. a
+            value crosses a column boundary or a field is empty).
+    """
+    columns, spans = header_column_spans(header_line)
+    if len(columns) != len(spans):
+        raise ValueError("The header line does not define one span per column.")
+
+    rows = [line.rstrip('\r\n').encode('ascii', errors='replace') for line in data_lines]
+    width = max(max((len(row) for row in rows), default=0), spans[-1][1])
+
+    # One byte per character: (rows, width) matrix padded with spaces, plus one blank
+    # position at the end used to pad the narrower fields
+    matrix = np.full((len(rows), width + 1), ord(' '), dtype=np.uint8)
+    matrix[:, :width] = np.array(rows, dtype=f'S{width}').view(np.uint8).reshape(len(rows), width)
+    matrix[matrix == 0] = ord(' ')
+
+    # The last column extends to the end of the longest row
+    spans[-1] = (spans[-1][0], width)
+    starts = np.array([start for start, _ in spans])
+    ends = np.array([end for _, end in spans])
+
+    # A value crossing a column boundary leaves no blank on either side of it
+    is_blank = matrix == ord(' ')
+    if np.any(~is_blank[:, starts[1:] - 1] & ~is_blank[:, starts[1:]]):
+        raise ValueError("A value crosses a column boundary of the header.")
+
+    # Gather every field right-aligned into a (field width, rows, columns) array
+    field_width = int((ends - starts).max())
+    positions = ends[None, :] - field_width + np.arange(field_width)[:, None]
+    positions[positions < starts[None, :]] = width
+    fields = np.ascontiguousarray(matrix[:, positions].transpose(1, 0, 2))
+
+    values = fields_to_float(fields)
+
+    # Columns written without a decimal point or exponent are integer columns
+    is_decimal = (fields == ord('.')) | (fields == ord('e')) | (fields == ord('E'))
+    integer_columns = ~is_decimal.any(axis=(0, 1))
+
+    missing = values == missing_value
+
+    return columns, values, missing, integer_columns
+
+
+def growth_cache_path(file_path, treatment_range, cache_dir):
+    """
+    Returns the path of the columnar cache directory of one time-series block.
+
+    Arguments:
+    file_path (str): Path to the .OUT file.
+    treatment_range (tuple): The start and end line numbers of the block.
+    cache_dir (str): The cache directory.
+
+    Returns:
+    str: Path to the '.dpcol' directory of the block.
+    """
+    source = os.path.abspath(file_path)
+    key = hashlib.sha1(f"columns:{source}".encode('utf-8')).hexdigest()[:16]
+    start_line, end_line = treatment_range
+    return os.path.join(
+        cache_dir, f"{os.path.basename(source)}.{start_line}-{end_line}.{key}{COLUMN_CACHE_SUFFIX}"
+    )
+
+
+def load_growth_columns(file_path, treatment_range, cache_dir=None, mmap_mode='r'):
+    """
+    Opens the cached columns of one time-series block as memory-mapped arrays, if the block
+    was cached by read_growth_file() and the .OUT file did not change since. The arrays share
+    their pages across processes and need no parsing.
+
+    Arguments:
+    file_path (str or OutFileIndex): The path to the .OUT file, or an OutFileIndex of that file.
+    treatment_range (tuple): The start and end line numbers of the block.
+    cache_dir (str, optional): The cache directory. If not provided, the DPEST_CACHE_DIR
+        environment variable is used.
+    mmap_mode (str): 'r' for read-only arrays (default) or 'c' for copy-on-write arrays, whose
+        pages stay shared until they are written to (the cache files are never modified).
+
+    Returns:
+    dict or None: Column names mapped to memory-mapped arrays, in file order, or None if there
+        is no valid cache entry for the block.
+    """
+    cache_dir = get_index_cache_dir(cache_dir)
+    if cache_dir is None:
+        return None
+
+    file_path = os.fspath(file_path)
+    block_dir = growth_cache_path(file_path, treatment_range, cache_dir)
+    try:
+        with open(os.path.join(block_dir, 'schema.json'), 'r', encoding='utf-8') as schema_file:
+            schema = json.load(schema_file)
+        if schema.get('signature') != file_signature(file_path):
+            return None
+
+        columns = {
+            name: np.load(os.path.join(block_dir, f"{position}.npy"), mmap_mode=mmap_mode)
+            for position, name in enumerate(schema['columns'])
+        }
+    except (OSError, ValueError, KeyError):
+        return None
+
+    # Mark the entry as recently used
+    try:
+        os.utime(block_dir)
+    except OSError:
+        pass
+
+    return columns
+
+
+def save_growth_columns(file_path, treatment_range, df, signature, cache_dir=None):
+    """
+    Saves the columns of one parsed time-series block as .npy files and a JSON schema, and
+    removes the least recently used blocks of the cache. Frames with non-numeric or duplicated
+    columns are not cached; errors writing the cache are ignored.
+
+    Arguments:
+    file_path (str): The path to the .OUT file.
+    treatment_range (tuple): The start and end line numbers of the block.
+    df (pd.DataFrame): The parsed block.
+    signature (dict): Signature of the file taken before it was parsed (see file_signature()).
+    cache_dir (str, optional): The cache directory (see get_index_cache_dir()).
+    """
+    cache_dir = get_index_cache_dir(cache_dir)
+    if cache_dir is None:
+        return
+    if df.columns.duplicated().any() or any(dtype.kind not in 'biuf' for dtype in df.dtypes):
+        return
+
+    block_dir = growth_cache_path(file_path, treatment_range, cache_dir)
+    schema = {
+        'source': os.path.abspath(file_path),
+        'treatment_range': list(treatment_range),
+        'signature': signature,
+        'columns': list(df.columns),
+        'dtypes': [str(dtype) for dtype in df.dtypes],
+        'rows': len(df),
+    }
+
+    # Write to a temporary directory first so that readers never see a partial entry
+    temporary_dir = f"{block_dir}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(temporary_dir, exist_ok=True)
+        for position, name in enumerate(df.columns):
+            np.save(os.path.join(temporary_dir, f"{position}.npy"), df[name].to_numpy())
+        with open(os.path.join(temporary_dir, 'schema.json'), 'w', encoding='utf-8') as schema_file:
+            json.dump(schema, schema_file)
+
+        if os.path.isdir(block_dir):
+            shutil.rmtree(block_dir)
+        os.replace(temporary_dir, block_dir)
+    except OSError:
+        shutil.rmtree(temporary_dir, ignore_errors=True)
+        return
+
+    evict_index_cache(cache_dir, COLUMN_CACHE_MAX_ENTRIES, COLUMN_CACHE_SUFFIX)
+
+
+def read_growth_file(file_path, treatment_range, use_mmap=False, cache_dir=None):
     """
     Reads a growth aspects output file and converts it into a pandas DataFrame.
 
     Arguments:
-    file_path (str): The path to the text file containing the growth aspects data.
+    file_path (str or OutFileIndex): The path to the text file containing the growth aspects data,
+        or a prebuilt OutFileIndex of that file.
     treatment_range (tuple): A tuple containing the start and end line numbers for the treatment data.
+    use_mmap (bool): If True, the file is memory-mapped and only the byte range of the treatment
+        block is decoded, instead of loading every line of the file. Peak memory then stays close
+        to the size of one block. Defaults to False.
+    cache_dir (str, optional): Directory of the columnar cache. If provided (or if the DPEST_CACHE_DIR
+        environment variable is set), the parsed block is saved as .npy columns and later calls read
+        it back without parsing until the file changes. The columns of a cached block are not
+        copied: the DataFrame is backed by copy-on-write memory maps of the cache files (see
+        load_growth_columns()).
 
     Returns:
     pd.DataFrame: A DataFrame containing the parsed data.
     """
-    # Initialize an empty list to store the data
-    data = []
+    # Blocks already parsed on the index (see OutFileIndex.parse_blocks())
+    if isinstance(file_path, OutFileIndex):
+        block = file_path.block_at(treatment_range[0])
+        parsed = file_path.parsed_block(treatment_range[0])
+        if isinstance(parsed, pd.DataFrame) and block['end_line'] == treatment_range[1]:
+            return parsed.copy()
+
+    cache_dir = get_index_cache_dir(cache_dir)
+    signature = None
+    if cache_dir is not None:
+        cached_columns = load_growth_columns(file_path, treatment_range, cache_dir, mmap_mode='c')
+        if cached_columns is not None:
+            return pd.DataFrame(cached_columns, copy=False)
+        signature = file_signature(os.fspath(file_path))
 
     start_line, end_line = treatment_range
 
-    # Open and read the file
-    with open(file_path, "r") as text_file:
-        lines = text_file.readlines()
+    if use_mmap:
+        # Locate the byte range of the block and decode only that range
+        out_index = file_path if isinstance(file_path, OutFileIndex) else OutFileIndex(file_path)
+        block = out_index.block_at(start_line)
+        if block is None:
+            raise ValueError(f"No '*DSSAT' block starts at line {start_line} of {out_index.file_path}")
+
+        treatment_lines = out_index.read_block_lines(block, use_mmap=True)
+
+    else:
+        # Open and read the file
+        with open(file_path, "r") as text_file:
+            lines = text_file.readlines()
 
         # Filter lines for the specified treatment
         treatment_lines = lines[start_line - 1:end_line]  # -1 to account for 0-based indexing
 
-        # Find the line starting with '@' which contains the column headers
-        for i, line in enumerate(treatment_lines):
-            if line.startswith('@'):
-                header_line = line
-                break
+    df = growth_lines_to_dataframe(treatment_lines)
+
+    if signature is not None:
+        save_growth_columns(os.fspath(file_path), treatment_range, df, signature, cache_dir)
+
+    return df
 
-        # Extract the column headers by splitting the line at whitespace
-        headers = header_line.strip().split()
 
-        # Extract the data starting from the next line after the headers
-        for line in treatment_lines[i + 1:]:
-            # Split the line into individual values based on whitespace
-            row = line.strip().split()
-            # Append the row to the data list
-            data.append(row)
+def growth_lines_to_dataframe(treatment_lines):
+    """
+    Converts the lines of one time-series block (e.g. from PlantGro.OUT) into a pandas DataFrame,
+    using the column headers of its '@' line.
+
+    Arguments:
+    treatment_lines (list of str): The lines of the block.
+
+    Returns:
+    pd.DataFrame: A DataFrame containing the parsed data.
+    """
+    # Initialize an empty list to store the data
+    data = []
+
+    # Find the line starting with '@' which contains the column headers
+    for i, line in enumerate(treatment_lines):
+        if line.startswith('@'):
+            header_line = line
+            break
+
+    # Extract the column headers by splitting the line at whitespace
+    headers = header_line.strip().split()
+
+    # Data rows start on the next line after the headers (blank lines separate the blocks)
+    data_lines = [line for line in treatment_lines[i + 1:] if line.strip()]
+
+    # Convert the whole block at once using the column spans of the header
+    try:
+        columns, values, missing, integer_columns = parse_fixed_width_block(header_line, data_lines)
+    except ValueError:
+        columns = None
+
+    if columns is not None:
+        df = pd.DataFrame({
+            position: values[:, position].astype(np.int64) if integer_columns[position] else values[:, position]
+            for position in range(len(columns))
+        })
+        df.columns = headers
+        return df
+
+    # Rows that do not follow the fixed-width layout are split on whitespace
+    for line in data_lines:
+        # Split the line into individual values based on whitespace
+        row = line.strip().split()
+        # Append the row data to the data list
+        data.append(row)
 
     # Create a DataFrame from the data with the extracted headers
     df = pd.DataFrame(data, columns=headers)
@@ -1384,6 +3384,459 @@ def read_growth_file(file_path, treatment_range):
 
     return df
 
+def out_block_frame(lines, kind="timeseries"):
+    """
+    Converts the lines of one '*DSSAT' block into a DataFrame.
+
+    Arguments:
+    lines (list of str): The lines of the block.
+    kind (str): "timeseries" (converted as in read_growth_file()) or "overview" (columns
+        'variable', 'value_simulated', 'value_measured' and 'position', as in
+        extract_overview_data()).
+
+    Returns:
+    pd.DataFrame: The data of the block (empty if a time-series block has no '@' header yet).
+    """
+    if kind == "overview":
+        rows = parse_overview_block(lines)
+        variable_names, simulated_values, measured_values, positions = zip(*rows) if rows else ([],) * 4
+        block_frame = build_overview_frame({
+            'VARIABLE': list(variable_names),
+            'VALUE_SIMULATED': list(simulated_values),
+            'VALUE_MEASURED': list(measured_values),
+            'POSITION': list(positions),
+        })
+        block_frame.columns = block_frame.columns.str.lower()
+        return block_frame
+
+    if any(line.startswith('@') for line in lines):
+        return growth_lines_to_dataframe(lines)
+
+    return pd.DataFrame()
+
+
+def iter_out_blocks(file_path, kind="timeseries"):
+    """
+    Iterates over the '*DSSAT' blocks of a DSSAT output file, reading the file incrementally
+    so that only one block is held in memory at a time.
+
+    Arguments:
+    file_path (str or OutFileIndex): The path to the .OUT file, or an OutFileIndex of that file.
+    kind (str): "timeseries" for time-series files (e.g. PlantGro.OUT), whose blocks are
+        converted as in read_growth_file(), or "overview" for OVERVIEW.OUT, whose blocks are
+        converted as in extract_overview_data() (columns 'variable', 'value_simulated',
+        'value_measured' and 'position'). Defaults to "timeseries".
+
+    Yields:
+    tuple: (experiment, trno, treatment, cultivar, block_frame) for each block, in file order,
+        where experiment is the experiment code, trno the treatment number and treatment the
+        treatment name found on the block header lines.
+    """
+    if kind not in ("timeseries", "overview"):
+        raise ValueError(f"kind must be 'timeseries' or 'overview', not {kind!r}")
+
+    def block_result(block, lines):
+        block_frame = out_block_frame(lines, kind)
+        return block.get('experiment'), block.get('trno'), block.get('treatment'), block.get('cultivar'), block_frame
+
+    block = None
+    lines = []
+
+    with open(os.fspath(file_path), 'rb') as file:
+        for raw_line in file:
+            line = decode_out_line(raw_line)
+
+            if '*DSSAT' in line:
+                # A new block starts at each '*DSSAT' line
+                if block is not None:
+                    yield block_result(block, lines)
+                block = {}
+                lines = []
+
+            if block is None:
+                continue
+
+            # RUN, MODEL, EXPERIMENT, TREATMENT and CULTIVAR lines of the block
+            if not line.startswith('@'):
+                parse_out_block_line(line, block)
+            lines.append(line)
+
+    if block is not None:
+        yield block_result(block, lines)
+
+
+class OutFileMonitor:
+    """
+    Incremental reader of a DSSAT output file that is still being written (e.g. PlantGro.OUT or
+    OVERVIEW.OUT during a long batch run). Each call to poll() parses only the bytes appended
+    since the previous call, and updates the block index and the DataFrame of each block.
+
+    Args:
+        file_path (str or OutFileIndex): Path to the .OUT file, or an OutFileIndex of that file.
+        kind (str): "timeseries" or "overview" (see iter_out_blocks()). Defaults to "timeseries".
+
+    Attributes:
+        out_index (OutFileIndex): The index of the file, updated by poll().
+        frames (dict): The DataFrame of each parsed block, keyed by the start line of the block.
+    """
+
+    def __init__(self, file_path, kind="timeseries"):
+        if kind not in ("timeseries", "overview"):
+            raise ValueError(f"kind must be 'timeseries' or 'overview', not {kind!r}")
+
+        self.kind = kind
+        self.out_index = file_path if isinstance(file_path, OutFileIndex) else OutFileIndex(file_path)
+        self.frames = {}
+        self._pending_blocks = list(self.out_index.blocks)
+
+    def poll(self):
+        """
+        Parses the blocks that were appended (or completed) since the previous call.
+
+        Returns:
+            list of tuple: (experiment, trno, treatment, cultivar, block_frame) for each new or
+                updated block, in file order.
+        """
+        changed_blocks = self._pending_blocks + self.out_index.update()
+        self._pending_blocks = []
+        if not changed_blocks:
+            return []
+
+        # Blocks from the first changed one onwards are parsed again (all of them if the
+        # file was rewritten instead of appended to)
+        first_start_line = min(block['start_line'] for block in changed_blocks)
+        for start_line in [start_line for start_line in self.frames if start_line >= first_start_line]:
+            del self.frames[start_line]
+
+        last_block = self.out_index.blocks[-1]
+        results = []
+        for block in self.out_index.blocks:
+            if block['start_line'] < first_start_line:
+                continue
+
+            lines = self.out_index.read_block_lines(block)
+
+            # The last line of the file may still be being written
+            if block is last_block and lines and not lines[-1].endswith('\n'):
+                lines = lines[:-1]
+
+            block_frame = out_block_frame(lines, self.kind)
+            self.frames[block['start_line']] = block_frame
+            results.append((block['experiment'], block['trno'], block['treatment'], block['cultivar'], block_frame))
+
+        return results
+
+    def treatment_dict(self):
+        """
+        Returns the treatment line ranges known so far, in the same format as ``simulations_lines``.
+        """
+        return self.out_index.treatment_dict()
+
+
+def is_t_file(file_path):
+    """
+    Checks whether a file is a DSSAT T file (measured time-series data), i.e. whether it
+    has a '@TRNO' table header within its first 64 KB.
+
+    Arguments:
+    file_path (str): Path to the file.
+
+    Returns:
+    bool: True if the file has a '@TRNO' header line.
+    """
+    try:
+        with open(file_path, 'rb') as file:
+            head = file.read(65536)
+    except OSError:
+        return False
+
+    return head.startswith(b'@TRNO') or b'\n@TRNO' in head
+
+
+# T-file names are <EXPCODE>.<CROPCODE>T, e.g. SWSW7501.WHT (matched case-insensitively).
+# .OUT files have the same shape ('OU' + 'T') and are left out
+T_FILE_NAME_RE = re.compile(r"^(?P<experiment>[^.]+)\.(?!OUT$)(?P<crop>[A-Za-z0-9]{2})T$", re.IGNORECASE)
+
+# Directories modified less than this long before a scan are scanned again on the next lookup
+DIRECTORY_MTIME_MARGIN_NS = 2_000_000_000
+
+
+def read_t_file_header(file_path):
+    """
+    Reads the variable columns and the treatment numbers of a DSSAT T file without
+    parsing its values: only the '@' header lines and the first field of the data
+    rows are looked at.
+
+    Arguments:
+    file_path (str): Path to the T file.
+
+    Returns:
+    tuple: (variables, trnos) where variables is the list of the measured variable
+        columns, in the order of the file, and trnos is the sorted list of the
+        treatment numbers (int).
+    """
+    variables = []
+    trnos = set()
+    in_table = False
+
+    with open(file_path, 'rb') as file:
+        for raw_line in file:
+            line = raw_line.strip()
+            if line.startswith(b'@'):
+                columns = line[1:].decode('latin-1').split()
+                in_table = bool(columns) and columns[0] == 'TRNO'
+                if in_table:
+                    variables.extend(column for column in columns[2:] if column not in variables)
+            elif in_table and line and line[:1] not in (b'!', b'*'):
+                first_field = line.split(None, 1)[0]
+                if first_field.isdigit():
+                    trnos.add(int(first_field))
+
+    return variables, sorted(trnos)
+
+
+class TFileIndex:
+    """
+    Index of the DSSAT T files of a directory (e.g. ``C:/DSSAT48/Wheat``).
+
+    Every ``*.??T`` file of the directory is indexed once from its headers, and the
+    index maps the experiment and crop codes of each T file to its path, its
+    treatment numbers and its measured variable columns. File names are matched
+    case-insensitively. The index is saved in the index cache (see
+    get_index_cache_dir()) and refresh() only re-reads the files whose size or
+    modification time changed.
+
+    Args:
+        directory (str): The directory to index.
+        cache_dir (str, optional): Directory of the index cache. If not provided, the
+            DPEST_CACHE_DIR environment variable is used; the index is not saved if
+            neither is set.
+
+    Attributes:
+        files (dict): File names mapped to their entries, with the keys 'path',
+            'experiment', 'crop', 'size', 'mtime_ns', 'trnos' and 'variables'. Files
+            with a T-file name that are not T files have an entry with 'trnos' and
+            'variables' set to None, so that they are not read again.
+        directory_mtime_ns (int): Modification time of the directory when it was last
+            scanned, or None if it may have changed during the scan (see refresh_if_changed()).
+    """
+
+    def __init__(self, directory, cache_dir=None):
+        self.directory = os.path.abspath(directory)
+        self.cache_dir = cache_dir
+        self.files = {}
+        self.directory_mtime_ns = None
+
+        payload = load_index_cache(self.directory, 'tdir', cache_dir, signature={})
+        if payload is not None:
+            self.files = payload['files']
+
+        self.refresh()
+
+    def __repr__(self):
+        return f"TFileIndex({self.directory!r}, {len(self.t_files())} T files)"
+
+    def refresh(self):
+        """
+        Indexes the new and changed T files of the directory and drops the removed ones.
+
+        Returns:
+            list of str: Names of the files that were added, changed or removed.
+        """
+        changed = []
+        present = set()
+
+        # The modification time of the directory is only trusted if it is older than the
+        # scan, so that entries created in the same clock tick are not missed
+        scan_start_ns = time.time_ns()
+        directory_mtime_ns = os.stat(self.directory).st_mtime_ns
+        self.directory_mtime_ns = (
+            directory_mtime_ns if directory_mtime_ns < scan_start_ns - DIRECTORY_MTIME_MARGIN_NS else None
+        )
+
+        with os.scandir(self.directory) as scan:
+            for dir_entry in scan:
+                name_match = T_FILE_NAME_RE.match(dir_entry.name)
+                if name_match is None or not dir_entry.is_file():
+                    continue
+
+                present.add(dir_entry.name)
+                stat = dir_entry.stat()
+                entry = self.files.get(dir_entry.name)
+                if entry is not None and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+                    continue
+
+                variables = trnos = None
+                if is_t_file(dir_entry.path):
+                    variables, trnos = read_t_file_header(dir_entry.path)
+
+                self.files[dir_entry.name] = {
+                    'path': dir_entry.path,
+                    'experiment': name_match.group('experiment').upper(),
+                    'crop': name_match.group('crop').upper(),
+                    'size': stat.st_size,
+                    'mtime_ns': stat.st_mtime_ns,
+                    'trnos': trnos,
+                    'variables': variables,
+                }
+                changed.append(dir_entry.name)
+
+        for name in set(self.files) - present:
+            del self.files[name]
+            changed.append(name)
+
+        if changed:
+            save_index_cache(self.directory, 'tdir', {'files': self.files}, {}, cache_dir=self.cache_dir)
+
+        return changed
+
+    def refresh_if_changed(self):
+        """
+        Calls refresh() only if files were added, removed or renamed in the directory since
+        the last scan, as seen from the modification time of the directory. Files changed in
+        place are not looked at; the T-file tables themselves are validated by the size and
+        modification time of each file when they are read (see read_observation_table()).
+
+        Returns:
+            list of str: Names of the files that were added, changed or removed.
+        """
+        if (self.directory_mtime_ns is not None
+                and os.stat(self.directory).st_mtime_ns == self.directory_mtime_ns):
+            return []
+        return self.refresh()
+
+    def t_files(self):
+        """
+        Returns the entries of the T files, sorted by file name.
+        """
+        return [self.files[name] for name in sorted(self.files) if self.files[name]['trnos'] is not None]
+
+    def find(self, experiment, crop=None):
+        """
+        Returns the entry of the T file of an experiment, or None if there is none.
+
+        Args:
+            experiment (str): Experiment code (e.g. 'SWSW7501').
+            crop (str, optional): Crop code (e.g. 'WH'). Required when the experiment
+                has T files for more than one crop.
+
+        Returns:
+            dict or None: The entry of the T file (see ``files``).
+        """
+        matches = [
+            entry for entry in self.t_files()
+            if entry['experiment'] == experiment.upper() and (crop is None or entry['crop'] == crop.upper())
+        ]
+        if len(matches) > 1:
+            raise ValueError(
+                f"Experiment '{experiment}' has more than one T file in {self.directory}: "
+                f"{[os.path.basename(entry['path']) for entry in matches]}. Please specify the crop code."
+            )
+        return matches[0] if matches else None
+
+    def measured(self):
+        """
+        Returns which variables are measured for which treatments, from the headers
+        of the indexed T files.
+
+        Returns:
+            pd.DataFrame: One row per T file and treatment, with the columns
+                'experiment', 'crop', 'trno', 'variables' (list) and 'path'.
+        """
+        rows = [
+            {
+                'experiment': entry['experiment'],
+                'crop': entry['crop'],
+                'trno': trno,
+                'variables': entry['variables'],
+                'path': entry['path'],
+            }
+            for entry in self.t_files()
+            for trno in entry['trnos']
+        ]
+        return pd.DataFrame(rows, columns=['experiment', 'crop', 'trno', 'variables', 'path'])
+
+
+# Indexes of the directories searched by find_t_file(), by absolute path and cache directory,
+# in least recently used order
+T_FILE_INDEXES = OrderedDict()
+T_FILE_INDEX_MAX_ENTRIES = 32
+
+
+def find_t_file(directory, experiment_code, crop_code, cache_dir=None):
+    """
+    Returns the path of the T file of an experiment in a directory, using the T-file
+    index of the directory (see TFileIndex), which is kept in memory and only
+    rescanned when the directory changes (see TFileIndex.refresh_if_changed()), so
+    that ts_batch() over many treatments does not list the directory for each of them.
+    The indexes are kept by directory and ``cache_dir``; the least recently used ones
+    are evicted. The file name is matched case-insensitively.
+
+    Arguments:
+    directory (str): The directory of the T file (usually the directory of the .OUT file).
+    experiment_code (str): Experiment code (e.g. 'SWSW7501').
+    crop_code (str): Crop code (e.g. 'WH').
+    cache_dir (str, optional): Directory of the index cache (see TFileIndex).
+
+    Returns:
+    str: Path to the T file. If no T file is indexed for the experiment, the
+        expected path <directory>/<EXPCODE>.<CROPCODE>T is returned.
+    """
+    key = (os.path.abspath(directory), get_index_cache_dir(cache_dir))
+    t_file_index = T_FILE_INDEXES.get(key)
+    try:
+        if t_file_index is None:
+            t_file_index = TFileIndex(key[0], cache_dir=cache_dir)
+            T_FILE_INDEXES[key] = t_file_index
+            while len(T_FILE_INDEXES) > T_FILE_INDEX_MAX_ENTRIES:
+                T_FILE_INDEXES.popitem(last=False)
+        else:
+            t_file_index.refresh_if_changed()
+        T_FILE_INDEXES.move_to_end(key)
+    except OSError:
+        t_file_index = None
+
+    entry = t_file_index.find(experiment_code, crop_code) if t_file_index is not None else None
+    if entry is not None:
+        return entry['path']
+
+    return os.path.join(directory, f"{experiment_code}.{crop_code.upper()}T")
+
+
+def load_run_file(file_path):
+    """
+    Parses one file of a DSSAT run directory. Used as the worker function of
+    load_run_directory().
+
+    .OUT files are indexed with OutFileIndex and the data of their blocks is parsed on the
+    index (see OutFileIndex.parse_blocks()). T files are read with wht_filedata_to_dataframe()
+    and converted to an ObservationTable.
+
+    Arguments:
+    file_path (str): Path to the file.
+
+    Returns:
+    tuple: (file_path, result, file_stat, observations), where result is an OutFileIndex or a
+        DataFrame, file_stat the (size, mtime_ns) of the file before it was parsed and
+        observations the ObservationTable of a T file (None for .OUT files).
+    """
+    stat = os.stat(file_path)
+    file_stat = (stat.st_size, stat.st_mtime_ns)
+
+    if file_path.upper().endswith('.OUT'):
+        out_index = OutFileIndex(file_path)
+        out_index.parse_blocks()
+        return file_path, out_index, file_stat, None
+
+    t_df = wht_filedata_to_dataframe(file_path)
+    return file_path, t_df, file_stat, ObservationTable(t_df)
+
+
+# Below this total size, load_run_directory() parses the files in the current process by
+# default: starting a process pool costs more than parsing small files
+RUN_DIRECTORY_PARALLEL_MIN_BYTES = 16 * 1024 * 1024
+
+
 #### Old version add 0 on the new rows, can fail if it a new year
 # def new_rows_add(PlantGro, rows_add):
 #     # Get the last values from the relevant columns
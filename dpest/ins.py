@@ -0,0 +1,414 @@
+"""
+Reading of simulated values with PEST instruction files (.INS).
+
+An instruction file is compiled once into a cursor program, which can then be
+applied to any number of model output files without calling PEST or INSCHEK.
+This is used to check the instruction files written by ts() and overview() and
+to compute residuals in-process for many model runs.
+
+The instructions written by dpest are supported:
+
+* ``l<n>``: advance ``n`` lines.
+* ``~text~``: primary marker (first item of a line), searched from the next line
+  of the output file on; or secondary marker (any other item), searched on the
+  current line from the cursor on.
+* ``w``: move the cursor to the next blank and past all blanks.
+* ``!name!``: non-fixed observation, read as the next blank-delimited value.
+  Observations named ``dum`` are read but not returned.
+* ``[name]start:end``: fixed observation, read from columns ``start`` to ``end``
+  (starting at 1, both included) of the current line.
+* ``(name)start:end``: semi-fixed observation, read as the blank-delimited value
+  that overlaps columns ``start`` to ``end`` of the current line.
+
+Example:
+    from dpest import ins
+
+    simulated = ins.read('PlantGro.ins', 'C:/DSSAT48/Wheat/PlantGro.OUT')
+
+    program = ins.compile_instructions('PlantGro.ins')
+    for out_path in out_paths:
+        values = program.read_array(out_path)
+"""
+import os
+import re
+from collections import OrderedDict
+
+import numpy as np
+
+# Operations of a compiled program
+LINE_ADVANCE = 'l'
+PRIMARY_MARKER = 'primary'
+SECONDARY_MARKER = 'secondary'
+WHITESPACE = 'w'
+OBSERVATION = 'obs'
+FIXED_OBSERVATION = 'fixed'
+SEMI_FIXED_OBSERVATION = 'semi-fixed'
+
+# Name of the observations that are read but not returned
+DUMMY_OBSERVATION = 'dum'
+
+# Next blank-delimited value after the cursor
+VALUE_RE = re.compile(r"\s*(\S+)")
+
+# Fixed ('[name]start:end') and semi-fixed ('(name)start:end') observations, by opening bracket
+COLUMN_OBSERVATION_RES = {
+    '[': re.compile(r"^\[([^\]\s]+)\](\d+):(\d+)$"),
+    '(': re.compile(r"^\(([^)\s]+)\)(\d+):(\d+)$"),
+}
+
+# Closing bracket of the observations read from columns
+CLOSING_BRACKETS = {'[': ']', '(': ')'}
+
+
+def whitespace_re(count):
+    """
+    Returns the regular expression of ``count`` consecutive 'w' instructions: each one
+    moves the cursor to the next blank and then past all blanks, onto a non-blank.
+    """
+    return re.compile(r"(?:\S*\s+){%d}(?=\S)" % count)
+
+
+def split_instruction_line(line, marker):
+    """
+    Splits an instruction line into its items. Marker-delimited items (``~text~``) and
+    observations (``!name!``, ``[name]start:end``, ``(name)start:end``) are kept whole,
+    including any blanks they contain.
+
+    Args:
+        line (str): The instruction line.
+        marker (str): The primary marker delimiter.
+
+    Returns:
+        list of str: The items of the line.
+    """
+    items = []
+    position = 0
+    length = len(line)
+
+    while position < length:
+        character = line[position]
+        if character.isspace():
+            position += 1
+            continue
+
+        if character in (marker, '!'):
+            end = line.find(character, position + 1)
+            if end == -1:
+                raise ValueError(f"Unbalanced delimiter '{character}' in instruction line: {line.strip()}")
+            end += 1
+        elif character in CLOSING_BRACKETS:
+            # The column range follows the closing bracket
+            end = line.find(CLOSING_BRACKETS[character], position + 1)
+            if end == -1:
+                raise ValueError(f"Unbalanced delimiter '{character}' in instruction line: {line.strip()}")
+            while end < length and not line[end].isspace():
+                end += 1
+        else:
+            end = position
+            while end < length and not line[end].isspace():
+                end += 1
+
+        items.append(line[position:end])
+        position = end
+
+    return items
+
+
+class InstructionProgram:
+    """
+    A PEST instruction file compiled into a cursor program.
+
+    Args:
+        ins_path (str): Path to the instruction file.
+
+    Attributes:
+        ins_path (str): Path to the instruction file.
+        marker (str): The primary marker delimiter, from the first line ('pif ~').
+        obs_names (list of str): Observation names, in the order they are read.
+        operations (list of tuple): The program: (operation, argument, instruction line number).
+    """
+
+    def __init__(self, ins_path):
+        self.ins_path = ins_path
+        self.obs_names = []
+        self.operations = []
+
+        with open(ins_path, 'r') as ins_file:
+            first_line = ins_file.readline().split()
+            if len(first_line) < 2 or first_line[0].lower() != 'pif' or len(first_line[1]) != 1:
+                raise ValueError(f"The first line of '{ins_path}' must be 'pif <marker>'.")
+            self.marker = first_line[1]
+
+            for line_number, line in enumerate(ins_file, start=2):
+                items = split_instruction_line(line, self.marker)
+                if not items:
+                    continue
+                self._compile_line(items, line_number)
+
+        # Each observation can be read only once
+        seen = set()
+        for name in self.obs_names:
+            if name in seen:
+                raise ValueError(f"Observation '{name}' is listed more than once in '{ins_path}'.")
+            seen.add(name)
+
+    def __repr__(self):
+        return f"InstructionProgram({self.ins_path!r}, {len(self.obs_names)} observations)"
+
+    def _compile_line(self, items, line_number):
+        marker = self.marker
+        operations = self.operations
+
+        for item_number, item in enumerate(items):
+            if item[0] == marker and len(item) > 1 and item[-1] == marker:
+                text = item[1:-1]
+                operation = PRIMARY_MARKER if item_number == 0 else SECONDARY_MARKER
+                operations.append((operation, text, line_number))
+
+            elif item[0] == 'l' and item_number == 0:
+                try:
+                    count = int(item[1:])
+                except ValueError:
+                    raise ValueError(f"Invalid line advance '{item}' on line {line_number} of '{self.ins_path}'.")
+                if count < 1:
+                    raise ValueError(f"Invalid line advance '{item}' on line {line_number} of '{self.ins_path}'.")
+                operations.append((LINE_ADVANCE, count, line_number))
+
+            elif item == 'w':
+                # Consecutive 'w' instructions are executed as one operation
+                if operations and operations[-1][0] == WHITESPACE and operations[-1][2] == line_number \
+                        and items[item_number - 1] == 'w':
+                    count = operations[-1][1][0] + 1
+                    operations[-1] = (WHITESPACE, (count, whitespace_re(count)), line_number)
+                else:
+                    operations.append((WHITESPACE, (1, whitespace_re(1)), line_number))
+
+            elif item[0] == '!' and len(item) > 2 and item[-1] == '!':
+                name = item[1:-1]
+                operations.append((OBSERVATION, name, line_number))
+                if name.lower() != DUMMY_OBSERVATION:
+                    self.obs_names.append(name)
+
+            elif item[0] in CLOSING_BRACKETS:
+                match = COLUMN_OBSERVATION_RES[item[0]].match(item)
+                if match is None or not 1 <= int(match.group(2)) <= int(match.group(3)):
+                    raise ValueError(
+                        f"Invalid observation '{item}' on line {line_number} of '{self.ins_path}'."
+                    )
+                name, start, end = match.group(1), int(match.group(2)), int(match.group(3))
+                operation = FIXED_OBSERVATION if item[0] == '[' else SEMI_FIXED_OBSERVATION
+                # Columns as 0-based offsets in the line (end excluded)
+                operations.append((operation, (name, start - 1, end), line_number))
+                if name.lower() != DUMMY_OBSERVATION:
+                    self.obs_names.append(name)
+
+            else:
+                raise ValueError(
+                    f"Unsupported instruction '{item}' on line {line_number} of '{self.ins_path}'."
+                )
+
+    def run(self, text):
+        """
+        Executes the program over the content of a model output.
+
+        The output is kept as one string and the cursor is a position in it, so that
+        markers are searched with str.find() over the whole text and values are read
+        with regular expressions bounded to the current line.
+
+        Args:
+            text (str): The content of the model output.
+
+        Returns:
+            list of float: The observation values, in the order of ``obs_names``.
+        """
+        values = []
+        text_length = len(text)
+        next_line = 0  # start of the first line not read yet
+        line_start = line_end = cursor = 0
+
+        for operation, argument, line_number in self.operations:
+            if operation == LINE_ADVANCE:
+                for _ in range(argument):
+                    if next_line >= text_length:
+                        self._error(line_number, f"end of file while advancing {argument} lines")
+                    line_start = next_line
+                    line_end = text.find('\n', line_start)
+                    if line_end == -1:
+                        line_end = text_length
+                    next_line = line_end + 1
+                cursor = line_start
+
+            elif operation == PRIMARY_MARKER:
+                position = text.find(argument, next_line)
+                if position == -1:
+                    self._error(line_number, f"end of file while searching for primary marker '{argument}'")
+                line_start = text.rfind('\n', 0, position) + 1
+                line_end = text.find('\n', position)
+                if line_end == -1:
+                    line_end = text_length
+                next_line = line_end + 1
+                cursor = position + len(argument)
+
+            elif operation == SECONDARY_MARKER:
+                position = text.find(argument, cursor, line_end)
+                if position == -1:
+                    self._error(
+                        line_number,
+                        f"secondary marker '{argument}' not found on line: {text[line_start:line_end].rstrip()}"
+                    )
+                cursor = position + len(argument)
+
+            elif operation == WHITESPACE:
+                match = argument[1].match(text, cursor, line_end)
+                if match is None:
+                    self._error(
+                        line_number,
+                        f"no value after {argument[0]} 'w' on line: {text[line_start:line_end].rstrip()}"
+                    )
+                cursor = match.end()
+
+            elif operation == FIXED_OBSERVATION:
+                name, start, end = argument
+                field = text[line_start + start:min(line_start + end, line_end)]
+                cursor = min(line_start + end, line_end)
+                if name.lower() != DUMMY_OBSERVATION:
+                    values.append(self._to_float(field.strip(), name, line_number))
+
+            elif operation == SEMI_FIXED_OBSERVATION:
+                name, start, end = argument
+                # The blank-delimited value that overlaps the columns, which may extend
+                # beyond them on either side
+                first = line_start + start
+                last = min(line_start + end, line_end)
+                field_start = first
+                while field_start < last and text[field_start].isspace():
+                    field_start += 1
+                if field_start >= last:
+                    self._error(
+                        line_number,
+                        f"no value for observation '{name}' in columns {start + 1}:{end} "
+                        f"of line: {text[line_start:line_end].rstrip()}"
+                    )
+                while field_start > line_start and not text[field_start - 1].isspace():
+                    field_start -= 1
+                field_end = field_start
+                while field_end < line_end and not text[field_end].isspace():
+                    field_end += 1
+                cursor = field_end
+                if name.lower() != DUMMY_OBSERVATION:
+                    values.append(self._to_float(text[field_start:field_end], name, line_number))
+
+            else:
+                match = VALUE_RE.match(text, cursor, line_end)
+                if match is None:
+                    self._error(
+                        line_number,
+                        f"no value for observation '{argument}' on line: {text[line_start:line_end].rstrip()}"
+                    )
+                cursor = match.end()
+
+                if argument.lower() != DUMMY_OBSERVATION:
+                    try:
+                        values.append(float(match.group(1)))
+                    except ValueError:
+                        self._error(
+                            line_number,
+                            f"cannot read '{match.group(1)}' as the value of observation '{argument}'"
+                        )
+
+        return values
+
+    def _error(self, line_number, message):
+        raise ValueError(f"{self.ins_path}, instruction line {line_number}: {message}")
+
+    def _to_float(self, field, name, line_number):
+        try:
+            return float(field)
+        except ValueError:
+            self._error(line_number, f"cannot read '{field}' as the value of observation '{name}'")
+
+    def read(self, out_path):
+        """
+        Reads the simulated values of a model output file.
+
+        Args:
+            out_path (str): Path to the model output file (e.g. PlantGro.OUT).
+
+        Returns:
+            dict: Observation names mapped to their simulated values.
+        """
+        return dict(zip(self.obs_names, self.read_list(out_path)))
+
+    def read_array(self, out_path):
+        """
+        Reads the simulated values of a model output file as an array.
+
+        Args:
+            out_path (str): Path to the model output file.
+
+        Returns:
+            numpy.ndarray: float64 values, in the order of ``obs_names``.
+        """
+        return np.array(self.read_list(out_path), dtype=np.float64)
+
+    def read_list(self, out_path):
+        """
+        Reads the simulated values of a model output file as a list, in the order of
+        ``obs_names``.
+        """
+        with open(out_path, 'r') as out_file:
+            return self.run(out_file.read())
+
+
+# Compiled programs, by absolute path of the instruction file, in least recently used order
+INSTRUCTION_PROGRAMS = OrderedDict()
+INSTRUCTION_PROGRAM_MAX_ENTRIES = 64
+
+
+def compile_instructions(ins_path):
+    """
+    Returns the compiled program of an instruction file. Programs are kept in memory
+    and compiled again only when the instruction file changes.
+
+    Args:
+        ins_path (str): Path to the instruction file.
+
+    Returns:
+        InstructionProgram: The compiled program.
+    """
+    stat = os.stat(ins_path)
+    key = os.path.abspath(ins_path)
+    file_stat = (stat.st_size, stat.st_mtime_ns)
+
+    memo = INSTRUCTION_PROGRAMS.get(key)
+    if memo is not None and memo[0] == file_stat:
+        INSTRUCTION_PROGRAMS.move_to_end(key)
+        return memo[1]
+
+    program = InstructionProgram(ins_path)
+    INSTRUCTION_PROGRAMS[key] = (file_stat, program)
+    INSTRUCTION_PROGRAMS.move_to_end(key)
+    while len(INSTRUCTION_PROGRAMS) > INSTRUCTION_PROGRAM_MAX_ENTRIES:
+        INSTRUCTION_PROGRAMS.popitem(last=False)
+
+    return program
+
+
+def read(ins_path, out_path, as_array=False):
+    """
+    Executes a PEST instruction file against a model output file.
+
+    Args:
+        ins_path (str): Path to the instruction file (.INS).
+        out_path (str): Path to the model output file (e.g. PlantGro.OUT).
+        as_array (bool): If True, a float64 array in the order of the observations of
+            the instruction file is returned instead of a dictionary.
+
+    Returns:
+        dict or numpy.ndarray: Observation names mapped to their simulated values, or
+            the array of the values.
+    """
+    program = compile_instructions(ins_path)
+    if as_array:
+        return program.read_array(out_path)
+    return program.read(out_path)
@@ -12,7 +12,8 @@ def overview(
     overview_ins_first_line=None,
     mrk="~",
     smk="!",
-
+    observation_store=None,
+    name_allocator=None,
 ):
     """
     Creates a ``PEST instruction file (.INS)``. This instruction file contains
@@ -35,9 +36,15 @@ def overview(
           cultivar is being calibrated. This should match exactly the treatment
           name as shown in the DSSAT application interface when an experiment
           is selected. For example, ``"164.0 KG N/HA IRRIG"`` is a treatment of
-          the ``SWSW7501WH.WHX`` experiment.
+          the ``SWSW7501WH.WHX`` experiment. A list of treatment names writes a
+          single instruction file (``OVERVIEW.ins``) that reads all of them in
+          the order of their blocks in the file, each one starting from its
+          experiment, treatment and header anchors, so that PEST reads
+          ``OVERVIEW.OUT`` once per model run.
         * **overview_file_path** (*str*): Path to the ``OVERVIEW.OUT`` file to
           read. Usually the file is in ``C:\\DSSAT48\\Wheat\\OVERVIEW.OUT``.
+          An ``OutFileIndex`` of the file (``dpest.functions.OutFileIndex``)
+          can be passed instead of the path to reuse a single scan of the file.
 
     **Optional Arguments:**
     =======
@@ -65,7 +72,9 @@ def overview(
           ``OVERVIEW_TRT1.ins`` and variable markers will include the suffix
           (e.g., ``!Anthesis_DAP_TRT1!``). This ensures that PEST can
           distinguish between variables from different treatments, as PEST does
-          not allow variables with the same name.
+          not allow variables with the same name. With a list of treatments,
+          ``suffix`` is a list with one suffix per treatment; if not provided,
+          ``T<treatment number>`` is used (e.g. ``!Anthesis_DAP_T14!``).
 
         * **variables** (*list* or *str*): Variable(s) from the
           ``OVERVIEW.OUT`` file that PEST will extract in case the user does
@@ -99,6 +108,20 @@ def overview(
           A–Z, a–z, 0–9, ``[``, ``]``, ``(``, ``)``, ``:``, space, tab, or
           ``&``.
 
+        * **observation_store** (*ObservationStore*, *optional*): Store
+          (``dpest.functions.ObservationStore``) to which the measured values
+          are also added, keyed by experiment, treatment number and variable
+          (OVERVIEW observations have no date). The store can collect the
+          observations of several overview() and ts() calls and be passed to
+          pst().
+
+        * **name_allocator** (*ObservationNameAllocator*, *optional*):
+          Allocator (``dpest.functions.ObservationNameAllocator``) shared by all
+          the overview() and ts() calls of a calibration. The observation names
+          are reserved in it, and a name already used by another instruction
+          file gets a short suffix (``_A``, ``_B``, ...), so that the names are
+          unique across the PEST run. Pass the same allocator to pst().
+
     **Returns:**
     =======
 
@@ -151,10 +174,7 @@ def overview(
 
     """
     # Define YAML keys used in configuration files
-    yml_file_block = "OVERVIEW_FILE"
     yaml_file_variables = "INS_FILE_VARIABLES"
-    yaml_variables_classification = "VARIABLES_CLASSIFICATION"
-    MAX_VAR_LENGTH = 20  # In PEST, the variable names should not exceed 20 characters
 
     try:
         # Load package-level defaults from dpest/arguments.yml
@@ -172,6 +192,7 @@ def overview(
             raise ValueError(
                 "The 'treatment' argument is required and must be specified by the user."
             )
+        treatments, suffixes = validate_treatment_list(treatment, suffix)
 
         # Validate marker delimiters using the validate_marker() function
         mrk = validate_marker(mrk, "mrk")
@@ -197,152 +218,31 @@ def overview(
                 )
 
 
-        # Validate overview_file_path using the validate_file() function
-        validated_path = validate_file(overview_file_path, ".OUT")
-
-        # ------------------------------------------------------------------
-        # Resolve treatment block by experiment (same logic used in ts())
-        # ------------------------------------------------------------------
-
-        # Get treatment block ranges from the OVERVIEW.OUT file
-        treatment_dict = simulations_lines(validated_path)
-
-        # Resolve the correct block range and experiment code
-        (start_i, end_i), experiment_code = resolve_treatment_block_by_experiment(
-            file_path=validated_path,
-            treatment=treatment,
-            treatment_dict=treatment_dict,
-            experiment=experiment,
-        )
-
-        # Restrict downstream parsing to the selected block only
-        selected_treatment_dict = {treatment: (start_i, end_i)}
-
-        # Read and parse the overview file
-        overview_df, header_line, crop_model = extract_overview_data(
-            validated_path,
-            treatment_dict=selected_treatment_dict
-        )
-
-        # Load variables_classification:
-        #   - use user-provided dict if given;
-        #   - otherwise, obtain crop and model from the .OUT file, and load variables
-        #     classification from dpest/<crop>/<model>/arguments.yml
-        if variables_classification is None:
-
-            model = crop_model.split('-')[0].strip()[:5]
-            crop = crop_model.split('-')[1].strip().lower()
-
-            crop_model_arguments_file = get_crop_model_arguments_file_path(
-                crop=crop, model=model
+        # Validate overview_file_path and index its blocks in a single scan
+        validated_path, out_index = validate_out_file(overview_file_path)
+
+        # Observations and instruction lines of each treatment, in the order of their
+        # blocks in the file, so that PEST reads the file once from the top
+        treatment_instructions = order_treatment_instructions([
+            overview_treatment_instructions(
+                out_index=out_index,
+                treatment=treatment_name,
+                experiment=experiment,
+                suffix=treatment_suffix,
+                variables=variables,
+                variables_classification=variables_classification,
+                mrk=mrk,
+                smk=smk,
+                name_allocator=name_allocator,
             )
-            if not os.path.isfile(crop_model_arguments_file):
-                raise FileNotFoundError(
-                    f"YAML file not found for crop='{crop}' and model='{model}': "
-                    f"{crop_model_arguments_file}"
-                )
-
-            with open(crop_model_arguments_file, "r") as cm_yml:
-                crop_model_yaml_data = yaml.safe_load(cm_yml)
-
-            try:
-                variables_classification = crop_model_yaml_data[yml_file_block][
-                    yaml_variables_classification
-                ]
-            except KeyError as exc:
-                raise KeyError(
-                    "The crop/model configuration file does not define the "
-                    f"'{yml_file_block}.{yaml_variables_classification}' section "
-                    f"required by the overview() function."
-                ) from exc
-
-        # Filter the DataFrame for the specified treatment
-        filtered_df = overview_df.loc[
-            (overview_df["treatment"] == treatment)
-        ].copy()
-
-        if filtered_df.empty:
-            raise ValueError(
-                f"No data found for treatment '{treatment}'. "
-                "Please check if the treatment exists in the OVERVIEW.OUT file."
-            )
-
-        # Remove rows where 'value_measured' column contains NaN values
-        filtered_df = filtered_df.dropna(subset=["value_measured"])
-
-        # Filter variables if a list of variables was provided by the user
-        if variables is not None:
-            filtered_df = filtered_df[filtered_df["variable"].isin(variables)]
-
-        # Map variables to their respective groups
-        filtered_df["group"] = filtered_df["variable"].map(variables_classification)
-
-        # Validate that all selected variables were assigned to a group
-        missing_group_rows = filtered_df[filtered_df["group"].isna()].copy()
-
-        if not missing_group_rows.empty:
-            missing_variables = sorted(missing_group_rows["variable"].dropna().unique())
-
-            raise ValueError(
-                "The following selected OVERVIEW observations were not assigned to any group in "
-                "'variables_classification':\n"
-                f"  {missing_variables}\n\n"
-                "Please update the 'variables_classification' dictionary to include them."
-            )
-
-        # Adjust the 'position' column to create 'position_adjusted'
-        filtered_df["position_adjusted"] = (
-            filtered_df["position"] - filtered_df["position"].shift(1)
-        )
-
-        # Ensure the first row retains its original position
-        filtered_df.loc[
-            filtered_df.index[0], "position_adjusted"
-        ] = filtered_df.loc[filtered_df.index[0], "position"]
-
-        # Transform the variable names to fit the max 20 characters required by PEST
-        filtered_df = process_variable_names(filtered_df)
-
-        # Validate suffix if provided
-        if suffix is not None:
-            if not isinstance(suffix, str):
-                raise ValueError("Suffix must be a string.")
-            if not suffix.isalnum():
-                raise ValueError("Suffix must only contain letters and numbers.")
-            if len(suffix) > 4:
-                raise ValueError("Suffix must be at most 4 characters long.")
-            suffix = "_" + suffix  # only add underscore *after* validation
-
-            # Create a dictionary to add the treatment suffix
-            replace_dict = add_suffix_to_variables(
-                filtered_df["variable_name"], suffix, MAX_VAR_LENGTH
-            )
-            filtered_df["variable_name"] = filtered_df["variable_name"].map(
-                replace_dict
-            )
-
-        # Generate the .ins file content
-        output_text = ""
-        for _, row in filtered_df.iterrows():
-            output_text += (
-                f"l{row['position_adjusted']} "
-                f"{mrk}{row['variable']}{mrk} "
-                f"{smk}{row['variable_name']}{smk}\n"
-            )
-
-        # Combine the content into the full .ins file structure
-        ins_file_content = (
-            f"{overview_ins_first_line} {mrk}\n"
-            f"{mrk}{experiment_code}{mrk}\n"
-            f"{mrk}{treatment}{mrk}\n"
-            f"{mrk}{header_line[1:].strip()}{mrk}\n"
-            f"{output_text}"
-        )
+            for treatment_name, treatment_suffix in zip(treatments, suffixes)
+        ])
 
         # Validate output_path
         output_path = validate_output_path(output_path)
 
-        # Determine and validate output_filename
+        # Determine and validate output_filename (a file with several treatments has no suffix)
+        suffix = treatment_instructions[0]["suffix"] if isinstance(treatment, str) else None
         if suffix:
             output_filename = os.path.basename(validated_path).replace(
                 ".OUT", f"{suffix}.ins"
@@ -355,14 +255,40 @@ def overview(
         # Create the path and file name for the new file
         output_new_file_path = os.path.join(output_path, output_filename)
 
-        # Write the generated content to the .ins file
-        with open(output_new_file_path, "w") as ins_file:
-            ins_file.write(ins_file_content)
+        # Write the .ins file, streaming one instruction line per observation. Each
+        # treatment starts with its experiment, treatment and header anchors
+        with InsWriter(
+            output_new_file_path, overview_ins_first_line, mrk, treatment_instructions[0]["anchors"]
+        ) as ins_writer:
+            for position, instructions in enumerate(treatment_instructions):
+                if position > 0:
+                    ins_writer.write_anchors(instructions["anchors"])
+                ins_writer.writelines(instructions["lines"])
 
         print(f"OVERVIEW.INS file generated and saved to: {output_new_file_path}")
 
+        # Add the observations to the store, if one was given
+        if observation_store is not None:
+            for instructions in treatment_instructions:
+                observations_df = instructions["observations"]
+                observation_store.add(
+                    experiment=instructions["experiment"],
+                    trno=instructions["trno"],
+                    variables=observations_df["variable"],
+                    dates=None,
+                    values=observations_df["value_measured"],
+                    variable_names=observations_df["variable_name"],
+                    groups=observations_df["group"],
+                )
+
         # Remove non-useful columns from the dataframe to export
-        ouput_overview_df = filtered_df[["variable_name", "value_measured", "group"]]
+        if len(treatment_instructions) == 1:
+            observations_df = treatment_instructions[0]["observations"]
+        else:
+            observations_df = pd.concat(
+                [instructions["observations"] for instructions in treatment_instructions], ignore_index=True
+            )
+        ouput_overview_df = observations_df[["variable_name", "value_measured", "group"]]
         return ouput_overview_df, output_new_file_path
 
     except ValueError as ve:
@@ -370,4 +296,170 @@ def overview(
     except FileNotFoundError as fe:
         print(f"FileNotFoundError: {fe}")
     except Exception as e:
-        print(f"An unexpected error occurred: {e}")
\ No newline at end of file
+        print(f"An unexpected error occurred: {e}")
+
+
+def overview_treatment_instructions(
+    out_index,
+    treatment,
+    experiment,
+    suffix,
+    variables,
+    variables_classification,
+    mrk,
+    smk,
+    name_allocator,
+):
+    """
+    Gets the measured observations of one treatment of the OVERVIEW.OUT file and the
+    instruction lines that read their simulated values (see overview()).
+
+    Returns:
+        dict: 'observations' (DataFrame with the columns variable, variable_name,
+            value_measured and group), 'anchors' (primary-marker anchors of the treatment
+            block), 'lines' (iterator of instruction lines), 'start_line' (first line of
+            the block), 'experiment', 'trno' and 'suffix'.
+    """
+    # Define YAML keys used in configuration files
+    yml_file_block = "OVERVIEW_FILE"
+    yaml_variables_classification = "VARIABLES_CLASSIFICATION"
+    MAX_VAR_LENGTH = 20  # In PEST, the variable names should not exceed 20 characters
+
+    # ------------------------------------------------------------------
+    # Resolve treatment block by experiment (same logic used in ts())
+    # ------------------------------------------------------------------
+
+    # Get treatment block ranges from the OVERVIEW.OUT file
+    treatment_dict = out_index.treatment_dict()
+
+    # Resolve the correct block range and experiment code
+    (start_i, end_i), experiment_code = resolve_treatment_block_by_experiment(
+        file_path=out_index,
+        treatment=treatment,
+        treatment_dict=treatment_dict,
+        experiment=experiment,
+    )
+
+    # Restrict downstream parsing to the selected block only
+    selected_treatment_dict = {treatment: (start_i, end_i)}
+
+    # Read and parse the overview file
+    overview_df, header_line, crop_model = extract_overview_data(
+        out_index,
+        treatment_dict=selected_treatment_dict
+    )
+
+    # Load variables_classification:
+    #   - use user-provided dict if given;
+    #   - otherwise, obtain crop and model from the .OUT file, and load variables
+    #     classification from dpest/<crop>/<model>/arguments.yml
+    if variables_classification is None:
+
+        model = crop_model.split('-')[0].strip()[:5]
+        crop = crop_model.split('-')[1].strip().lower()
+
+        crop_model_arguments_file = get_crop_model_arguments_file_path(
+            crop=crop, model=model
+        )
+        if not os.path.isfile(crop_model_arguments_file):
+            raise FileNotFoundError(
+                f"YAML file not found for crop='{crop}' and model='{model}': "
+                f"{crop_model_arguments_file}"
+            )
+
+        with open(crop_model_arguments_file, "r") as cm_yml:
+            crop_model_yaml_data = yaml.safe_load(cm_yml)
+
+        try:
+            variables_classification = crop_model_yaml_data[yml_file_block][
+                yaml_variables_classification
+            ]
+        except KeyError as exc:
+            raise KeyError(
+                "The crop/model configuration file does not define the "
+                f"'{yml_file_block}.{yaml_variables_classification}' section "
+                f"required by the overview() function."
+            ) from exc
+
+    # Filter the DataFrame for the specified treatment
+    filtered_df = overview_df.loc[
+        (overview_df["treatment"] == treatment)
+    ].copy()
+
+    if filtered_df.empty:
+        raise ValueError(
+            f"No data found for treatment '{treatment}'. "
+            "Please check if the treatment exists in the OVERVIEW.OUT file."
+        )
+
+    # Remove rows where 'value_measured' column contains NaN values
+    filtered_df = filtered_df.dropna(subset=["value_measured"])
+
+    # Filter variables if a list of variables was provided by the user
+    if variables is not None:
+        filtered_df = filtered_df[filtered_df["variable"].isin(variables)]
+
+    # Map variables to their respective groups
+    filtered_df["group"] = filtered_df["variable"].map(variables_classification)
+
+    # Validate that all selected variables were assigned to a group
+    missing_group_rows = filtered_df[filtered_df["group"].isna()].copy()
+
+    if not missing_group_rows.empty:
+        missing_variables = sorted(missing_group_rows["variable"].dropna().unique())
+
+        raise ValueError(
+            "The following selected OVERVIEW observations were not assigned to any group in "
+            "'variables_classification':\n"
+            f"  {missing_variables}\n\n"
+            "Please update the 'variables_classification' dictionary to include them."
+        )
+
+    # Adjust the 'position' column to create 'position_adjusted' (lines from the previous
+    # observation; the first row retains its original position)
+    filtered_df["position_adjusted"] = (
+        filtered_df["position"] - filtered_df["position"].shift(1, fill_value=0)
+    )
+
+    # Transform the variable names to fit the max 20 characters required by PEST
+    filtered_df = process_variable_names(filtered_df)
+
+    # Validate suffix if provided
+    trno = out_index.block_at(start_i)["trno"]
+    if suffix is not None:
+        if not isinstance(suffix, str):
+            raise ValueError("Suffix must be a string.")
+        if suffix == DEFAULT_TREATMENT_SUFFIX:
+            suffix = suffix.format(trno=trno)
+        if not suffix.isalnum():
+            raise ValueError("Suffix must only contain letters and numbers.")
+        if len(suffix) > 4:
+            raise ValueError("Suffix must be at most 4 characters long.")
+        suffix = "_" + suffix  # only add underscore *after* validation
+
+        # Create a dictionary to add the treatment suffix
+        replace_dict = add_suffix_to_variables(
+            filtered_df["variable_name"], suffix, MAX_VAR_LENGTH
+        )
+        filtered_df["variable_name"] = filtered_df["variable_name"].map(
+            replace_dict
+        )
+
+    # Reserve the names in the allocator shared by the instruction files of the PEST run
+    if name_allocator is not None:
+        filtered_df["variable_name"] = name_allocator.allocate_many(filtered_df["variable_name"])
+
+    return {
+        "observations": filtered_df,
+        "anchors": [experiment_code, treatment, header_line[1:].strip()],
+        # One instruction line per observation, formatted column-wise
+        "lines": (
+            "l" + filtered_df["position_adjusted"].astype(str)
+            + f" {mrk}" + filtered_df["variable"] + f"{mrk} {smk}"
+            + filtered_df["variable_name"] + smk
+        ).tolist(),
+        "start_line": start_i,
+        "experiment": experiment_code,
+        "trno": trno,
+        "suffix": suffix,
+    }
@@ -12,7 +12,8 @@ def pst(
         model_comand_line=None,
         noptmax=1000,
         pst_filename='PEST_CONTROL.pst',
-        input_output_file_pairs=None
+        input_output_file_pairs=None,
+        name_allocator=None
 ):
 
     """
@@ -60,7 +61,7 @@ def pst(
     **Required Arguments:**
     =======
 
-        * **dataframe_observations** (``pd.DataFrame`` or ``list``):
+        * **dataframe_observations** (``pd.DataFrame``, ``ObservationStore`` or ``list``):
           A DataFrame or list of DataFrames containing observations to be used in
           calibration and written to the ``* observation data`` section of the
           PEST control file.
@@ -82,6 +83,10 @@ def pst(
           Observation DataFrames can be created using modules such as
           ``overview`` and ``plantgro``.
 
+          An ``ObservationStore`` (``dpest.functions.ObservationStore``) filled
+          by ``ts``, ``ts_batch`` or ``overview`` (argument
+          ``observation_store``) can be supplied in place of any DataFrame.
+
         * **model_comand_line** (*str*):
           Command line used by PEST to execute the DSSAT model. The command must
           generate all model output files referenced by the instruction-file
@@ -135,6 +140,15 @@ def pst(
         * **pst_filename** (*str*, *default: ``"PEST_CONTROL.pst"``*):
           File name assigned to the generated PEST control file.
 
+        * **name_allocator** (*ObservationNameAllocator*, *optional*):
+          The allocator (``dpest.functions.ObservationNameAllocator``) passed to
+          the ``ts``, ``ts_batch`` and ``overview`` calls that created the
+          observations. Observations not named by it are reported, as their
+          names may collide with those of other instruction files.
+
+          Observation names must be unique across all the DataFrames (without
+          regard to case, as in PEST); repeated names are reported in any case.
+
     **Returns:**
     =======
 
@@ -299,9 +313,16 @@ def pst(
             raise ValueError("`dataframe_observations` must be provided.")
 
         # Convert single dataframe to list for consistent processing
-        if isinstance(dataframe_observations, pd.DataFrame):
+        if isinstance(dataframe_observations, (pd.DataFrame, ObservationStore)):
             dataframe_observations = [dataframe_observations]
 
+        # Observation stores are converted to the DataFrame format returned by ts() and overview()
+        if isinstance(dataframe_observations, list):
+            dataframe_observations = [
+                df.observation_frame() if isinstance(df, ObservationStore) else df
+                for df in dataframe_observations
+            ]
+
         if not isinstance(dataframe_observations, list) or not all(
                 isinstance(df, pd.DataFrame) for df in dataframe_observations):
             raise ValueError("`dataframe_observations` must be a DataFrame or a list of DataFrames.")
@@ -312,6 +333,21 @@ def pst(
                 raise ValueError(
                     "Each DataFrame in `dataframe_observations` must contain 'variable_name', 'value_measured', and 'group' columns.")
 
+        # Observation names must be unique across all the instruction files (PEST compares
+        # them without regard to case)
+        observation_names = pd.concat(
+            [df['variable_name'] for df in dataframe_observations], ignore_index=True
+        ).astype(str)
+        duplicated_names = sorted(observation_names[observation_names.str.lower().duplicated()].unique())
+        if duplicated_names:
+            raise ValueError(
+                f"The following observation names are repeated in `dataframe_observations`: {duplicated_names}\n"
+                "Use a different suffix for each treatment, or pass one ObservationNameAllocator "
+                "('name_allocator') to every ts(), ts_batch() and overview() call."
+            )
+        if name_allocator is not None:
+            name_allocator.check(observation_names)
+
         # Get Parameter Group Variables
         observation_groups = yaml_data[yml_pst_file_block][yml_file_observation_groups]
 
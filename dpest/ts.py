@@ -13,6 +13,9 @@ def ts(
     mrk = '~',
     smk = '!',
     drop_missing_simulated=False,
+    observation_store=None,
+    ins_style="whitespace",
+    name_allocator=None,
 ):
 
     """
@@ -49,6 +52,11 @@ def ts(
         - ``C:/DSSAT48/Soybean/SoilNi.OUT``
         - ``C:/DSSAT48/Soybean/SoilWat.OUT``
 
+        An ``OutFileIndex`` of the file (``dpest.functions.OutFileIndex``) can
+        be passed instead of the path. The index is built in a single scan of
+        the file and can be reused across calls, so that the file is not
+        scanned again for each treatment or set of variables.
+
     * **treatment** (*str*):
         Name of the treatment for which the cultivar is being calibrated.
         This must match exactly the treatment name as shown in the DSSAT
@@ -57,6 +65,12 @@ def ts(
 
         Example: ``"164.0 KG N/HA IRRIG"`` or ``"76 Equidist BRAGG"``.
 
+        A list of treatment names writes a single instruction file for all of
+        them (e.g. ``PlantGro.ins``). The treatments are read in the order of
+        their blocks in the output file, each one starting from its
+        experiment, treatment and header anchors, so that PEST reads the
+        output file once per model run instead of once per treatment.
+
     * **variables** (*list* or *str*):
         Variable code(s) from the DSSAT T file (and thus present in the header
         of the selected time-series output file) that PEST will extract. The
@@ -94,6 +108,10 @@ def ts(
         file will be named ``PlantGro_TRT1.ins`` and markers will look like
         ``!LAID_75167_TRT1!``.
 
+        With a list of treatments, ``suffix`` is a list with one suffix per
+        treatment. If not provided, ``T<treatment number>`` is used (e.g.
+        ``!LAID_75167_T14!``).
+
     * **variables_classification** (*dict*, *optional*):
         Mapping of variable codes to their respective categories (groups).
         When provided, this dictionary is used directly, with the format::
@@ -133,6 +151,31 @@ def ts(
         This provides an alternative to extending the simulation output using
         ``uts()``.
 
+    * **observation_store** (*ObservationStore*, *optional*):
+        Store (``dpest.functions.ObservationStore``) to which the measured
+        observations are also added, keyed by experiment, treatment number,
+        variable and date. Observations of several ts() and overview() calls can
+        be collected in one store and passed to pst().
+
+    * **name_allocator** (*ObservationNameAllocator*, *optional*):
+        Allocator (``dpest.functions.ObservationNameAllocator``) shared by all
+        the ts() and overview() calls of a calibration. Each observation name
+        is reserved in it, and a name already used by another instruction file
+        gets a short suffix (``_A``, ``_B``, ...), so that the names are unique
+        across the PEST run. Pass the same allocator to pst() to check it.
+
+    * **ins_style** (*str*, *default: "whitespace"*):
+        How the instruction file addresses each value on its line.
+
+        - ``"whitespace"`` (default): the value is reached by skipping
+          blank-delimited fields with ``w`` instructions, e.g.
+          ``l23 w w w w w w w w w w w w !LAID_75167!``.
+        - ``"columns"``: the value is read from the character columns of its
+          variable, taken from the fixed-width header of the file, e.g.
+          ``l23 [LAID_75167]64:69``. PEST reads these fixed observations
+          without scanning the fields before them, which is faster on wide
+          files such as ``PlantGro.OUT``.
+
     **Internal behaviour**
     ======================
 
@@ -215,313 +258,754 @@ def ts(
        ``SoilWat.OUT`` and builds a PEST instruction file for those variables.
     """
 
-    # Define default variables:
-    yaml_file_variables = 'INS_FILE_VARIABLES'
-    yaml_variables_classification = 'VARIABLES_CLASSIFICATION_GLOBAL'
-    yaml_sim_models_key = 'SIMULATION_CROP_MODELS'
-    MAX_VAR_LENGTH = 20  # In PEST, the variable names should not exceed 20 characters
-
     try:
-        ## Get the yaml_data
-        # Get the directory of the current script
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        # Construct the path to arguments.yml
-        arguments_file = os.path.join(current_dir, 'arguments.yml')
-        # Ensure the YAML file exists
-        if not os.path.isfile(arguments_file):
-            raise FileNotFoundError(f"YAML file not found: {arguments_file}")
-        # Load YAML configuration
-        with open(arguments_file, 'r') as yml_file:
-            yaml_data = yaml.safe_load(yml_file)
-
-        # Validate treatment
-        if not treatment or not isinstance(treatment, str):
-            raise ValueError("The 'treatment' must be a non-empty string.")
-
-        # Convert 'variables' to a list if it's not already a list
-        if not isinstance(variables, list):
-            variables = [variables]
-
-        # Validate that 'variables' is a non-empty list of strings
-        if not variables or not all(isinstance(var, str) for var in variables):
-            raise ValueError(
-                "The 'variables' should be a non-empty string or a list of strings. For example: 'LAID' or ['LAID', 'CWAD']")
+        # Load the default arguments from arguments.yml
+        yaml_data = load_ts_arguments()
 
-        # Validate yaml_data
-        if yaml_data is None:
-            raise ValueError("The 'yaml_data' argument is required and must be specified by the user.")
+        return build_ts_instructions(
+            yaml_data=yaml_data,
+            ts_file_path=ts_file_path,
+            treatment=treatment,
+            variables=variables,
+            output_path=output_path,
+            experiment=experiment,
+            suffix=suffix,
+            variables_classification=variables_classification,
+            ts_ins_first_line=ts_ins_first_line,
+            mrk=mrk,
+            smk=smk,
+            drop_missing_simulated=drop_missing_simulated,
+            observation_store=observation_store,
+            ins_style=ins_style,
+            name_allocator=name_allocator,
+        )
 
-        # Validate marker delimiters using the validate_marker() function
-        mrk = validate_marker(mrk, "mrk")
-        smk = validate_marker(smk, "smk")
-        # Ensure mrk and smk are different
-        if mrk == smk:
-            raise ValueError("mrk and smk must be different characters.")
+    except ValueError as ve:
+        print(f"ValueError: {ve}")
+    except FileNotFoundError as fe:
+        print(f"FileNotFoundError: {fe}")
+    except Exception as e:
+        print(f"An unexpected error occurred: {e}")
 
-        # Validate variables_classification
-        if variables_classification is None:
-            variables_classification = yaml_data[yaml_variables_classification]
 
-        if ts_ins_first_line is None:
-            # Load default arguments from the YAML file if not provided
-            function_arguments = yaml_data[yaml_file_variables]
-            ts_ins_first_line = function_arguments['first_line']
+def ts_batch(
+    ts_file_paths = None,
+    treatments = "all",
+    variables = None,
+    output_path = None,
+    experiment = None,
+    suffix_scheme = None,
+    variables_classification = None,
+    ts_ins_first_line = None,
+    mrk = '~',
+    smk = '!',
+    drop_missing_simulated=False,
+    observation_store=None,
+    ins_style="whitespace",
+    name_allocator=None,
+):
 
-        # Validate ts_file_path
-        validated_path = validate_file(ts_file_path, '.OUT')
+    """
+    Runs ts() for several treatments and several DSSAT **time-series** output
+    files in one call. Each ``.OUT`` file is indexed once, ``arguments.yml`` is
+    loaded once and each T file is parsed once; every treatment then reuses them.
+    One ``PEST instruction file (.INS)`` is written per treatment and file, and
+    the observations of all of them are returned in a single DataFrame.
 
-        # Get treatment number
-        treatment_dict = simulations_lines(validated_path)
+    **Required Arguments**
+    ======================
 
-        # Resolve the correct DSSAT block when the same treatment appears in multiple experiments
-        selected_block, resolved_experiment_code = resolve_treatment_block_by_experiment(
-            file_path=validated_path,
-            treatment=treatment,
-            treatment_dict=treatment_dict,
-            experiment=experiment
-        )
+    * **ts_file_paths** (*str*, *OutFileIndex* or *list*):
+      Paths to the DSSAT time-series output files (e.g. ``PlantGro.OUT``,
+      ``PlantN.OUT``), or prebuilt ``OutFileIndex`` objects of those files.
 
-        # Use only the selected block from here on to avoid using the wrong duplicated treatment
-        selected_treatment_dict = {treatment: selected_block}
+    * **variables** (*str* or *list[str]*):
+      Variables to extract from every file, as in ts().
 
-        # Get dictionaries with treatment name, treatement number, treatment and experiment code
-        treatment_number_name, treatment_experiment_name, treatment_crop_name = \
-            extract_treatment_info_plantgrowth(validated_path, selected_treatment_dict)
+    **Optional Arguments**
+    ======================
 
-        crop_name_from_header = treatment_crop_name.get(treatment)
-        if crop_name_from_header is None:
-            raise ValueError(f"Could not determine crop name for treatment '{treatment}'.")
+    * **treatments** (*str* or *list[str]*, *default: "all"*):
+      Treatment names to process. With ``"all"``, every treatment of each file
+      is used and treatments without measured values of ``variables`` in the T
+      file are skipped.
+
+    * **suffix_scheme** (*str*, *default: None*):
+      Template of the suffix added to the observation names and to the ``.INS``
+      file name of each treatment. ``{trno}`` is replaced by the treatment
+      number, ``{exp}`` by the number of the experiment in the file (1 for the
+      first experiment of the file, 2 for the second, ...) and ``{experiment}``
+      by the experiment code. The resulting suffix follows the rules of the
+      ``suffix`` argument of ts() (letters and numbers only, at most 4
+      characters). By default, ``"T{trno}"`` is used for files with one
+      experiment and ``"{exp}T{trno}"`` (e.g. ``2T14``) for files with more
+      than one experiment, so that every treatment gets its own ``.INS`` file.
+      The ``.INS`` file of every treatment is checked to be unique before any
+      file is written.
+
+    * **experiment** (*str*, *default: None*):
+      Experiment code. It selects the block of treatments that appear in more
+      than one experiment and, with ``treatments="all"``, limits the treatments
+      to that experiment.
+
+    * The remaining arguments (``output_path``, ``variables_classification``,
+      ``ts_ins_first_line``, ``mrk``, ``smk``, ``drop_missing_simulated``,
+      ``observation_store``, ``ins_style`` and ``name_allocator``) are passed to
+      every ts() call.
 
-        # Load simulation crop/model mappings
-        sim_models = yaml_data.get(yaml_sim_models_key, {})
+    **Returns**
+    ===========
 
-        # Find the crop entry whose alias list (lower-cased) contains crop_name_from_header
-        crop_code = None
-        for crop_key, crop_info in sim_models.items():
-            aliases = [a.lower() for a in crop_info.get('crop_aliases', [])]
-            if crop_name_from_header.lower() in aliases:
-                crop_code = aliases[1] if len(aliases) > 1 else aliases[0]
-                break
+    * *tuple*:
 
-        if crop_code is None:
-            raise ValueError(
-                f"Could not infer crop code from crop name '{crop_name_from_header}'. "
-                "Check SIMULATION_CROP_MODELS in arguments.yml."
-            )
+        * *pandas.DataFrame*:
+            The observations of all treatments and files, with the columns
+            ``variable_name``, ``value_measured`` and ``group``.
 
-        # Use the resolved experiment code from the selected block
-        experiment_code = resolved_experiment_code
-        if experiment_code is None:
-            raise ValueError(f"Could not determine experiment code for treatment '{treatment}'.")
-
-        # Build T-file name: <EXPCODE><CROPCODE>T, e.g. SWSW7501 + WH + T -> SWSW7501WHT
-        t_file_name = f"{experiment_code}.{crop_code.upper()}T"
-        t_file_path = os.path.join(os.path.dirname(validated_path), t_file_name)
-
-        # Get the dataframe from the T file data
-        t_df = wht_filedata_to_dataframe(t_file_path)
-
-        # Load and filter data for all variables
-        dates_variable_values_dict = filter_dataframe(t_df, treatment, treatment_number_name, variables)
-
-        # Check if the filter_dataframe returned an empty dictionary (indicating an error)
-        if not dates_variable_values_dict:
-            raise ValueError(f"No valid data found for treatment '{treatment}' with variables {variables}")
-
-        #`````````````````` Old version that does not include the option "drop_missing_simulated=False," that
-        # # Get the header and first simulation date
-        # header_line, first_sim_line, date_first_sim = get_header_and_first_sim(
-        #     validated_path,
-        #     treatment,
-        #     treatment_dict=selected_treatment_dict
-        # )
-        #
-        # # Calculate days dictionary days after first simulation
-        # days_dict = calculate_days_dict(dates_variable_values_dict, date_first_sim)
-
-        #`````````````````` / Old version that does not include the option "drop_missing_simulated=False," that
-
-
-        #`````````````````` New version to include the function argument "drop_missing_simulated=False," that
-        # Get header, first simulated date, and last simulated date
-        # This defines the valid simulation window for the selected treatment
-        header_line, first_sim_line, date_first_sim, date_last_sim = get_header_first_and_last_sim(
-            validated_path,
-            treatment,
-            treatment_dict=selected_treatment_dict
-        )
+        * *list of tuple*:
+            ``(ins_file_path, out_file_path)`` pairs, one per generated
+            ``.INS`` file, in the format of ``input_output_file_pairs`` of pst().
 
-        # Split measured observations into:
-        # - those inside the simulation window (kept)
-        # - those beyond the last simulated date (dropped)
-        kept_dates_dict, dropped_dates_dict = filter_dates_to_simulation_window(
-            dates_variable_values_dict,
-            date_first_sim,
-            date_last_sim
-        )
+    **Examples**
+    ============
 
-        # If any measured observations are beyond the simulation period, handle them
-        if dropped_dates_dict:
+    1. **All treatments of PlantGro.OUT and PlantN.OUT (Wheat)**
 
-            # Format last simulated date as YYYYDOY for reporting
-            last_sim_yyyydoy = f"{date_last_sim.year}{date_last_sim.timetuple().tm_yday:03d}"
+       .. code-block:: python
 
-            # List of dropped measured dates (sorted for readability)
-            dropped_dates = sorted(dropped_dates_dict.keys())
+          from dpest import ts_batch
 
-            # Default behavior: stop execution and inform the user
-            if not drop_missing_simulated:
+          observations, ins_file_pairs = ts_batch(
+              ts_file_paths=['C:/DSSAT48/Wheat/PlantGro.OUT',
+                             'C:/DSSAT48/Wheat/PlantN.OUT'],
+              variables=['LAID', 'CWAD', 'T#AD', 'GN%D'],
+              drop_missing_simulated=True,
+          )
+
+       This writes ``PlantGro_T1.ins``, ``PlantGro_T2.ins``, ...,
+       ``PlantN_T1.ins``, ... and returns their observations and file pairs,
+       ready to be passed to pst().
+    """
+
+    try:
+        # Load the default arguments from arguments.yml once for all treatments
+        yaml_data = load_ts_arguments()
+
+        # Validate ts_file_paths
+        if isinstance(ts_file_paths, (str, OutFileIndex)):
+            ts_file_paths = [ts_file_paths]
+        if not ts_file_paths or not isinstance(ts_file_paths, (list, tuple)):
+            raise ValueError("The 'ts_file_paths' must be a path or a non-empty list of paths.")
+
+        # Validate treatments
+        if treatments != "all":
+            if isinstance(treatments, str):
+                treatments = [treatments]
+            if not treatments or not all(isinstance(treatment, str) and treatment for treatment in treatments):
+                raise ValueError("The 'treatments' must be 'all' or a non-empty list of treatment names.")
+
+        # Validate suffix_scheme
+        if suffix_scheme is not None:
+            if not isinstance(suffix_scheme, str) or '{trno}' not in suffix_scheme:
+                raise ValueError("The 'suffix_scheme' must be a string containing '{trno}', e.g. 'T{trno}'.")
+            try:
+                suffix_scheme.format(trno=1, exp=1, experiment='')
+            except (KeyError, IndexError, ValueError):
                 raise ValueError(
-                    f"Some measured observations occur after the last simulated date for "
-                    f"treatment '{treatment}' in experiment '{experiment_code}'.\n"
-                    f"Last simulated YEAR/DOY: {last_sim_yyyydoy}\n"
-                    f"Dropped candidate dates: {dropped_dates}\n\n"
-                    f"Re-run ts(..., drop_missing_simulated=True) to keep only observations "
-                    f"up to the last simulated date, or use uts() if you intentionally want "
-                    f"to extend the .OUT file with artificial rows."
+                    "The 'suffix_scheme' can only contain the placeholders '{trno}', '{exp}' and '{experiment}'."
                 )
 
-            # Optional behavior: continue but warn the user that some observations were ignored
-            print(
-                f"Warning: {len(dropped_dates_dict)} measured date(s) were ignored because "
-                f"they occur after the last simulated YEAR/DOY ({last_sim_yyyydoy}) "
-                f"for treatment '{treatment}' in experiment '{experiment_code}'.\n"
-                f"Dropped dates: {dropped_dates}"
+        output_path = validate_output_path(output_path)
+
+        # Plan the treatments of every file, and their .INS files, before writing anything
+        planned_treatments = []
+        ins_file_treatments = {}
+
+        for ts_file_path in ts_file_paths:
+            # Index the file once; every treatment below reuses the index
+            validated_path, out_index = validate_out_file(ts_file_path)
+
+            # Get (treatment, experiment code, treatment number) of the selected blocks
+            if treatments == "all":
+                selected_treatments = [
+                    (block['treatment'], block['experiment'], block['trno'])
+                    for block in out_index.blocks
+                    if block['treatment'] and (experiment is None or block['experiment'] == experiment)
+                ]
+                if not selected_treatments:
+                    raise ValueError(f"No treatments found in: {validated_path}")
+            else:
+                treatment_dict = out_index.treatment_dict()
+                selected_treatments = []
+                for treatment in treatments:
+                    (start_line, end_line), experiment_code = resolve_treatment_block_by_experiment(
+                        file_path=out_index,
+                        treatment=treatment,
+                        treatment_dict=treatment_dict,
+                        experiment=experiment
+                    )
+                    selected_treatments.append(
+                        (treatment, experiment_code, out_index.block_at(start_line)['trno'])
+                    )
+
+            # Number of each experiment in the file, in the order of its blocks
+            experiment_numbers = {}
+            for block in out_index.blocks:
+                experiment_numbers.setdefault(block['experiment'], len(experiment_numbers) + 1)
+
+            # Treatments of different experiments can share their numbers
+            file_suffix_scheme = suffix_scheme
+            if file_suffix_scheme is None:
+                selected_experiments = {experiment_code for _, experiment_code, _ in selected_treatments}
+                file_suffix_scheme = "T{trno}" if len(selected_experiments) == 1 else "{exp}T{trno}"
+
+            for treatment, experiment_code, trno in selected_treatments:
+                suffix = file_suffix_scheme.format(
+                    trno=trno, exp=experiment_numbers[experiment_code], experiment=experiment_code
+                )
+                if not suffix.isalnum():
+                    raise ValueError(f"Suffix '{suffix}' of treatment '{treatment}' must only contain letters and numbers.")
+                if len(suffix) > 4:
+                    raise ValueError(f"Suffix '{suffix}' of treatment '{treatment}' must be at most 4 characters long.")
+
+                ins_file_path = os.path.join(output_path, ts_ins_file_name(validated_path, f"_{suffix}"))
+                ins_file_key = os.path.normcase(os.path.abspath(ins_file_path))
+                if ins_file_key in ins_file_treatments:
+                    raise ValueError(
+                        f"Treatments '{ins_file_treatments[ins_file_key]}' and '{treatment}' ({experiment_code}) "
+                        f"would be written to the same instruction file: {ins_file_path}\n"
+                        "Use the 'experiment' argument or a 'suffix_scheme' that separates them, "
+                        "e.g. '{exp}T{trno}'."
+                    )
+                ins_file_treatments[ins_file_key] = treatment
+                planned_treatments.append((validated_path, out_index, treatment, experiment_code, suffix))
+
+        observation_frames = []
+        ins_file_pairs = []
+
+        for validated_path, out_index, treatment, experiment_code, suffix in planned_treatments:
+            result = build_ts_instructions(
+                yaml_data=yaml_data,
+                ts_file_path=out_index,
+                treatment=treatment,
+                variables=variables,
+                output_path=output_path,
+                experiment=experiment_code,
+                suffix=suffix,
+                variables_classification=variables_classification,
+                ts_ins_first_line=ts_ins_first_line,
+                mrk=mrk,
+                smk=smk,
+                drop_missing_simulated=drop_missing_simulated,
+                skip_unobserved=treatments == "all",
+                observation_store=observation_store,
+                ins_style=ins_style,
+                name_allocator=name_allocator,
             )
 
-        # Replace original dictionary with only valid (kept) observations
-        dates_variable_values_dict = kept_dates_dict
+            if result is None:
+                print(f"Treatment '{treatment}' has no measured values of {variables} and was skipped.")
+                continue
+
+            observations_df, ins_file_path = result
+            observation_frames.append(observations_df)
+            ins_file_pairs.append((ins_file_path, validated_path))
+
+        if not observation_frames:
+            raise ValueError(f"No measured values found for variables {variables} in any treatment.")
+
+        # Observation names must be unique across treatments and files
+        observations = pd.concat(observation_frames, ignore_index=True)
 
-        # Safety check: ensure at least one observation remains after filtering
-        if not dates_variable_values_dict:
+        duplicated_names = observations.loc[observations['variable_name'].duplicated(), 'variable_name'].unique()
+        if len(duplicated_names):
             raise ValueError(
-                f"After filtering to the simulation window, no valid measured observations "
-                f"remain for treatment '{treatment}'."
+                f"The following observation names are repeated across files: {sorted(duplicated_names)}\n"
+                "Request each variable from only one output file."
             )
 
-        # Convert remaining dates to days-after-first-simulation (used to build INS instructions)
-        days_dict = calculate_days_dict(dates_variable_values_dict, date_first_sim)
+        return observations, ins_file_pairs
 
-        #``````````````````/ New version to include the function argument "drop_missing_simulated=False," that
+    except ValueError as ve:
+        print(f"ValueError: {ve}")
+    except FileNotFoundError as fe:
+        print(f"FileNotFoundError: {fe}")
+    except Exception as e:
+        print(f"An unexpected error occurred: {e}")
 
-        # adjust the days after first simulation
-        adjusted_days_dict = adjust_days_dict(days_dict)
 
-        # Validate suffix if provided
-        if suffix is not None:
-            if not suffix.isalnum():
-                raise ValueError("Suffix must only contain letters and numbers.")
-            if len(suffix) > 4:
-                raise ValueError("Suffix must be at most 4 characters long.")
-            suffix = "_" + suffix
+def ts_ins_file_name(validated_path, suffix=None):
+    """
+    Returns the name of the ``.INS`` file written by ts() for a time-series output file.
 
-        # Process each variable and generate output text
-        output_text = ""
+    Args:
+        validated_path (str): Path to the .OUT file.
+        suffix (str, optional): Suffix of the file name, including its leading '_'
+            (e.g. '_T1').
 
-        for date, (days, vars_at_date) in adjusted_days_dict.items():
-            positions = find_variable_position(header_line, first_sim_line, vars_at_date)
+    Returns:
+        str: The file name (e.g. 'PlantGro_T1.ins').
+    """
+    if suffix is None:
+        return os.path.basename(validated_path).replace('.OUT', '.ins')
 
-            line = f"l{days}"
-            current_pos = 0  # before first token on the line
+    # Extract the file name
+    output_filename = os.path.basename(validated_path).replace('.OUT', f'{suffix}.ins')
 
-            for var in sorted(positions, key=positions.get):
-                pos = positions[var]
+    # Ensure it ends with '.ins'
+    if not output_filename.lower().endswith('.ins'):
+        output_filename += '.ins'
+    return output_filename
 
-                # From start-of-line, reaching token `pos` requires `pos` times "w"
-                w_count = pos if current_pos == 0 else (pos - current_pos)
-                if w_count < 0:
-                    raise ValueError(
-                        f"Non-monotonic positions: {var} pos={pos}, current_pos={current_pos}"
-                    )
 
-                line += " w" * w_count
-                line += f" {smk}{var}_{date}{suffix or ''}{smk}"
-                current_pos = pos
+def load_ts_arguments():
+    """
+    Loads the default arguments used by ts() and ts_batch() from ``arguments.yml``.
+
+    Returns:
+        dict: The content of ``arguments.yml``.
+    """
+    ## Get the yaml_data
+    # Get the directory of the current script
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    # Construct the path to arguments.yml
+    arguments_file = os.path.join(current_dir, 'arguments.yml')
+    # Ensure the YAML file exists
+    if not os.path.isfile(arguments_file):
+        raise FileNotFoundError(f"YAML file not found: {arguments_file}")
+    # Load YAML configuration
+    with open(arguments_file, 'r') as yml_file:
+        yaml_data = yaml.safe_load(yml_file)
+
+    return yaml_data
+
+
+def build_ts_instructions(
+    yaml_data,
+    ts_file_path,
+    treatment,
+    variables,
+    output_path=None,
+    experiment=None,
+    suffix=None,
+    variables_classification=None,
+    ts_ins_first_line=None,
+    mrk='~',
+    smk='!',
+    drop_missing_simulated=False,
+    skip_unobserved=False,
+    observation_store=None,
+    ins_style="whitespace",
+    name_allocator=None,
+):
+    """
+    Builds the observation DataFrame and the ``PEST instruction file (.INS)`` of one
+    treatment, or of a list of treatments, of a DSSAT time-series output file. This is
+    the body of ts(); errors are raised instead of printed so that ts_batch() can reuse it.
 
-            output_text += line + "\n"
+    Args:
+        yaml_data (dict): The content of ``arguments.yml`` (see load_ts_arguments).
+        ts_file_path (str or OutFileIndex): Path to the .OUT file, or a prebuilt index.
+        skip_unobserved (bool): If True, None is returned when the T file has no
+            measured values of ``variables`` for the treatment instead of raising.
 
-        # Validate output_path
-        output_path = validate_output_path(output_path)
+        The remaining arguments are the same as in ts().
 
-        # Determine and validate output_filename
-        if suffix is not None:
-            # Extract the file name
-            output_filename = os.path.basename(validated_path).replace('.OUT', f'{suffix}.ins')
+    Returns:
+        tuple or None: (DataFrame, path to the .INS file)
+    """
 
-            # Ensure it ends with '.ins'
-            if not output_filename.lower().endswith('.ins'):
-                output_filename += '.ins'
-        else:
-            # Default behavior if output_filename not provided
-            output_filename = os.path.basename(validated_path).replace('.OUT', '.ins')
+    # Define default variables:
+    yaml_file_variables = 'INS_FILE_VARIABLES'
+    yaml_variables_classification = 'VARIABLES_CLASSIFICATION_GLOBAL'
 
-        # Create output text file
-        ts_ins_file_path = os.path.join(output_path, output_filename)
+    # Validate treatment: a treatment name, or a list of treatment names written to one file
+    treatments, suffixes = validate_treatment_list(treatment, suffix)
+    single_treatment = isinstance(treatment, str)
+
+    # Convert 'variables' to a list if it's not already a list
+    if not isinstance(variables, list):
+        variables = [variables]
+
+    # Validate that 'variables' is a non-empty list of strings
+    if not variables or not all(isinstance(var, str) for var in variables):
+        raise ValueError(
+            "The 'variables' should be a non-empty string or a list of strings. For example: 'LAID' or ['LAID', 'CWAD']")
+
+    # Validate yaml_data
+    if yaml_data is None:
+        raise ValueError("The 'yaml_data' argument is required and must be specified by the user.")
+
+    # Validate marker delimiters using the validate_marker() function
+    mrk = validate_marker(mrk, "mrk")
+    smk = validate_marker(smk, "smk")
+    # Ensure mrk and smk are different
+    if mrk == smk:
+        raise ValueError("mrk and smk must be different characters.")
+
+    # Validate ins_style
+    if ins_style not in INS_STYLES:
+        raise ValueError(f"The 'ins_style' must be one of {list(INS_STYLES)}.")
+
+    # Validate variables_classification
+    if variables_classification is None:
+        variables_classification = yaml_data[yaml_variables_classification]
+
+    if ts_ins_first_line is None:
+        # Load default arguments from the YAML file if not provided
+        function_arguments = yaml_data[yaml_file_variables]
+        ts_ins_first_line = function_arguments['first_line']
+
+    # Validate ts_file_path and index its blocks in a single scan
+    validated_path, out_index = validate_out_file(ts_file_path)
+
+    # Observations and instruction lines of each treatment
+    treatment_instructions = []
+    for treatment, suffix in zip(treatments, suffixes):
+        instructions = ts_treatment_instructions(
+            yaml_data=yaml_data,
+            out_index=out_index,
+            validated_path=validated_path,
+            treatment=treatment,
+            variables=variables,
+            experiment=experiment,
+            suffix=suffix,
+            variables_classification=variables_classification,
+            smk=smk,
+            drop_missing_simulated=drop_missing_simulated,
+            skip_unobserved=skip_unobserved,
+            ins_style=ins_style,
+            name_allocator=name_allocator,
+        )
+        if instructions is not None:
+            treatment_instructions.append(instructions)
+
+    if not treatment_instructions:
+        return None
+
+    # The treatments are read in the order of their blocks in the file, so that PEST reads
+    # the file once from the top
+    treatment_instructions = order_treatment_instructions(treatment_instructions)
+
+    # Validate output_path
+    output_path = validate_output_path(output_path)
+
+    # Determine output_filename (a file with several treatments has no suffix)
+    suffix = treatment_instructions[0]['suffix'] if single_treatment else None
+    output_filename = ts_ins_file_name(validated_path, suffix)
+
+    # Create output text file
+    ts_ins_file_path = os.path.join(output_path, output_filename)
+
+    # Write the .ins file, streaming one instruction line per measured date. Each treatment
+    # starts with its anchors: the experiment code (prevents wrong block when duplicated),
+    # the treatment and the header line
+    with InsWriter(ts_ins_file_path, ts_ins_first_line, mrk, treatment_instructions[0]['anchors']) as ins_writer:
+        for position, instructions in enumerate(treatment_instructions):
+            if position > 0:
+                ins_writer.write_anchors(instructions['anchors'])
+            ins_writer.writelines(instructions['lines'])
+
+    print(f"{output_filename} file generated and saved to: {ts_ins_file_path}")
+
+    # Add the observations to the store, if one was given
+    if observation_store is not None:
+        for instructions in treatment_instructions:
+            observations_df = instructions['observations']
+            observation_store.add(
+                experiment=instructions['experiment'],
+                trno=instructions['trno'],
+                variables=observations_df['variable'],
+                dates=observations_df['date'],
+                values=observations_df['value_measured'],
+                variable_names=observations_df['variable_name'],
+                groups=observations_df['group'],
+                date_anchor=instructions['date_first_sim'],
+            )
 
-        # Construct the content for the new .ins file
-        # Include the experiment code as an anchor before the treatment (prevents wrong block when duplicated)
-        ins_file_content = (
-            f"{ts_ins_first_line} {mrk}\n"
-            f"{mrk}{experiment_code}{mrk}\n"
-            f"{mrk}{treatment}{mrk}\n"
-            f"{mrk}{header_line[1:].strip()}{mrk}\n"
-            f"{output_text}"
+    # Select and reorder the columns
+    if len(treatment_instructions) == 1:
+        observations_df = treatment_instructions[0]['observations']
+    else:
+        observations_df = pd.concat(
+            [instructions['observations'] for instructions in treatment_instructions], ignore_index=True
+        )
+    result_df = observations_df[['variable_name', 'value_measured', 'group']]
+
+    return result_df, ts_ins_file_path
+
+
+def ts_treatment_instructions(
+    yaml_data,
+    out_index,
+    validated_path,
+    treatment,
+    variables,
+    experiment,
+    suffix,
+    variables_classification,
+    smk,
+    drop_missing_simulated,
+    skip_unobserved,
+    ins_style,
+    name_allocator,
+):
+    """
+    Gets the measured observations of one treatment of a time-series output file and the
+    instruction lines that read their simulated values (see build_ts_instructions()).
+
+    Returns:
+        dict or None: 'observations' (DataFrame with the columns variable, date,
+            variable_name, value_measured and group), 'anchors' (primary-marker anchors of
+            the treatment block), 'lines' (iterator of instruction lines), 'start_line'
+            (first line of the block), 'experiment', 'trno' and 'suffix'. None when
+            ``skip_unobserved`` is True and the treatment has no measured values.
+    """
+    yaml_sim_models_key = 'SIMULATION_CROP_MODELS'
+
+    # Get treatment number
+    treatment_dict = out_index.treatment_dict()
+
+    # Resolve the correct DSSAT block when the same treatment appears in multiple experiments
+    selected_block, resolved_experiment_code = resolve_treatment_block_by_experiment(
+        file_path=out_index,
+        treatment=treatment,
+        treatment_dict=treatment_dict,
+        experiment=experiment
+    )
+
+    # Use only the selected block from here on to avoid using the wrong duplicated treatment
+    selected_treatment_dict = {treatment: selected_block}
+
+    # Get dictionaries with treatment name, treatement number, treatment and experiment code
+    treatment_number_name, treatment_experiment_name, treatment_crop_name = \
+        extract_treatment_info_plantgrowth(out_index, selected_treatment_dict)
+
+    crop_name_from_header = treatment_crop_name.get(treatment)
+    if crop_name_from_header is None:
+        raise ValueError(f"Could not determine crop name for treatment '{treatment}'.")
+
+    # Load simulation crop/model mappings
+    sim_models = yaml_data.get(yaml_sim_models_key, {})
+
+    # Find the crop entry whose alias list (lower-cased) contains crop_name_from_header
+    crop_code = None
+    for crop_key, crop_info in sim_models.items():
+        aliases = [a.lower() for a in crop_info.get('crop_aliases', [])]
+        if crop_name_from_header.lower() in aliases:
+            crop_code = aliases[1] if len(aliases) > 1 else aliases[0]
+            break
+
+    if crop_code is None:
+        raise ValueError(
+            f"Could not infer crop code from crop name '{crop_name_from_header}'. "
+            "Check SIMULATION_CROP_MODELS in arguments.yml."
         )
 
-        #--------- GET THE GROUP NAME OF THE VARIABLES
-        dates_variable_values_data = [
-            {
-                'date': date,
-                'variable': variable,
-                'value_measured': value,
-                'variable_name': f"{variable}_{date}"
-            }
-            for date, variables in dates_variable_values_dict.items()
-            for variable, value in variables.items()
-        ]
+    # Use the resolved experiment code from the selected block
+    experiment_code = resolved_experiment_code
+    if experiment_code is None:
+        raise ValueError(f"Could not determine experiment code for treatment '{treatment}'.")
+
+    # Find the T file <EXPCODE>.<CROPCODE>T (e.g. SWSW7501 + WH -> SWSW7501.WHT) in the T-file
+    # index of the directory of the .OUT file
+    t_file_path = find_t_file(os.path.dirname(validated_path), experiment_code, crop_code)
+
+    # Get the typed observation table of the T file (parsed once while the file does not change)
+    t_table = read_observation_table(t_file_path)
+
+    # Load and filter data for all variables
+    dates_variable_values_dict = filter_dataframe(t_table, treatment, treatment_number_name, variables)
+
+    # Check if the filter_dataframe returned an empty dictionary (indicating an error)
+    if not dates_variable_values_dict:
+        if skip_unobserved:
+            return None
+        raise ValueError(f"No valid data found for treatment '{treatment}' with variables {variables}")
+
+    #`````````````````` Old version that does not include the option "drop_missing_simulated=False," that
+    # # Get the header and first simulation date
+    # header_line, first_sim_line, date_first_sim = get_header_and_first_sim(
+    #     validated_path,
+    #     treatment,
+    #     treatment_dict=selected_treatment_dict
+    # )
+    #
+    # # Calculate days dictionary days after first simulation
+    # days_dict = calculate_days_dict(dates_variable_values_dict, date_first_sim)
+
+    #`````````````````` / Old version that does not include the option "drop_missing_simulated=False," that
+
+
+    #`````````````````` New version to include the function argument "drop_missing_simulated=False," that
+    # Get header, first simulated date, and last simulated date
+    # This defines the valid simulation window for the selected treatment
+    header_line, first_sim_line, date_first_sim, date_last_sim = get_header_first_and_last_sim(
+        out_index,
+        treatment,
+        treatment_dict=selected_treatment_dict
+    )
+
+    # Split measured observations into:
+    # - those inside the simulation window (kept)
+    # - those beyond the last simulated date (dropped)
+    kept_dates_dict, dropped_dates_dict = filter_dates_to_simulation_window(
+        dates_variable_values_dict,
+        date_first_sim,
+        date_last_sim
+    )
+
+    # If any measured observations are beyond the simulation period, handle them
+    if dropped_dates_dict:
+
+        # Format last simulated date as YYYYDOY for reporting
+        last_sim_yyyydoy = f"{date_last_sim.year}{date_last_sim.timetuple().tm_yday:03d}"
+
+        # List of dropped measured dates (sorted for readability)
+        dropped_dates = sorted(dropped_dates_dict.keys())
+
+        # Default behavior: stop execution and inform the user
+        if not drop_missing_simulated:
+            raise ValueError(
+                f"Some measured observations occur after the last simulated date for "
+                f"treatment '{treatment}' in experiment '{experiment_code}'.\n"
+                f"Last simulated YEAR/DOY: {last_sim_yyyydoy}\n"
+                f"Dropped candidate dates: {dropped_dates}\n\n"
+                f"Re-run ts(..., drop_missing_simulated=True) to keep only observations "
+                f"up to the last simulated date, or use uts() if you intentionally want "
+                f"to extend the .OUT file with artificial rows."
+            )
 
-        # Create the DataFrame
-        dates_variable_values_df = pd.DataFrame(dates_variable_values_data)
+        # Optional behavior: continue but warn the user that some observations were ignored
+        print(
+            f"Warning: {len(dropped_dates_dict)} measured date(s) were ignored because "
+            f"they occur after the last simulated YEAR/DOY ({last_sim_yyyydoy}) "
+            f"for treatment '{treatment}' in experiment '{experiment_code}'.\n"
+            f"Dropped dates: {dropped_dates}"
+        )
 
-        # Map variables to their respective groups
-        dates_variable_values_df['group'] = dates_variable_values_df['variable'].map(variables_classification)
+    # Replace original dictionary with only valid (kept) observations
+    dates_variable_values_dict = kept_dates_dict
 
-        # Validate that all variables were assigned to a group
-        missing_group_rows = dates_variable_values_df[
-            dates_variable_values_df["group"].isna()
-        ].copy()
+    # Safety check: ensure at least one observation remains after filtering
+    if not dates_variable_values_dict:
+        raise ValueError(
+            f"After filtering to the simulation window, no valid measured observations "
+            f"remain for treatment '{treatment}'."
+        )
 
-        if not missing_group_rows.empty:
-            missing_variables = sorted(missing_group_rows["variable"].dropna().unique())
+    # Convert remaining dates to days-after-first-simulation (used to build INS instructions)
+    days_dict = calculate_days_dict(dates_variable_values_dict, date_first_sim)
+
+    #``````````````````/ New version to include the function argument "drop_missing_simulated=False," that
+
+    # adjust the days after first simulation
+    adjusted_days_dict = adjust_days_dict(days_dict)
+
+    # Validate suffix if provided
+    trno = treatment_number_name[treatment]
+    if suffix is not None:
+        if suffix == DEFAULT_TREATMENT_SUFFIX:
+            suffix = suffix.format(trno=trno)
+        if not suffix.isalnum():
+            raise ValueError("Suffix must only contain letters and numbers.")
+        if len(suffix) > 4:
+            raise ValueError("Suffix must be at most 4 characters long.")
+        suffix = "_" + suffix
+
+    #--------- GET THE GROUP NAME OF THE VARIABLES
+    dates_variable_values_data = [
+        {
+            'date': date,
+            'variable': variable,
+            'value_measured': value,
+            'variable_name': f"{variable}_{date}"
+        }
+        for date, variables in dates_variable_values_dict.items()
+        for variable, value in variables.items()
+    ]
+
+    # Create the DataFrame
+    dates_variable_values_df = pd.DataFrame(dates_variable_values_data)
+
+    # Map variables to their respective groups
+    dates_variable_values_df['group'] = dates_variable_values_df['variable'].map(variables_classification)
+
+    # Validate that all variables were assigned to a group
+    missing_group_rows = dates_variable_values_df[
+        dates_variable_values_df["group"].isna()
+    ].copy()
+
+    if not missing_group_rows.empty:
+        missing_variables = sorted(missing_group_rows["variable"].dropna().unique())
+
+        raise ValueError(
+            "The following time-series variables were not assigned to any group in "
+            "'variables_classification':\n"
+            f"  {missing_variables}\n\n"
+            "Please update the 'variables_classification' dictionary to include them."
+        )
 
-            raise ValueError(
-                "The following time-series variables were not assigned to any group in "
-                "'variables_classification':\n"
-                f"  {missing_variables}\n\n"
-                "Please update the 'variables_classification' dictionary to include them."
-            )
+    # Convert 'value_measured' column to float
+    dates_variable_values_df['value_measured'] = dates_variable_values_df['value_measured'].astype(float)
 
-        # Convert 'value_measured' column to float
-        dates_variable_values_df['value_measured'] = dates_variable_values_df['value_measured'].astype(float)
+    # Add the siffix to the variable_name
+    if suffix is not None:
+        dates_variable_values_df['variable_name'] = dates_variable_values_df['variable_name'] + suffix
 
-        # Add the siffix to the variable_name
-        if suffix is not None:
-            dates_variable_values_df['variable_name'] = dates_variable_values_df['variable_name'] + suffix
+    # Reserve the names in the allocator shared by the instruction files of the PEST run
+    if name_allocator is not None:
+        dates_variable_values_df['variable_name'] = name_allocator.allocate_many(
+            dates_variable_values_df['variable_name']
+        )
 
-        # Select and reorder the columns
-        result_df = dates_variable_values_df[['variable_name', 'value_measured', 'group']]
+    # Observation name of each (date, variable)
+    observation_names = dict(zip(
+        zip(dates_variable_values_df['date'], dates_variable_values_df['variable']),
+        dates_variable_values_df['variable_name']
+    ))
 
-        # Write the content to the .ins file
-        with open(ts_ins_file_path, 'w') as ins_file:
-            ins_file.write(ins_file_content)
+    def instruction_lines():
+        """Yields one instruction line per measured date."""
+        for date, (days, vars_at_date) in adjusted_days_dict.items():
+            positions = find_variable_position(header_line, first_sim_line, vars_at_date)
 
-        print(f"{output_filename} file generated and saved to: {ts_ins_file_path}")
+            if ins_style == 'columns':
+                # Fixed observations: the columns of each variable come from the header
+                spans = header_layout(header_line).spans
+                yield f"l{days}" + ''.join(
+                    f" [{observation_names[date, var]}]{spans[pos - 1][0] + 1}:{spans[pos - 1][1]}"
+                    for var, pos in sorted(positions.items(), key=lambda item: item[1])
+                )
+                continue
 
-        return result_df, ts_ins_file_path
+            line = f"l{days}"
+            current_pos = 0  # before first token on the line
 
-    except ValueError as ve:
-        print(f"ValueError: {ve}")
-    except FileNotFoundError as fe:
-        print(f"FileNotFoundError: {fe}")
-    except Exception as e:
-        print(f"An unexpected error occurred: {e}")
\ No newline at end of file
+            for var in sorted(positions, key=positions.get):
+                pos = positions[var]
+
+                # From start-of-line, reaching token `pos` requires `pos` times "w"
+                w_count = pos if current_pos == 0 else (pos - current_pos)
+                if w_count < 0:
+                    raise ValueError(
+                        f"Non-monotonic positions: {var} pos={pos}, current_pos={current_pos}"
+                    )
+
+                line += " w" * w_count
+                line += f" {smk}{observation_names[date, var]}{smk}"
+                current_pos = pos
+
+            yield line
+
+    return {
+        'observations': dates_variable_values_df,
+        # Include the experiment code as an anchor before the treatment (prevents wrong block when duplicated)
+        'anchors': [experiment_code, treatment, header_line[1:].strip()],
+        'lines': instruction_lines(),
+        'start_line': selected_block[0],
+        'experiment': experiment_code,
+        'trno': trno,
+        'suffix': suffix,
+        'date_first_sim': date_first_sim,
+    }
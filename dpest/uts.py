@@ -1,4 +1,3 @@
-import re
 from dpest.functions import *
 
 def uts(
@@ -64,6 +63,9 @@ def uts(
           - ``C:/DSSAT48/Wheat/SoilNi.OUT``
           - ``C:/DSSAT48/Wheat/SoilWat.OUT``
 
+          An ``OutFileIndex`` of the file (``dpest.functions.OutFileIndex``) can be passed instead of the path.
+          The index is rebuilt automatically when the file has changed since it was built.
+
         * **treatment** (*str*): The name of the treatment for which the cultivar is being calibrated. This should
         match exactly the treatment name as shown in the DSSAT application interface when an experiment is selected.
         For example, "164.0 KG N/HA IRRIG" is a treatment of the ``SWSW7501WH.WHX`` experiment.
@@ -153,8 +155,8 @@ def uts(
         with open(arguments_file, 'r') as yml_file:
             yaml_data = yaml.safe_load(yml_file)
 
-        # Validate uts_file_path
-        validated_path = validate_file(uts_file_path, '.OUT')
+        # Validate uts_file_path and index its blocks in a single scan
+        validated_path, out_index = validate_out_file(uts_file_path)
 
         # Validate treatment
         if not treatment or not isinstance(treatment, str):
@@ -186,9 +188,9 @@ def uts(
             raise ValueError("nspaces_columns_header must be an integer.")
 
         # Get treatment range
-        treatment_dict = simulations_lines(validated_path)
+        treatment_dict = out_index.treatment_dict()
         (start_i, end_i), experiment_code = resolve_treatment_block_by_experiment(
-            file_path=validated_path,
+            file_path=out_index,
             treatment=treatment,
             treatment_dict=treatment_dict,
             experiment=experiment,
@@ -197,13 +199,14 @@ def uts(
         treatment_range = (start_i, end_i)
 
         # Read growth file
-        ts_file_df = read_growth_file(validated_path, treatment_range)
+        # (only the byte range of the treatment block is decoded)
+        ts_file_df = read_growth_file(out_index, treatment_range, use_mmap=True)
 
         # Get treatment number
         # Get treatment number
         # Get dictionaries with treatment name, treatement number, treatment and experiment code
         treatment_number_name, treatment_experiment_name, treatment_crop_name = \
-            extract_treatment_info_plantgrowth(validated_path, selected_treatment_dict)
+            extract_treatment_info_plantgrowth(out_index, selected_treatment_dict)
 
         crop_name_from_header = treatment_crop_name.get(treatment)
         if crop_name_from_header is None:
@@ -229,111 +232,56 @@ def uts(
         if experiment_code is None:
             raise ValueError(f"Could not determine experiment code for treatment '{treatment}'.")
 
-        # Build T-file name: <EXPCODE><CROPCODE>T, e.g. SWSW7501 + WH + T -> SWSW7501WHT
-        t_file_name = f"{experiment_code}.{crop_code.upper()}T"
-        t_file_path = os.path.join(os.path.dirname(validated_path), t_file_name)
+        # Find the T file <EXPCODE>.<CROPCODE>T (e.g. SWSW7501 + WH -> SWSW7501.WHT) in the T-file
+        # index of the directory of the .OUT file
+        t_file_path = find_t_file(os.path.dirname(validated_path), experiment_code, crop_code)
 
-        # Get the dataframe from the T file data
-        t_df = wht_filedata_to_dataframe(t_file_path)
+        # Get the typed observation table of the T file (parsed once while the file does not change)
+        t_table = read_observation_table(t_file_path)
 
         # Load and filter data for all variables and get the measured year
-        dates_variable_values_dict = filter_dataframe(t_df, treatment, treatment_number_name, variables)
+        dates_variable_values_dict = filter_dataframe(t_table, treatment, treatment_number_name, variables)
 
         # Check if the filter_dataframe returned an empty dictionary (indicating an error)
         if not dates_variable_values_dict:
             raise ValueError(f"No valid data found for treatment '{treatment}' with variables {variables}")
 
-        # Get the year and day of the year and join it as one unique number
-        year_sim = int(str(ts_file_df['@YEAR'].iloc[-1]) + f"{ts_file_df['DOY'].iloc[-1]:03}")
-
-        # Handle both 4-digit and 2-digit years for year_measured
-        year_measured_key_str = str(list(dates_variable_values_dict.keys())[-1])
+        # First and last simulated dates of the treatment block
+        simulated_dates = date_codes_to_datetime64([
+            f"{ts_file_df['@YEAR'].iloc[row]}{ts_file_df['DOY'].iloc[row]:03}" for row in (0, -1)
+        ])
+        date_first_sim, date_last_sim = simulated_dates
 
-        if len(year_measured_key_str) == 5:  # If year_measured has a 2-digit year
-            year_measured_year = int(year_measured_key_str[:2])
-            doy_measured = int(year_measured_key_str[2:])
+        # Convert the measured dates at once (two-digit years are resolved to the
+        # century nearest to the first simulated date) and take the latest one
+        measured_codes = list(dates_variable_values_dict)
+        measured_dates = date_codes_to_datetime64(measured_codes, anchor=date_first_sim)
+        check_date_codes(measured_codes, measured_dates)
 
-            # Determine the correct century for the 2-digit year
-            century = year_sim // 100000  # Get the century from year_sim
-            year_measured = int(f"{century}{year_measured_year:02d}{doy_measured:03d}")
-        else:  # If year_measured has a 4-digit year
-            year_measured = int(year_measured_key_str)
+        # Number of days the simulation must be extended to reach the latest measurement
+        number_rows_add = int(days_between(measured_dates.max(), date_last_sim))
 
         # Create the new rows to insert
-        if year_sim < year_measured:
-            number_rows_add = year_measured - year_sim
-
+        if number_rows_add > 0:
             # Get the new rows using the new_rows() function
             new_rows = new_rows_add(ts_file_df, number_rows_add)
 
             # Read the existing file and store its contents
-            with open(uts_file_path, 'r') as file:
+            with open(validated_path, 'r') as file:
                 lines = file.readlines()
 
             # Identify the line where the headers are defined (e.g., '@YEAR')
             header_line = next(line for line in lines if '@YEAR' in line)
 
-            # Extract column headers to maintain correct order
-            headers = header_line.strip().split()
-
-            # # Convert each dictionary into a formatted row string
-            # new_rows_dic = []
-            # for row_data in new_rows:
-            #     row = (
-            #             str(row_data.get('@YEAR', 0)).rjust(nspaces_year_header) +
-            #             str(row_data.get('DOY', 0)).rjust(nspaces_doy_header) +
-            #             ''.join(str(row_data.get(col, 0)).rjust(nspaces_columns_header) for col in headers if
-            #                     col not in ['@YEAR', 'DOY']) +
-            #             '\n'
-            #     )
-            #     new_rows_dic.append(row)
-
-            # Use the last real simulated row as formatting template
+            # Use the last real simulated row as formatting template: the column spans come
+            # from the (cached) layout of the header and the decimals from the template row
             last_line_index = treatment_range[1] - 1
             template_line = lines[last_line_index].rstrip('\n')
-
-            # Split template into whitespace and tokens, keeping whitespace
-            parts = re.split(r'(\s+)', template_line)
-
-            # Tokens only
-            template_tokens = template_line.split()
+            layout = header_layout(header_line, template_line)
+            template_decimals = layout.field_decimals(template_line)
 
             # Convert each dictionary into a formatted row string
-            new_rows_dic = []
-            for row_data in new_rows:
-                formatted_tokens = []
-
-                for i, col in enumerate(headers):
-                    value = row_data.get(col, 0)
-                    template_token = template_tokens[i]
-
-                    # Keep same numeric style as template
-                    if col in ['@YEAR', 'DOY', 'DAS', 'DAP']:
-                        value_str = str(int(value))
-                    else:
-                        if '.' in template_token:
-                            decimals = len(template_token.split('.')[-1])
-                            value_str = f"{float(value):.{decimals}f}"
-                        else:
-                            value_str = str(int(float(value)))
-
-                    # Match width of original token
-                    formatted_tokens.append(value_str.rjust(len(template_token)))
-
-                # Rebuild line preserving original whitespace
-                rebuilt = []
-                token_idx = 0
-
-                for part in parts:
-                    if part == '':
-                        continue
-                    if part.isspace():
-                        rebuilt.append(part)
-                    else:
-                        rebuilt.append(formatted_tokens[token_idx])
-                        token_idx += 1
-
-                new_rows_dic.append(''.join(rebuilt) + '\n')
+            new_rows_dic = [layout.format_row(row_data, template_decimals) + '\n' for row_data in new_rows]
 
             # Add new rows to the lines list
             lines[treatment_range[1]:treatment_range[1]] = new_rows_dic
@@ -0,0 +1,647 @@
+from pathlib import Path
+import tracemalloc
+import pytest
+from dpest.functions import *
+
+REPO_ROOT = Path(__file__).parent.parent
+PLANTGRO_FILE = str(REPO_ROOT / "tests/DSSAT48/Wheat/PlantGro.OUT")
+OVERVIEW_FILE = str(REPO_ROOT / "tests/DSSAT48/Wheat/OVERVIEW.OUT")
+
+
+def test_out_file_index_blocks():
+    """The index records one block per '*DSSAT' section with its header information."""
+    out_index = OutFileIndex(PLANTGRO_FILE)
+
+    assert len(out_index.blocks) == 14
+
+    block = out_index.blocks[0]
+    assert block['run'] == 1
+    assert block['experiment'] == 'SWSW7501'
+    assert block['model'] == 'CSCER048'
+    assert block['crop'] == 'Wheat'
+    assert block['trno'] == '1'
+    assert block['treatment'] == '0 KG N/HA DRY'
+    assert block['header_line'].startswith('@YEAR DOY   DAS')
+    assert block['first_data_line'].split()[:2] == ['1975', '145']
+    assert block['last_data_line'].split()[:2] == ['1975', '234']
+
+
+def test_out_file_index_matches_simulations_lines_ranges():
+    """The treatment ranges of the index keep the simulations_lines() convention."""
+    out_index = OutFileIndex(OVERVIEW_FILE)
+    treatment_dict = simulations_lines(OVERVIEW_FILE)
+
+    assert out_index.treatment_dict() == treatment_dict
+    assert simulations_lines(out_index) == treatment_dict
+
+    # Block byte ranges cover exactly the lines of each block
+    block = out_index.blocks[1]
+    lines = out_index.read_block_lines(block)
+    assert lines[0].startswith('*DSSAT')
+    assert len(lines) == block['end_line'] - block['start_line'] + 1
+
+
+def test_out_file_index_is_rebuilt_when_file_changes(tmp_path):
+    """validate_out_file() rebuilds an index whose file changed since it was built."""
+    out_file = tmp_path / "PlantGro.OUT"
+    out_file.write_text(Path(PLANTGRO_FILE).read_text())
+
+    out_index = OutFileIndex(str(out_file))
+    assert out_index.is_current()
+
+    # Keep only the first block of the file
+    lines = out_file.read_text().splitlines(keepends=True)
+    out_file.write_text(''.join(lines[:out_index.blocks[1]['start_line']]))
+    assert not out_index.is_current()
+
+    validated_path, same_index = validate_out_file(out_index)
+    assert same_index is out_index
+    assert len(out_index.blocks) == 1
+
+
+def test_read_growth_file_mmap_matches_full_read(tmp_path):
+    """The memory-mapped read returns the same frame and only decodes one block."""
+    out_file = tmp_path / "PlantGro.OUT"
+    out_file.write_text(Path(PLANTGRO_FILE).read_text() * 20)
+    out_index = OutFileIndex(str(out_file))
+
+    for block in out_index.blocks[:4]:
+        treatment_range = (block['start_line'], block['end_line'])
+        expected = read_growth_file(str(out_file), treatment_range)
+        assert read_growth_file(out_index, treatment_range, use_mmap=True).equals(expected)
+
+    # Peak memory of the mapped read stays far below the size of the whole file
+    block = out_index.blocks[-1]
+    tracemalloc.start()
+    read_growth_file(out_index, (block['start_line'], block['end_line']), use_mmap=True)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert peak < out_index.size / 4
+
+
+def test_index_cache_skips_parsing_of_unchanged_files(tmp_path, monkeypatch):
+    """A valid '.dpidx' entry is reused, and a changed file is parsed again."""
+    cache_dir = tmp_path / "cache"
+    out_file = tmp_path / "PlantGro.OUT"
+    out_file.write_text(Path(PLANTGRO_FILE).read_text())
+
+    built = OutFileIndex(str(out_file), cache_dir=str(cache_dir))
+    assert len(list(cache_dir.glob("*.dpidx"))) == 1
+
+    def fail_build(self):
+        raise AssertionError("The file should not be parsed again")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(OutFileIndex, 'build', fail_build)
+        cached = OutFileIndex(str(out_file), cache_dir=str(cache_dir))
+    assert cached.blocks == built.blocks
+    assert cached.treatment_dict() == built.treatment_dict()
+
+    # The cache is also enabled through the environment variable
+    monkeypatch.setenv(INDEX_CACHE_DIR_ENV, str(cache_dir))
+    assert OutFileIndex(str(out_file)).blocks == built.blocks
+
+    # Changing the file invalidates the entry
+    lines = out_file.read_text().splitlines(keepends=True)
+    out_file.write_text(''.join(lines[:built.blocks[1]['start_line']]))
+    assert len(OutFileIndex(str(out_file)).blocks) == 1
+
+
+def test_index_cache_tfile_table_and_eviction(tmp_path):
+    """T-file tables round-trip through the cache, which keeps only the most recent entries."""
+    cache_dir = str(tmp_path / "cache")
+    t_file = str(REPO_ROOT / "tests/DSSAT48/Wheat/SWSW7501.WHT")
+
+    expected = wht_filedata_to_dataframe(t_file)
+    assert wht_filedata_to_dataframe(t_file, cache_dir=cache_dir).equals(expected)
+    assert load_index_cache(t_file, 'tfile', cache_dir) is not None
+    assert wht_filedata_to_dataframe(t_file, cache_dir=cache_dir).equals(expected)
+
+    evict_index_cache(cache_dir, max_entries=0)
+    assert load_index_cache(t_file, 'tfile', cache_dir) is None
+
+
+def test_parse_fixed_width_block_handles_dssat_values():
+    """Values such as '.0003', '-99' and '-99.0' are parsed and missing values are reported."""
+    header_line = '@YEAR DOY   VAL   ABC   XYZ\n'
+    data_lines = [
+        ' 1975 145 .0003 -99.0   -99\n',
+        ' 1975 146  1e-3  12.5    -4\n',
+    ]
+
+    columns, values, missing, integer_columns = parse_fixed_width_block(header_line, data_lines)
+
+    assert columns == ['YEAR', 'DOY', 'VAL', 'ABC', 'XYZ']
+    assert values.dtype == np.float64
+    assert values.tolist() == [[1975, 145, 0.0003, -99.0, -99], [1975, 146, 0.001, 12.5, -4]]
+    assert missing.tolist() == [[False, False, False, True, True], [False] * 5]
+    assert integer_columns.tolist() == [True, True, False, False, True]
+
+    # A value crossing a column boundary does not follow the layout of the header
+    with pytest.raises(ValueError):
+        parse_fixed_width_block(header_line, [' 1975 145 .000312345.0   -99\n'])
+
+
+def test_read_growth_file_fixed_width_matches_whitespace_split():
+    """The fixed-width parser gives the same frame as splitting every row on whitespace."""
+    out_index = OutFileIndex(PLANTGRO_FILE)
+    block = out_index.blocks[0]
+    df = read_growth_file(PLANTGRO_FILE, (block['start_line'], block['end_line']))
+
+    lines = out_index.read_block_lines(block)
+    header_position = next(i for i, line in enumerate(lines) if line.startswith('@'))
+    data = [line.split() for line in lines[header_position + 1:] if line.strip()]
+    expected = pd.DataFrame(data, columns=lines[header_position].split()).apply(pd.to_numeric)
+
+    assert df.equals(expected)
+    assert (df.dtypes == expected.dtypes).all()
+
+
+def test_extract_overview_data_builds_one_frame_without_separators():
+    """All blocks are collected into one frame and the '--------' rows are removed."""
+    out_index = OutFileIndex(OVERVIEW_FILE)
+    all_data, header_line, model_crop = extract_overview_data(out_index)
+
+    assert header_line.startswith('@')
+    assert model_crop == out_index.blocks[-1]['model_crop']
+    assert set(all_data['treatment']) == set(out_index.treatment_dict())
+    assert not all_data['variable'].str.contains('--------', regex=False).any()
+    assert all_data['value_simulated'].dtype == float
+
+    # Rows keep their position in the block and their index in the unfiltered frame
+    rows = parse_overview_block(out_index.read_block_lines(out_index.blocks[0]))
+    first_block = all_data[all_data['experiment'] == out_index.blocks[0]['experiment_name']].head(3)
+    assert first_block['position'].tolist() == [row[3] for row in rows if '--------' not in row[0]][:3]
+    assert all_data.index.is_monotonic_increasing
+
+
+def test_iter_out_blocks_streams_one_block_at_a_time():
+    """Each yielded block matches the frame parsed from the same block of the file."""
+    out_index = OutFileIndex(PLANTGRO_FILE)
+    blocks = iter_out_blocks(PLANTGRO_FILE)
+    assert next(blocks)[:3] == ('SWSW7501', '1', '0 KG N/HA DRY')
+
+    for block, (experiment, trno, treatment, cultivar, block_frame) in zip(
+            out_index.blocks, iter_out_blocks(out_index)):
+        assert (experiment, trno, treatment) == (block['experiment'], block['trno'], block['treatment'])
+        expected = read_growth_file(PLANTGRO_FILE, (block['start_line'], block['end_line']))
+        assert block_frame.equals(expected)
+
+    overview_blocks = list(iter_out_blocks(OVERVIEW_FILE, kind="overview"))
+    all_data, _, _ = extract_overview_data(OVERVIEW_FILE)
+    assert len(overview_blocks) == len(OutFileIndex(OVERVIEW_FILE).blocks)
+    assert sum(len(block[4]) for block in overview_blocks) == len(all_data)
+    assert overview_blocks[0][3] == 'MANITOU'
+    assert list(overview_blocks[0][4].columns) == ['variable', 'value_simulated', 'value_measured', 'position']
+
+    with pytest.raises(ValueError):
+        next(iter_out_blocks(PLANTGRO_FILE, kind="summary"))
+
+
+def test_read_growth_file_columnar_cache(tmp_path, monkeypatch):
+    """Parsed blocks are cached as .npy columns, reopened memory-mapped and invalidated on change."""
+    import dpest.functions
+
+    cache_dir = str(tmp_path / "cache")
+    out_file = tmp_path / "PlantGro.OUT"
+    out_file.write_text(Path(PLANTGRO_FILE).read_text())
+    treatment_range = simulations_lines(str(out_file))['0 KG N/HA DRY']
+
+    expected = read_growth_file(str(out_file), treatment_range, cache_dir=cache_dir)
+    columns = load_growth_columns(str(out_file), treatment_range, cache_dir)
+    assert list(columns) == list(expected.columns)
+    assert isinstance(columns['LAID'], np.memmap)
+
+    def fail_parse(treatment_lines):
+        raise AssertionError("The block should not be parsed again")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(dpest.functions, 'growth_lines_to_dataframe', fail_parse)
+        cached = read_growth_file(str(out_file), treatment_range, cache_dir=cache_dir)
+    assert cached.equals(expected)
+    assert (cached.dtypes == expected.dtypes).all()
+
+    # The cached frame is backed by the memory-mapped columns, not by a copy of them
+    for name in cached.columns:
+        base = cached[name].to_numpy()
+        while not isinstance(base, np.memmap) and base.base is not None:
+            base = base.base
+        assert isinstance(base, np.memmap) and base.filename.startswith(str(tmp_path / "cache"))
+        assert np.shares_memory(cached[name].to_numpy(), base)
+
+    # Writing to the frame does not modify the cache files
+    cached.loc[cached.index[0], 'LAID'] = -1.0
+    assert load_growth_columns(str(out_file), treatment_range, cache_dir)['LAID'][0] == expected['LAID'].iloc[0]
+
+    # Changing the file invalidates the cached columns
+    out_file.write_text(out_file.read_text().replace(' 1975 145 ', ' 1975 144 ', 1))
+    assert load_growth_columns(str(out_file), treatment_range, cache_dir) is None
+    assert read_growth_file(str(out_file), treatment_range, cache_dir=cache_dir)['DOY'].iloc[0] == 144
+
+
+def test_out_file_index_update_parses_appended_bytes(tmp_path):
+    """update() only parses the appended bytes and gives the same index as a full scan."""
+    content = Path(PLANTGRO_FILE).read_bytes()
+    full_index = OutFileIndex(PLANTGRO_FILE)
+    out_file = tmp_path / "PlantGro.OUT"
+
+    # Start with the first three blocks and a partial line of the fourth one
+    cut = full_index.blocks[3]['start_byte'] + 200
+    out_file.write_bytes(content[:cut])
+    monitor = OutFileMonitor(str(out_file))
+    assert len(monitor.poll()) == 4
+    assert monitor.poll() == []
+
+    # Append the rest of the file
+    with open(out_file, 'ab') as file:
+        file.write(content[cut:])
+    updated = monitor.poll()
+    assert [block[2] for block in updated] == [block['treatment'] for block in full_index.blocks[3:]]
+    assert monitor.out_index.blocks == full_index.blocks
+    assert monitor.treatment_dict() == simulations_lines(PLANTGRO_FILE)
+
+    for block in full_index.blocks:
+        expected = read_growth_file(PLANTGRO_FILE, (block['start_line'], block['end_line']))
+        assert monitor.frames[block['start_line']].equals(expected)
+
+    # Changes inside the file (not appended) trigger a full scan
+    lines = content.splitlines(keepends=True)
+    out_file.write_bytes(b''.join(lines[:20] + lines[19:]))
+    monitor.out_index.update()
+    assert monitor.out_index.blocks == OutFileIndex(str(out_file)).blocks
+
+
+def test_observation_table_is_typed_and_memoized(tmp_path):
+    """T-file observations are typed, parsed once, and parsed again when the file changes."""
+    t_file = tmp_path / "SWSW7501.WHT"
+    t_file.write_text((REPO_ROOT / "tests/DSSAT48/Wheat/SWSW7501.WHT").read_text())
+
+    table = read_observation_table(str(t_file))
+    assert table.trno.dtype == np.int64
+    assert table.dates.dtype == np.dtype('datetime64[D]')
+    assert table.dates[0] == np.datetime64('1975-06-16')
+    assert table.values['LAID'].dtype == np.float64
+    assert read_observation_table(str(t_file)) is table
+
+    # Values written as '0' and -99 are skipped, '0.0' is kept
+    treatment_number_name = {'0 KG N/HA DRY': '1'}
+    observations = filter_dataframe(table, '0 KG N/HA DRY', treatment_number_name, ['LAID', 'CWAD'])
+    assert observations['75167'] == {'LAID': 0.17, 'CWAD': 49.0}
+    assert observations['75233']['LAID'] == 0.0
+    assert filter_dataframe(
+        wht_filedata_to_dataframe(str(t_file)), '0 KG N/HA DRY', treatment_number_name, ['LAID', 'CWAD']
+    ) == observations
+
+    t_file.write_text(t_file.read_text().replace('75167    49', '75167    50', 1))
+    changed = read_observation_table(str(t_file))
+    assert changed is not table
+    assert changed.values['CWAD'][0] == 50
+
+
+def test_observation_table_long_format():
+    """The long table holds the observations of all treatments and backs filter_dataframe()."""
+    table = ObservationTable(wht_filedata_to_dataframe(str(REPO_ROOT / "tests/DSSAT48/Wheat/SWSW7501.WHT")))
+    long_df = table.long_format()
+
+    assert list(long_df.columns) == ['trno', 'date', 'variable', 'value']
+    assert long_df is table.long_format()
+    assert set(long_df['trno']) == set(table.trno)
+    assert not (long_df['value'] == -99).any()
+
+    for trno in set(table.trno):
+        observations = table.observations(trno, table.variables)
+        count = sum(len(values) for values in observations.values())
+        assert count == (long_df['trno'] == trno).sum()
+
+
+def test_date_codes_to_datetime64_nearest_century():
+    """Two-digit years are resolved to the century nearest to the anchor date."""
+    from datetime import datetime
+
+    codes = ['99360', '00005', '2001032', '75167']
+
+    # Without an anchor the strptime('%y') pivot is used
+    assert date_codes_to_datetime64(codes).astype(str).tolist() == [
+        '1999-12-26', '2000-01-05', '2001-02-01', '1975-06-16'
+    ]
+
+    # Anchored on a simulation that starts at the end of 2099
+    anchored = date_codes_to_datetime64(codes, anchor=datetime(2099, 11, 1))
+    assert anchored.astype(str).tolist() == ['2099-12-26', '2100-01-05', '2001-02-01', '2075-06-16']
+
+
+def test_calculate_days_dict_and_window_are_vectorized_equivalents():
+    """Day offsets and the simulation window match the per-date arithmetic."""
+    from datetime import datetime, timedelta
+
+    date_first_sim = datetime(1999, 12, 1)
+    date_last_sim = datetime(2000, 1, 10)
+    dates_dict = {'99340': {'LAID': 1.0}, '00005': {'LAID': 2.0}, '2000020': {'LAID': 3.0}}
+
+    days_dict = calculate_days_dict(dates_dict, date_first_sim)
+    assert days_dict == {
+        '99340': [(datetime(1999, 12, 6) - date_first_sim).days, ['LAID']],
+        '00005': [(datetime(2000, 1, 5) - date_first_sim).days, ['LAID']],
+        '2000020': [(datetime(2000, 1, 20) - date_first_sim).days, ['LAID']],
+    }
+
+    kept, dropped = filter_dates_to_simulation_window(dates_dict, date_first_sim, date_last_sim)
+    assert list(kept) == ['99340', '00005']
+    assert list(dropped) == ['2000020']
+
+
+@pytest.mark.parametrize("date_code, message", [
+    ('7516', 'Invalid date format'),
+    ('75400', 'Invalid day-of-year'),
+])
+def test_calculate_days_dict_invalid_dates(date_code, message):
+    from datetime import datetime
+
+    with pytest.raises(ValueError, match=message):
+        calculate_days_dict({date_code: {'LAID': 1.0}}, datetime(1975, 1, 1))
+
+
+def test_observation_store_lookups_and_ranges():
+    store = ObservationStore()
+    store.add('SWSW7501', 1, ['LAID', 'CWAD', 'LAID'], ['75167', '75167', '75180'],
+              [0.17, 49.0, 0.42], ['LAID_75167', 'CWAD_75167', 'LAID_75180'], ['lai', 'biomass', 'lai'])
+    store.add('SWSW7501', '2', ['LAID'], ['75167'], [0.2], ['LAID_75167_T2'], ['lai'])
+    store.add('SWSW7501', 1, ['Maturity (DAP)'], None, [112.0], ['Maturity_DAP'], ['phenology'])
+
+    assert len(store) == 5
+    assert store.get('SWSW7501', 1, 'LAID', '75180') == 0.42
+    assert store.get('SWSW7501', 1, 'LAID', '1975180') == 0.42
+    assert store.get('SWSW7501', 2, 'LAID', '75167') == 0.2
+    assert store.get('SWSW7501', 1, 'Maturity (DAP)') == 112.0
+    assert store.get('SWSW7501', 1, 'LAID', '75170') is None
+    assert ('OTHER001', 1, 'LAID', '75167') not in store
+
+    # Date range of one series, and of all series
+    series_rows = store.rows('SWSW7501', 1, 'LAID', start='75170', end='75190')
+    assert store.to_frame(series_rows)['variable_name'].tolist() == ['LAID_75180']
+    assert store.to_frame(store.rows(end='75170'))['variable_name'].tolist() == [
+        'LAID_75167', 'CWAD_75167', 'LAID_75167_T2'
+    ]
+
+    observation_frame = store.observation_frame()
+    assert observation_frame.columns.tolist() == ['variable_name', 'value_measured', 'group']
+    assert observation_frame['variable_name'].tolist()[:3] == ['LAID_75167', 'CWAD_75167', 'LAID_75180']
+    assert observation_frame['group'].dtype == object
+
+
+def test_observation_store_resolves_two_digit_years_like_ts():
+    """Two-digit years follow the first simulated date, and non-ASCII names are kept."""
+    from datetime import datetime
+
+    store = ObservationStore()
+    store.add('SWSW6801', 1, ['LAID', 'LAID'], ['68123', '68200'], [0.5, 1.5],
+              ['LAID_68123', 'LAIDé_68200'], ['lai', 'lai'], date_anchor=datetime(1968, 1, 1))
+
+    assert store.to_frame()['date'].astype(str).tolist() == ['1968-05-02', '1968-07-18']
+    assert store.get('SWSW6801', 1, 'LAID', '68123') == 0.5
+    assert store.get('SWSW6801', 1, 'LAID', '1968123') == 0.5
+    assert store.to_frame(store.rows('SWSW6801', start='68150'))['variable_name'].tolist() == ['LAIDé_68200']
+
+
+def test_observation_store_rejects_duplicates_and_stays_compact():
+    store = ObservationStore()
+    dates = [f"{2000 + day // 365}{day % 365 + 1:03d}" for day in range(1000)]
+    for trno in range(1, 101):
+        store.add('EXP00001', trno, ['LAID'] * 1000, dates, np.arange(1000.0),
+                  [f"LAID_{date}_T{trno}" for date in dates], ['lai'] * 1000)
+
+    assert len(store) == 100000
+    assert store.nbytes < 8 * 1024 * 1024
+    assert store.get('EXP00001', 50, 'LAID', dates[10]) == 10.0
+
+    store.add('EXP00001', 50, ['LAID'], [dates[10]], [1.0], ['LAID_DUP'], ['lai'])
+    with pytest.raises(ValueError, match="Duplicate observation"):
+        store.get('EXP00001', 50, 'LAID', dates[10])
+
+
+def test_t_file_index_discovers_and_refreshes(tmp_path):
+    """T files are indexed from their headers, matched case-insensitively and refreshed by mtime."""
+    import os
+    import shutil
+
+    repo_root = Path(__file__).parent.parent
+    data_dir = tmp_path / "Wheat"
+    data_dir.mkdir()
+    shutil.copy(repo_root / "tests/DSSAT48/Wheat/SWSW7501.WHT", data_dir / "swsw7501.wht")
+    shutil.copy(repo_root / "tests/DSSAT48/Wheat/PlantGro.OUT", data_dir / "PlantGro.OUT")
+    cache_dir = tmp_path / "cache"
+
+    t_file_index = TFileIndex(str(data_dir), cache_dir=str(cache_dir))
+
+    # PlantGro.OUT looks like a T-file name ('OU' + 'T') but is not indexed
+    assert [os.path.basename(entry['path']) for entry in t_file_index.t_files()] == ['swsw7501.wht']
+    assert list(t_file_index.files) == ['swsw7501.wht']
+    entry = t_file_index.find('SWSW7501', 'wh')
+    assert entry['variables'] == ['CWAD', 'T#AD', 'LAID']
+    assert entry['trnos'] == list(range(1, 15))
+    assert t_file_index.find('OTHER001') is None
+    assert set(t_file_index.measured()['trno']) == set(range(1, 15))
+    assert find_t_file(str(data_dir), 'SWSW7501', 'WH', cache_dir=str(cache_dir)) == entry['path']
+
+    # A new index is loaded from the cache, and nothing is re-read
+    reloaded = TFileIndex(str(data_dir), cache_dir=str(cache_dir))
+    assert reloaded.files == t_file_index.files
+    assert reloaded.refresh() == []
+
+    # Only the changed file is re-read
+    with open(data_dir / "swsw7501.wht", 'a') as t_file:
+        t_file.write("    15 75200   100    10   1.0\n")
+    assert reloaded.refresh() == ['swsw7501.wht']
+    assert reloaded.find('SWSW7501')['trnos'][-1] == 15
+
+
+def test_find_t_file_rescans_only_when_the_directory_changes(tmp_path, monkeypatch):
+    import os
+    import shutil
+    import dpest.functions
+
+    data_dir = tmp_path / "Wheat"
+    data_dir.mkdir()
+    shutil.copy(REPO_ROOT / "tests/DSSAT48/Wheat/SWSW7501.WHT", data_dir / "SWSW7501.WHT")
+
+    # A directory older than the scan is trusted until its modification time changes
+    old_ns = os.stat(data_dir).st_mtime_ns - 10_000_000_000
+    os.utime(data_dir, ns=(old_ns, old_ns))
+    assert find_t_file(str(data_dir), 'SWSW7501', 'WH') == str(data_dir / "SWSW7501.WHT")
+
+    def fail_scan(path):
+        raise AssertionError("The directory should not be scanned again")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(dpest.functions.os, 'scandir', fail_scan)
+        for _ in range(3):
+            assert find_t_file(str(data_dir), 'SWSW7501', 'WH') == str(data_dir / "SWSW7501.WHT")
+
+    # A new T file changes the directory and is found
+    shutil.copy(data_dir / "SWSW7501.WHT", data_dir / "SWSW7502.WHT")
+    os.utime(data_dir, ns=(old_ns + 1, old_ns + 1))
+    assert find_t_file(str(data_dir), 'SWSW7502', 'WH') == str(data_dir / "SWSW7502.WHT")
+
+    # A cache directory given on a later call gets its own index, saved in that directory
+    cache_dir = tmp_path / "cache"
+    assert find_t_file(str(data_dir), 'SWSW7501', 'WH', cache_dir=str(cache_dir)) == str(data_dir / "SWSW7501.WHT")
+    assert (str(data_dir), None) in T_FILE_INDEXES and (str(data_dir), str(cache_dir)) in T_FILE_INDEXES
+    assert any(cache_dir.iterdir())
+
+    # The indexes are bounded, the least recently used ones are evicted
+    for number in range(T_FILE_INDEX_MAX_ENTRIES):
+        other_dir = tmp_path / f"other{number}"
+        other_dir.mkdir()
+        find_t_file(str(other_dir), 'SWSW7501', 'WH')
+    assert len(T_FILE_INDEXES) <= T_FILE_INDEX_MAX_ENTRIES
+    assert (str(data_dir), None) not in T_FILE_INDEXES
+
+
+def test_ins_writer_streams_lines_and_discards_failed_files(tmp_path):
+    ins_path = tmp_path / "PlantGro.ins"
+
+    with InsWriter(str(ins_path), 'pif', '~', ['SWSW7501', '164.0 KG N/HA IRRIG']) as ins_writer:
+        ins_writer.write('l3 w w !LAID_75167!')
+        ins_writer.writelines(['l7 w w !LAID_75174!', 'l7 w w !LAID_75181!'])
+
+    assert ins_writer.lines == 3
+    assert ins_path.read_text() == (
+        "pif ~\n"
+        "~SWSW7501~\n"
+        "~164.0 KG N/HA IRRIG~\n"
+        "l3 w w !LAID_75167!\n"
+        "l7 w w !LAID_75174!\n"
+        "l7 w w !LAID_75181!\n"
+    )
+
+    # An error while writing leaves the previous file untouched and no temporary file
+    with pytest.raises(ValueError):
+        with InsWriter(str(ins_path), 'pif', '~') as ins_writer:
+            ins_writer.write('l1 !A!')
+            raise ValueError("Non-monotonic positions")
+
+    assert ins_path.read_text().startswith("pif ~\n~SWSW7501~\n")
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["PlantGro.ins"]
+
+
+def test_header_layout_is_cached_and_formats_rows(capsys):
+    header_line = '@YEAR DOY   DAS  LAID   VAL\n'
+    data_line = ' 1975 167    99  0.10 .0003\n'
+
+    layout = header_layout(header_line, data_line)
+    assert header_layout(header_line) is layout
+    assert layout.columns == ['YEAR', 'DOY', 'DAS', 'LAID', 'VAL']
+    assert layout.spans == [(0, 5), (5, 9), (9, 15), (15, 21), (21, 27)]
+    assert layout.field_decimals(data_line) == [0, 0, 0, 2, 4]
+    assert header_column_spans(header_line) == (layout.columns, layout.spans)
+
+    # Positions start at 1 and follow the header; missing variables are reported
+    assert find_variable_position(header_line, data_line, ['LAID', 'DOY', 'XYZ']) == {'DOY': 2, 'LAID': 4}
+    assert "Variable 'XYZ' not found." in capsys.readouterr().out
+
+    # Rows are written in the spans of the header, even when a value is wider than the template
+    row = layout.format_row({'@YEAR': 1975, 'DOY': 168, 'DAS': 100, 'LAID': 0.25, 'VAL': 0.0004},
+                            layout.field_decimals(data_line))
+    assert row == ' 1975 168   100  0.25 .0004'
+
+    # The layout keeps nothing of the data lines: the decimals come from the caller's line
+    header_layout(header_line, ' 1975 167    99   0.1    .3\n')
+    assert not hasattr(layout, 'decimals')
+    assert layout.format_row({'LAID': 0.25, 'VAL': 0.5}, [0, 0, 0, 1, 1]) == '    0   0     0   0.2   0.5'
+
+    with pytest.raises(ValueError, match="token counts differ"):
+        find_variable_position(header_line, ' 1975 167    99  0.10\n', ['LAID'])
+
+
+def test_process_variable_names_cleans_trims_and_deduplicates():
+    df = pd.DataFrame({'variable': [
+        'Anthesis (DAP)',
+        'Product wt (kg dm/ha;no loss)',
+        'Anthesis (DAP)',
+        'Anthesis (DAP)',
+        'Product wt (kg dm/ha;no loss)',
+    ]})
+
+    names = process_variable_names(df)['variable_name'].tolist()
+
+    assert names == [
+        'Anthesis_DAP',
+        'Productwtkgdmhanolos',
+        'Anthesis_DAP_A',
+        'Anthesis_DAP_B',
+        'Productwtkgdmhanol_A',
+    ]
+
+    # A suffixed name that matches another name is resolved like the sequential rule
+    df = pd.DataFrame({'variable': ['x' * 18 + '_A', 'x' * 18, 'x' * 18]})
+    assert process_variable_names(df)['variable_name'].tolist() == ['x' * 18 + '_A', 'x' * 18, 'x' * 18 + '_B']
+
+
+def test_observation_name_allocator_is_unique_and_deterministic():
+    assert [observation_name_suffix(number) for number in (1, 26, 27, 52, 703)] == ['A', 'Z', 'AA', 'AZ', 'AAA']
+
+    allocator = ObservationNameAllocator()
+    names = allocator.allocate_many(['LAID_75167', 'laid_75167', 'LAID_75167_A', 'x' * 25, 'x' * 20])
+    assert names == ['LAID_75167', 'laid_75167_A', 'LAID_75167_A_A', 'x' * 20, 'x' * 18 + '_A']
+    assert 'Laid_75167_a' in allocator
+
+    # Repeated names continue after 'Z' and never exceed 20 characters
+    many = allocator.allocate_many(['Maturity_DAP_T1'] * 100_000)
+    assert len(set(name.lower() for name in many)) == len(many)
+    assert many[27] == 'Maturity_DAP_T1_AA'
+    assert max(len(name) for name in many) == 20
+
+    with pytest.raises(ValueError, match="not allocated"):
+        allocator.check(['LAID_75167', 'CWAD_75167'])
+
+
+def test_genotype_file_index_matches_file_scans(tmp_path):
+    """Cultivar and ecotype lookups of the index match the scans of the file; the index is cached by mtime."""
+    import os
+    import shutil
+
+    genotype_dir = REPO_ROOT / "tests/DSSAT48/Genotype"
+    cul_file = str(genotype_dir / "WHCER048.CUL")
+    eco_file = str(genotype_dir / "WHCER048.ECO")
+
+    cul_index = read_genotype_file_index(cul_file, '@VAR#')
+    cul_content = read_dssat_file(cul_file)
+    for cultivar in ['IB1500', 'MANITOU', 'NEWTON', '999991', '999992', 'MISSING']:
+        assert find_cultivar(cul_index, '@VAR#', cultivar, cul_file) == \
+            find_cultivar(cul_content, '@VAR#', cultivar, cul_file)
+
+    eco_index = read_genotype_file_index(eco_file, '@ECO#')
+    eco_content = read_dssat_file(eco_file)
+    for ecotype in ['CAWH01', 'USWH01', '999991', '999992', 'MISSING']:
+        assert find_ecotype(eco_index, '@ECO#', ecotype, eco_file) == \
+            find_ecotype(eco_content, '@ECO#', ecotype, eco_file)
+
+    assert cul_index.parameter_position('P1V') == find_parameter_position(cul_index.header_line, 'P1V')
+    with pytest.raises(ValueError, match="Parameter 'XYZ' does not exist"):
+        cul_index.parameter_position('XYZ')
+
+    # The index is reused until the file changes
+    copied_file = tmp_path / "WHCER048.CUL"
+    shutil.copy(cul_file, copied_file)
+    index = read_genotype_file_index(str(copied_file), '@VAR#')
+    assert read_genotype_file_index(str(copied_file), '@VAR#') is index
+    assert index.cultivar_line('TEST01') is None
+
+    with open(copied_file, 'a') as file:
+        file.write(index.lines[index.cultivar_line('IB1500')].replace('IB1500', 'TEST01') + '\n')
+    stat = os.stat(copied_file)
+    os.utime(copied_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    refreshed = read_genotype_file_index(str(copied_file), '@VAR#')
+    assert refreshed is not index
+    assert refreshed.cultivar_line('TEST01') == len(index.lines) - 1
+
+
+def test_replace_line_segments_joins_fixed_width_templates():
+    """Templates replace their (start, end) spans of the line, whatever the order they were given in."""
+    line = "IB1500 MANITOU  9.333 13.12 331.4"
+    segments = {(21, 26): " ~3P1~", (15, 20): " ~3G1~"}
+
+    assert replace_line_segments(line, segments) == "IB1500 MANITOU  ~3G1~ ~3P1~ 331.4"
+    assert replace_line_segments(line, {}) == line
+    with pytest.raises(ValueError, match="Overlapping segments"):
+        replace_line_segments(line, {(15, 20): "x", (20, 26): "y"})
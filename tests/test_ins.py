@@ -0,0 +1,110 @@
+import dpest
+from dpest import ins
+from pathlib import Path
+import numpy as np
+import pytest
+from pyemu.pst.pst_utils import InstructionFile
+
+
+def pyemu_values(ins_path, out_path):
+    """Reference values read by pyemu (which lower-cases the observation names)."""
+    return InstructionFile(str(ins_path)).read_output_file(str(out_path))['obsval'].to_dict()
+
+
+def test_ins_read_matches_pyemu_for_ts_and_overview(tmp_path):
+    """The instruction files written by ts() and overview() give the same values as pyemu."""
+    repo_root = Path(__file__).parent.parent
+    plantgro_file = str(repo_root / "tests/DSSAT48/Wheat/PlantGro.OUT")
+    overview_file = str(repo_root / "tests/DSSAT48/Wheat/OVERVIEW.OUT")
+
+    _, ts_ins_path = dpest.ts(
+        treatment='164.0 KG N/HA IRRIG',
+        variables=['LAID', 'CWAD', 'T#AD'],
+        ts_file_path=plantgro_file,
+        output_path=str(tmp_path),
+        drop_missing_simulated=True
+    )
+    overview_obs, overview_ins_path = dpest.overview(
+        treatment='164.0 KG N/HA IRRIG',
+        overview_file_path=overview_file,
+        output_path=str(tmp_path)
+    )
+
+    for ins_path, out_path in [(ts_ins_path, plantgro_file), (overview_ins_path, overview_file)]:
+        values = ins.read(ins_path, out_path)
+        assert {name.lower(): value for name, value in values.items()} == pyemu_values(ins_path, out_path)
+
+    # The array follows the order of the observations of the instruction file
+    program = ins.compile_instructions(overview_ins_path)
+    assert program.obs_names == overview_obs['variable_name'].tolist()
+    np.testing.assert_array_equal(
+        ins.read(overview_ins_path, overview_file, as_array=True),
+        list(ins.read(overview_ins_path, overview_file).values())
+    )
+
+
+def test_ins_cursor_instructions(tmp_path):
+    out_path = tmp_path / "model.out"
+    out_path.write_text(
+        "header line\n"
+        "*RUN 1 : TRT A\n"
+        "@YEAR DOY   DAS  LAID\n"
+        " 1975 167     1  0.10\n"
+        " 1975 168     2  0.25\n"
+        "Maturity (DAP)   112   110\n"
+    )
+    ins_path = tmp_path / "model.ins"
+    ins_path.write_text(
+        "pif ~\n"
+        "~TRT A~\n"
+        "~YEAR DOY   DAS  LAID~\n"
+        "l2 w w w w !LAID_75168!\n"
+        "l1 ~Maturity (DAP)~ !dum! !MDAT_M!\n"
+    )
+
+    program = ins.compile_instructions(str(ins_path))
+    assert program.obs_names == ['LAID_75168', 'MDAT_M']
+    assert program.read(str(out_path)) == {'LAID_75168': 0.25, 'MDAT_M': 110.0}
+    assert pyemu_values(ins_path, out_path) == {'laid_75168': 0.25, 'mdat_m': 110.0}
+
+    # The compiled program is reused until the instruction file changes
+    assert ins.compile_instructions(str(ins_path)) is program
+
+
+def test_ins_fixed_and_semi_fixed_observations(tmp_path):
+    out_path = tmp_path / "model.out"
+    out_path.write_text(
+        "@YEAR DOY   DAS  LAID  CWAD\n"
+        " 1975 167     1  0.10 12345\n"
+    )
+    ins_path = tmp_path / "model.ins"
+    ins_path.write_text(
+        "pif ~\n"
+        "~YEAR DOY~\n"
+        "l1 [dum]1:5 (DAS)14:15 [LAID]16:21 (CWAD)22:24\n"
+    )
+
+    program = ins.compile_instructions(str(ins_path))
+    assert program.obs_names == ['DAS', 'LAID', 'CWAD']
+    assert program.read(str(out_path)) == {'DAS': 1.0, 'LAID': 0.1, 'CWAD': 12345.0}
+    assert pyemu_values(ins_path, out_path) == {'das': 1.0, 'laid': 0.1, 'cwad': 12345.0}
+
+
+@pytest.mark.parametrize("instructions, message", [
+    ("l2 ~MISSING~ !X!\n", "secondary marker 'MISSING' not found"),
+    ("~MISSING~\n", "end of file while searching for primary marker"),
+    ("l10 !X!\n", "end of file while advancing 10 lines"),
+    ("l1 !X!\n", "cannot read 'header'"),
+    ("l1 w w w !X!\n", "no value after 3 'w'"),
+    ("l2 [X]1:7\n", "cannot read '1975 1'"),
+    ("l2 (X)1:1\n", "no value for observation 'X' in columns 1:1"),
+    ("l2 [X]3:1\n", "Invalid observation"),
+])
+def test_ins_read_errors(tmp_path, instructions, message):
+    out_path = tmp_path / "model.out"
+    out_path.write_text("header line\n 1975 167 0.10\n")
+    ins_path = tmp_path / "model.ins"
+    ins_path.write_text("pif ~\n" + instructions)
+
+    with pytest.raises(ValueError, match=message):
+        ins.read(str(ins_path), str(out_path))
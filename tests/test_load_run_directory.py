@@ -0,0 +1,104 @@
+import dpest
+from dpest.data import load_run_directory
+import dpest.functions
+from dpest.functions import OBSERVATION_TABLES, OutFileIndex, read_observation_table, wht_filedata_to_dataframe
+from pathlib import Path
+import shutil
+import pandas as pd
+import pytest
+
+WHEAT_DIR = Path(__file__).parent.parent / "tests/DSSAT48/Wheat"
+
+
+@pytest.fixture
+def run_dir(tmp_path):
+    """Copy of the wheat run directory, so that the files can be modified."""
+    run_dir = tmp_path / "Wheat"
+    shutil.copytree(WHEAT_DIR, run_dir)
+    yield run_dir
+    for t_file in run_dir.glob("*.WHT"):
+        OBSERVATION_TABLES.pop(str(t_file.resolve()), None)
+
+
+def test_load_run_directory(run_dir):
+    """All .OUT and T files are parsed, in worker processes."""
+    run = load_run_directory(str(run_dir), workers=2)
+
+    assert list(run) == ['OVERVIEW.OUT', 'PlantGro.OUT', 'SWSW7501.WHT']
+    assert isinstance(run['OVERVIEW.OUT'], OutFileIndex)
+    assert run['PlantGro.OUT'].treatment_dict() == OutFileIndex(str(run_dir / "PlantGro.OUT")).treatment_dict()
+    assert isinstance(run['SWSW7501.WHT'], pd.DataFrame)
+
+    # Only the requested files are parsed
+    run = load_run_directory(str(run_dir), files=['PlantGro.OUT'], workers=1)
+    assert list(run) == ['PlantGro.OUT']
+
+    with pytest.raises(FileNotFoundError):
+        load_run_directory(str(run_dir), files=['PlantN.OUT'])
+
+
+def test_load_run_directory_results_are_reused(run_dir, tmp_path, monkeypatch):
+    """ts() consumes the parsed files, and T-file observations are reused until the file changes."""
+    run = load_run_directory(str(run_dir), files=['PlantGro.OUT', 'SWSW7501.WHT'], workers=1)
+    t_file = run_dir / "SWSW7501.WHT"
+
+    # The observations of the T file are kept in the tables of read_observation_table()
+    table = read_observation_table(str(t_file))
+    assert len(table.trno) == len(run['SWSW7501.WHT'])
+
+    def fail_parse(file_path, cache_dir=None):
+        raise AssertionError("The T file should not be parsed again")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(dpest.functions, 'wht_filedata_to_dataframe', fail_parse)
+        df, ins_path = dpest.ts(
+            treatment='164.0 KG N/HA IRRIG',
+            ts_file_path=run['PlantGro.OUT'],
+            output_path=str(tmp_path),
+            variables=['LAID', 'CWAD'],
+            drop_missing_simulated=True,
+        )
+    assert not df.empty
+
+    # A changed file is parsed again
+    lines = t_file.read_text().splitlines(keepends=True)
+    t_file.write_text(''.join(line for line in lines if not line.lstrip().startswith('9 ')))
+    assert len(read_observation_table(str(t_file)).trno) < len(table.trno)
+    assert len(wht_filedata_to_dataframe(str(t_file))) < len(run['SWSW7501.WHT'])
+
+
+def test_load_run_directory_parses_blocks_in_the_workers(run_dir, monkeypatch):
+    """The blocks of the .OUT files are parsed by the workers and reused without parsing them again."""
+    import sys
+    from dpest.data import read_overview
+    from dpest.functions import extract_overview_data, read_growth_file
+
+    expected_overview = extract_overview_data(str(run_dir / "OVERVIEW.OUT"))[0]
+    expected_maturity = read_overview(str(run_dir / "OVERVIEW.OUT"), variables=['Maturity (DAP)'])
+    plantgro_index = OutFileIndex(str(run_dir / "PlantGro.OUT"))
+    expected_growth = {
+        block['start_line']: read_growth_file(str(run_dir / "PlantGro.OUT"), (block['start_line'], block['end_line']))
+        for block in plantgro_index.blocks
+    }
+
+    run = load_run_directory(str(run_dir), files=['OVERVIEW.OUT', 'PlantGro.OUT'], workers=2)
+    assert len(run['PlantGro.OUT'].parsed_blocks) == len(expected_growth)
+
+    def fail_parse(*args, **kwargs):
+        raise AssertionError("The block should not be parsed again")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(dpest.functions, 'growth_lines_to_dataframe', fail_parse)
+        patch.setattr(dpest.functions, 'parse_overview_block', fail_parse)
+        patch.setattr(sys.modules['dpest.data.read_overview'], 'parse_overview_block', fail_parse)
+        for block in run['PlantGro.OUT'].blocks:
+            growth = read_growth_file(run['PlantGro.OUT'], (block['start_line'], block['end_line']))
+            assert growth.equals(expected_growth[block['start_line']])
+        assert extract_overview_data(run['OVERVIEW.OUT'])[0].equals(expected_overview)
+        maturity = read_overview(run['OVERVIEW.OUT'], variables=['Maturity (DAP)'])
+        assert not maturity.empty and maturity.equals(expected_maturity)
+
+    # The parsed blocks are not used once the file changes
+    with open(run_dir / "PlantGro.OUT", 'a') as out_file:
+        out_file.write("\n")
+    assert run['PlantGro.OUT'].parsed_block(run['PlantGro.OUT'].blocks[0]['start_line']) is None
@@ -351,4 +351,34 @@ def test_overview_unexpected_error(tmp_path, capsys, monkeypatch):
     )
     captured = capsys.readouterr()
     assert "FileNotFoundError: YAML file not found:" in captured.out
-    assert result is None
\ No newline at end of file
+    assert result is None
+
+def test_overview_treatment_list_writes_one_ins_file(tmp_path):
+    """A list of treatments is read from a single INS file with one set of anchors per treatment."""
+    repo_root = Path(__file__).parent.parent
+    overview_file = str(repo_root / "tests/DSSAT48/Wheat/OVERVIEW.OUT")
+    treatments = ['164.0 KG N/HA IRRIG', '0 KG N/HA DRY']
+
+    observations, ins_path = dpest.overview(
+        treatment=treatments,
+        overview_file_path=overview_file,
+        output_path=str(tmp_path),
+        suffix=['IRR', 'DRY']
+    )
+
+    assert Path(ins_path).name == "OVERVIEW.ins"
+    lines = Path(ins_path).read_text().splitlines()
+    assert [line for line in lines if 'KG N/HA' in line] == ['~0 KG N/HA DRY~', '~164.0 KG N/HA IRRIG~']
+    assert observations['variable_name'].iloc[0].endswith('_DRY')
+
+    values = dpest.ins.read(ins_path, overview_file)
+    assert list(values) == observations['variable_name'].tolist()
+    for treatment, suffix in zip(treatments, ['IRR', 'DRY']):
+        _, single_ins_path = dpest.overview(
+            treatment=treatment,
+            overview_file_path=overview_file,
+            output_path=str(tmp_path),
+            suffix=suffix
+        )
+        single_values = dpest.ins.read(single_ins_path, overview_file)
+        assert all(values[name] == value for name, value in single_values.items())
@@ -327,4 +327,108 @@ def test_pst_dataframe_observations_required(tmp_path, capsys):
 
     captured = capsys.readouterr()
     assert "`dataframe_observations` must be provided." in captured.out
-    assert not (tmp_path / "PEST_CONTROL.pst").exists()
\ No newline at end of file
+    assert not (tmp_path / "PEST_CONTROL.pst").exists()
+
+def test_pst_accepts_observation_store(tmp_path):
+    """Observations collected in an ObservationStore give the same control file as the DataFrames."""
+    repo_root = Path(__file__).parent.parent
+    cul_file = str(repo_root / "tests/DSSAT48/Genotype/WHCER048.CUL")
+    overview_file = str(repo_root / "tests/DSSAT48/Wheat/OVERVIEW.OUT")
+    plantgro_file = str(repo_root / "tests/DSSAT48/Wheat/PlantGro.OUT")
+    output_dir = str(tmp_path)
+
+    cultivar_parameters, cul_tpl_path = dpest.cul(
+        P='P1D, P5',
+        cultivar='MANITOU',
+        cul_file_path=cul_file,
+        output_path=output_dir
+    )
+
+    store = dpest.functions.ObservationStore()
+    overview_obs, overview_ins_path = dpest.overview(
+        treatment='164.0 KG N/HA IRRIG',
+        overview_file_path=overview_file,
+        output_path=output_dir,
+        observation_store=store
+    )
+    plantgro_obs, plantgro_ins_path = dpest.ts(
+        treatment='164.0 KG N/HA IRRIG',
+        variables=['LAID', 'CWAD'],
+        ts_file_path=plantgro_file,
+        output_path=output_dir,
+        drop_missing_simulated=True,
+        observation_store=store
+    )
+    assert len(store) == len(overview_obs) + len(plantgro_obs)
+
+    input_output_pairs = [
+        (str(cul_tpl_path), cul_file),
+        (str(overview_ins_path), overview_file),
+        (str(plantgro_ins_path), plantgro_file)
+    ]
+    for pst_filename, observations in [("FRAMES.pst", [overview_obs, plantgro_obs]), ("STORE.pst", store)]:
+        dpest.pst(
+            cultivar_parameters=cultivar_parameters,
+            dataframe_observations=observations,
+            model_comand_line='py run_dssat.py',
+            input_output_file_pairs=input_output_pairs,
+            output_path=output_dir,
+            pst_filename=pst_filename
+        )
+
+    assert (tmp_path / "STORE.pst").read_text() == (tmp_path / "FRAMES.pst").read_text()
+
+
+def test_pst_observation_names_are_unique_with_a_name_allocator(tmp_path, capsys):
+    """A shared allocator keeps the names of two INS files of the same output apart; pst() checks them."""
+    repo_root = Path(__file__).parent.parent
+    cul_file = str(repo_root / "tests/DSSAT48/Genotype/WHCER048.CUL")
+    plantgro_file = str(repo_root / "tests/DSSAT48/Wheat/PlantGro.OUT")
+    first_dir, second_dir = tmp_path / "first", tmp_path / "second"
+    first_dir.mkdir()
+    second_dir.mkdir()
+
+    cultivar_parameters, cul_tpl_path = dpest.cul(
+        P='P1D, P5',
+        cultivar='MANITOU',
+        cul_file_path=cul_file,
+        output_path=str(tmp_path)
+    )
+
+    def plantgro_observations(output_dir, name_allocator):
+        return dpest.ts(
+            treatment='164.0 KG N/HA IRRIG',
+            variables=['LAID', 'CWAD'],
+            ts_file_path=plantgro_file,
+            output_path=str(output_dir),
+            drop_missing_simulated=True,
+            name_allocator=name_allocator
+        )
+
+    allocator = dpest.functions.ObservationNameAllocator()
+    first_obs, first_ins_path = plantgro_observations(first_dir, allocator)
+    second_obs, second_ins_path = plantgro_observations(second_dir, allocator)
+
+    assert first_obs['variable_name'].iloc[0] == 'LAID_75167'
+    assert second_obs['variable_name'].iloc[0] == 'LAID_75167_A'
+    assert '!LAID_75167_A!' in Path(second_ins_path).read_text()
+    assert len(allocator) == len(first_obs) + len(second_obs)
+
+    arguments = dict(
+        cultivar_parameters=cultivar_parameters,
+        model_comand_line='py run_dssat.py',
+        input_output_file_pairs=[
+            (str(cul_tpl_path), cul_file),
+            (str(first_ins_path), plantgro_file),
+            (str(second_ins_path), plantgro_file)
+        ],
+        output_path=str(tmp_path)
+    )
+    dpest.pst(dataframe_observations=[first_obs, second_obs], name_allocator=allocator, **arguments)
+    assert (tmp_path / "PEST_CONTROL.pst").exists()
+
+    # Without the allocator the names collide, which pst() reports before PEST does
+    unallocated_obs, _ = plantgro_observations(second_dir, None)
+    dpest.pst(dataframe_observations=[first_obs, unallocated_obs], pst_filename='DUP.pst', **arguments)
+    assert "observation names are repeated" in capsys.readouterr().out
+    assert not (tmp_path / "DUP.pst").exists()
@@ -0,0 +1,37 @@
+from dpest.data import read_overview
+from pathlib import Path
+import pytest
+
+OVERVIEW_FILE = str(Path(__file__).parent.parent / "tests/DSSAT48/Wheat/OVERVIEW.OUT")
+
+
+def test_read_overview_filters_match_full_read():
+    """Filters applied during the scan give the same rows as filtering the full result."""
+    full_df = read_overview(OVERVIEW_FILE, measured_only=False)
+
+    df = read_overview(
+        OVERVIEW_FILE,
+        variables=['Anthesis (DAP)', 'Maturity (DAP)'],
+        experiments='SWSW7501',
+        treatments=[1, 3],
+        measured_only=False,
+    )
+    expected = full_df[
+        full_df['variable'].isin(['Anthesis (DAP)', 'Maturity (DAP)'])
+        & full_df['treatment'].isin(['1', '3'])
+    ]
+
+    assert df.reset_index(drop=True).equals(expected.reset_index(drop=True))
+    assert df['value_simulated'].dtype == float
+
+
+def test_read_overview_treatments_name():
+    """Blocks can be selected by treatment name, and unknown names are reported."""
+    df = read_overview(OVERVIEW_FILE, treatments_name='164.0 KG N/HA IRRIG')
+
+    assert not df.empty
+    assert set(df['treatment_name']) == {'164.0 KG N/HA IRRIG'}
+    assert df['value_measured'].notna().all()
+
+    with pytest.raises(ValueError, match="treatments_name were not found"):
+        read_overview(OVERVIEW_FILE, treatments_name='999 KG N/HA')
@@ -310,3 +310,229 @@ def test_ts_different_output_formats(tmp_path):
         )
         df, ins_path = result
         assert Path(ins_path).exists()
+
+def test_ts_accepts_out_file_index(tmp_path):
+    """An OutFileIndex can be passed instead of the path and reused across calls."""
+    repo_root = Path(__file__).parent.parent
+    plantgro_file = repo_root / "tests/DSSAT48/Wheat/PlantGro.OUT"
+
+    out_index = dpest.functions.OutFileIndex(str(plantgro_file))
+
+    path_dir = tmp_path / "path"
+    index_dir = tmp_path / "index"
+    path_dir.mkdir()
+    index_dir.mkdir()
+
+    df_path, ins_path_path = dpest.ts(
+        treatment='164.0 KG N/HA IRRIG',
+        ts_file_path=str(plantgro_file),
+        output_path=str(path_dir),
+        variables=['LAID', 'CWAD'],
+        drop_missing_simulated=True
+    )
+
+    df_index, ins_path_index = dpest.ts(
+        treatment='164.0 KG N/HA IRRIG',
+        ts_file_path=out_index,
+        output_path=str(index_dir),
+        variables=['LAID', 'CWAD'],
+        drop_missing_simulated=True
+    )
+
+    assert df_index.equals(df_path)
+    assert Path(ins_path_index).read_text() == Path(ins_path_path).read_text()
+
+
+def test_ts_batch_matches_ts_per_treatment(tmp_path):
+    """ts_batch() writes the same INS files and observations as one ts() call per treatment."""
+    repo_root = Path(__file__).parent.parent
+    plantgro_file = str(repo_root / "tests/DSSAT48/Wheat/PlantGro.OUT")
+    treatments = ['123.0 KG N/HA IRRIG', '164.0 KG N/HA IRRIG']
+
+    batch_dir = tmp_path / "batch"
+    single_dir = tmp_path / "single"
+    batch_dir.mkdir()
+    single_dir.mkdir()
+
+    observations, ins_file_pairs = dpest.ts_batch(
+        ts_file_paths=[plantgro_file],
+        treatments=treatments,
+        variables=['LAID', 'CWAD'],
+        output_path=str(batch_dir),
+        drop_missing_simulated=True
+    )
+
+    expected_frames = []
+    for treatment, (ins_path, out_path) in zip(treatments, ins_file_pairs):
+        suffix = 'T13' if treatment.startswith('123') else 'T14'
+        df, single_ins_path = dpest.ts(
+            treatment=treatment,
+            ts_file_path=plantgro_file,
+            variables=['LAID', 'CWAD'],
+            output_path=str(single_dir),
+            suffix=suffix,
+            drop_missing_simulated=True
+        )
+        expected_frames.append(df)
+
+        assert out_path == plantgro_file
+        assert Path(ins_path).name == f"PlantGro_{suffix}.ins"
+        assert Path(ins_path).read_text() == Path(single_ins_path).read_text()
+
+    pd.testing.assert_frame_equal(observations, pd.concat(expected_frames, ignore_index=True))
+
+
+def test_ts_batch_all_treatments(tmp_path):
+    """With treatments='all', every treatment of the file gets its own INS file."""
+    repo_root = Path(__file__).parent.parent
+    plantgro_file = str(repo_root / "tests/DSSAT48/Wheat/PlantGro.OUT")
+
+    observations, ins_file_pairs = dpest.ts_batch(
+        ts_file_paths=plantgro_file,
+        variables='LAID',
+        output_path=str(tmp_path),
+        drop_missing_simulated=True
+    )
+
+    out_index = dpest.functions.OutFileIndex(plantgro_file)
+    assert len(ins_file_pairs) == len(out_index.treatment_dict())
+    assert all(Path(ins_path).exists() for ins_path, _ in ins_file_pairs)
+    assert observations['variable_name'].is_unique
+    assert observations['variable_name'].str.endswith(('_T1', '_T14')).any()
+
+
+@pytest.mark.parametrize("suffix_scheme", ["TRT", "TR_{trno}", "T{trno}{crop}"])
+def test_ts_batch_invalid_suffix_scheme(tmp_path, suffix_scheme, capsys):
+    """An invalid suffix_scheme is reported and None is returned."""
+    repo_root = Path(__file__).parent.parent
+    plantgro_file = str(repo_root / "tests/DSSAT48/Wheat/PlantGro.OUT")
+
+    result = dpest.ts_batch(
+        ts_file_paths=plantgro_file,
+        treatments='164.0 KG N/HA IRRIG',
+        variables='LAID',
+        output_path=str(tmp_path),
+        suffix_scheme=suffix_scheme,
+        drop_missing_simulated=True
+    )
+
+    assert result is None
+    assert "ValueError" in capsys.readouterr().out
+
+
+def test_ts_columns_ins_style(tmp_path, capsys):
+    """With ins_style='columns', values are read from the fixed columns of the header."""
+    repo_root = Path(__file__).parent.parent
+    plantgro_file = str(repo_root / "tests/DSSAT48/Wheat/PlantGro.OUT")
+    arguments = dict(
+        treatment='164.0 KG N/HA IRRIG',
+        variables=['LAID', 'CWAD', 'T#AD'],
+        ts_file_path=plantgro_file,
+        output_path=str(tmp_path),
+        drop_missing_simulated=True
+    )
+
+    whitespace_obs, whitespace_ins_path = dpest.ts(**arguments)
+    columns_obs, columns_ins_path = dpest.ts(suffix='COL', ins_style='columns', **arguments)
+
+    lines = Path(columns_ins_path).read_text().splitlines()
+    assert lines[4] == "l23 [LAID_75167_COL]64:69 [CWAD_75167_COL]100:105 [T#AD_75167_COL]184:189"
+    assert not any(' w ' in line for line in lines)
+
+    # Both styles read the same simulated values
+    whitespace_values = dpest.ins.read(whitespace_ins_path, plantgro_file)
+    columns_values = dpest.ins.read(columns_ins_path, plantgro_file)
+    assert list(columns_values) == (columns_obs['variable_name']).tolist()
+    assert list(columns_values.values()) == list(whitespace_values.values())
+
+    assert dpest.ts(ins_style='fixed', **arguments) is None
+    assert "The 'ins_style' must be one of" in capsys.readouterr().out
+
+
+def test_ts_treatment_list_writes_one_ins_file(tmp_path, capsys):
+    """A list of treatments is read from a single INS file, in the order of the blocks of the file."""
+    repo_root = Path(__file__).parent.parent
+    plantgro_file = str(repo_root / "tests/DSSAT48/Wheat/PlantGro.OUT")
+    treatments = ['164.0 KG N/HA IRRIG', '0 KG N/HA DRY', '41.0 KG N/HA DRY']
+
+    observations, ins_path = dpest.ts(
+        treatment=treatments,
+        variables=['LAID', 'CWAD'],
+        ts_file_path=plantgro_file,
+        output_path=str(tmp_path),
+        drop_missing_simulated=True
+    )
+
+    assert Path(ins_path).name == "PlantGro.ins"
+    lines = Path(ins_path).read_text().splitlines()
+    assert [line for line in lines if 'KG N/HA' in line] == [
+        '~0 KG N/HA DRY~', '~41.0 KG N/HA DRY~', '~164.0 KG N/HA IRRIG~'
+    ]
+
+    # Same values and names as one INS file per treatment with the 'T<trno>' suffix
+    batch_path = tmp_path / "batch"
+    batch_path.mkdir()
+    batch_observations, ins_file_pairs = dpest.ts_batch(
+        ts_file_paths=plantgro_file,
+        treatments=treatments,
+        variables=['LAID', 'CWAD'],
+        output_path=str(batch_path),
+        drop_missing_simulated=True
+    )
+    expected = {}
+    for batch_ins_path, out_path in ins_file_pairs:
+        expected.update(dpest.ins.read(batch_ins_path, out_path))
+
+    values = dpest.ins.read(ins_path, plantgro_file)
+    assert list(values) == observations['variable_name'].tolist()
+    assert values == expected
+    assert sorted(observations['variable_name']) == sorted(batch_observations['variable_name'])
+
+    # One suffix per treatment is required when suffixes are given
+    assert dpest.ts(
+        treatment=treatments,
+        variables='LAID',
+        ts_file_path=plantgro_file,
+        output_path=str(tmp_path),
+        suffix='T1',
+        drop_missing_simulated=True
+    ) is None
+    assert "one suffix per treatment" in capsys.readouterr().out
+
+
+def test_ts_batch_multi_experiment_file(tmp_path, capsys):
+    """Treatments of several experiments get their own INS files; clashing files are refused before writing."""
+    repo_root = Path(__file__).parent.parent
+    wheat_dir = repo_root / "tests/DSSAT48/Wheat"
+    data_dir = tmp_path / "Wheat"
+    data_dir.mkdir()
+    plantgro = (wheat_dir / "PlantGro.OUT").read_text()
+    (data_dir / "PlantGro.OUT").write_text(plantgro + plantgro.replace('SWSW7501', 'SWSW7502'))
+    for code in ['SWSW7501', 'SWSW7502']:
+        (data_dir / f"{code}.WHT").write_text((wheat_dir / "SWSW7501.WHT").read_text().replace('SWSW7501', code))
+    output_dir = tmp_path / "output"
+    output_dir.mkdir()
+
+    # The same treatment numbers in both experiments would share 'T{trno}' file names
+    result = dpest.ts_batch(
+        ts_file_paths=str(data_dir / "PlantGro.OUT"),
+        variables='LAID',
+        output_path=str(output_dir),
+        suffix_scheme='T{trno}',
+        drop_missing_simulated=True
+    )
+    assert result is None
+    assert "would be written to the same instruction file" in capsys.readouterr().out
+    assert list(output_dir.iterdir()) == []
+
+    # By default, the suffixes include the number of the experiment in the file
+    observations, ins_file_pairs = dpest.ts_batch(
+        ts_file_paths=str(data_dir / "PlantGro.OUT"),
+        variables='LAID',
+        output_path=str(output_dir),
+        drop_missing_simulated=True
+    )
+    ins_names = sorted(Path(ins_path).name for ins_path, _ in ins_file_pairs)
+    assert len(ins_names) == 28 and len(set(ins_names)) == 28
+    assert {'PlantGro_1T1.ins', 'PlantGro_2T14.ins'} <= set(ins_names)
+    assert observations['variable_name'].is_unique